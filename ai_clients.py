@@ -8,10 +8,37 @@ import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from config import Config, token_monitor
+from cost_monitor import cost_monitor
+from reincercari import planificator_reincercari
+from sesiuni import buget_context_model
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SYSTEM_PROMPT = "Esti un profesor prietenos si empatic care ajuta elevii sa invete."
+# Timeout-ul unui apel catre provider cand cererea nu are termen limita
+TIMEOUT_PROVIDER = 30
+
+
+def usage_breakdown(input_tokens=0, cached_input_tokens=0, output_tokens=0):
+    """Defalcare tokeni in formatul asteptat de CostMonitor.calculate_cost"""
+    cached = max(0, int(cached_input_tokens or 0))
+    return {
+        "input": max(0, int(input_tokens or 0) - cached),
+        "cached_input": cached,
+        "output": max(0, int(output_tokens or 0)),
+    }
+
+
+def _usage_field(obj, name, default=None):
+    """Citeste un camp de usage indiferent daca vine ca obiect SDK sau dict"""
+    if obj is None:
+        return default
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+
 class ResponseCache:
     """Cache pentru raspunsuri AI"""
     
@@ -39,14 +66,16 @@ class ResponseCache:
         except Exception as e:
             logger.error(f"Eroare la salvarea cache-ului: {e}")
     
-    def get_cache_key(self, prompt, model, temperature):
+    def get_cache_key(self, prompt, model, temperature, system_prompt=None):
         """Genereaza cheie unica pentru cache"""
         content = f"{prompt}_{model}_{temperature}"
+        if system_prompt:
+            content = f"{system_prompt}_{content}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def get(self, prompt, model, temperature):
+    def get(self, prompt, model, temperature, system_prompt=None):
         """Obtine raspuns din cache"""
-        key = self.get_cache_key(prompt, model, temperature)
+        key = self.get_cache_key(prompt, model, temperature, system_prompt)
         
         if key in self.cache:
             cached_item = self.cache[key]
@@ -58,9 +87,9 @@ class ResponseCache:
         
         return None
     
-    def set(self, prompt, model, temperature, response):
+    def set(self, prompt, model, temperature, response, system_prompt=None):
         """Salveaza raspuns in cache"""
-        key = self.get_cache_key(prompt, model, temperature)
+        key = self.get_cache_key(prompt, model, temperature, system_prompt)
         self.cache[key] = {
             'response': response,
             'timestamp': datetime.now().isoformat()
@@ -78,11 +107,12 @@ class AIClientManager:
         """Configureaza clientii AI"""
         # OpenAI (pentru varianta Pro)
         if Config.OPENAI_API_KEY:
-            self.openai_client = openai.OpenAI(api_key=Config.OPENAI_API_KEY)
+            # Reincercarile sunt facute de planificator_reincercari, nu de SDK
+            self.openai_client = openai.OpenAI(api_key=Config.OPENAI_API_KEY, max_retries=0)
         
         # Claude (pentru STEM)
         if Config.CLAUDE_API_KEY:
-            self.claude_client = anthropic.Anthropic(api_key=Config.CLAUDE_API_KEY)
+            self.claude_client = anthropic.Anthropic(api_key=Config.CLAUDE_API_KEY, max_retries=0)
     
     def estimate_tokens(self, text):
         """Estimeaza numarul de tokeni"""
@@ -106,7 +136,7 @@ class AIClientManager:
         )[0]
         return "openai", model
 
-    def call_deepseek(self, messages, model="deepseek-chat", max_tokens=1000, temperature=0.7):
+    def call_deepseek(self, messages, model="deepseek-chat", max_tokens=1000, temperature=0.7, timeout=None):
         """Apel catre DeepSeek API"""
         headers = {
             "Authorization": f"Bearer {Config.DEEPSEEK_API_KEY}",
@@ -125,20 +155,27 @@ class AIClientManager:
             response = requests.post(Config.DEEPSEEK_ENDPOINT, 
                                    headers=headers, 
                                    json=data, 
-                                   timeout=30)
+                                   timeout=timeout or TIMEOUT_PROVIDER)
             response.raise_for_status()
             
             result = response.json()
+            usage = result.get("usage", {})
+            # DeepSeek face cache automat pe prefixul comun al mesajelor
             return {
                 "content": result["choices"][0]["message"]["content"],
-                "tokens_used": result.get("usage", {}).get("total_tokens", max_tokens)
+                "tokens_used": usage.get("total_tokens", max_tokens),
+                "usage": usage_breakdown(
+                    usage.get("prompt_tokens", 0),
+                    usage.get("prompt_cache_hit_tokens", 0),
+                    usage.get("completion_tokens", 0),
+                ),
             }
         
         except Exception as e:
             logger.error(f"Eroare DeepSeek API: {e}")
             raise
     
-    def call_claude(self, messages, model="claude-4.5-sonnet", max_tokens=1000, temperature=0.7):
+    def call_claude(self, messages, model="claude-4.5-sonnet", max_tokens=1000, temperature=0.7, timeout=None):
         """Apel catre Claude API"""
         try:
             # Converteste mesajele pentru Claude
@@ -151,17 +188,34 @@ class AIClientManager:
                 else:
                     user_messages.append(msg)
             
+            # Prefixul static (persona + materiale) este marcat pentru cache-ul de prompt
+            system_blocks = []
+            if system_message:
+                system_blocks.append({
+                    "type": "text",
+                    "text": system_message,
+                    "cache_control": {"type": "ephemeral"}
+                })
+
+            optiuni = {"timeout": timeout} if timeout is not None else {}
             response = self.claude_client.messages.create(
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system=system_message,
-                messages=user_messages
+                system=system_blocks,
+                messages=user_messages,
+                **optiuni
             )
-            
+
+            usage = response.usage
+            cache_read = _usage_field(usage, "cache_read_input_tokens", 0) or 0
+            cache_write = _usage_field(usage, "cache_creation_input_tokens", 0) or 0
+            # La Anthropic input_tokens exclude tokenii cititi sau scrisi in cache
+            input_total = usage.input_tokens + cache_read + cache_write
             return {
                 "content": response.content[0].text,
-                "tokens_used": response.usage.input_tokens + response.usage.output_tokens
+                "tokens_used": input_total + usage.output_tokens,
+                "usage": usage_breakdown(input_total, cache_read, usage.output_tokens),
             }
         
         except Exception as e:
@@ -222,17 +276,33 @@ class AIClientManager:
         total = (input_tokens or 0) + (output_tokens or 0)
         return total if total else fallback
 
-    def call_openai(self, messages, model="gpt-5", max_tokens=1000, temperature=0.7):
+    @staticmethod
+    def _openai_usage(response):
+        """Defalcarea tokenilor, inclusiv cei serviti din cache-ul automat de prefix"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return None
+        input_tokens = _usage_field(usage, "input_tokens")
+        output_tokens = _usage_field(usage, "output_tokens")
+        if input_tokens is None and output_tokens is None:
+            return None
+        details = _usage_field(usage, "input_tokens_details")
+        cached = _usage_field(details, "cached_tokens", 0) or 0
+        return usage_breakdown(input_tokens, cached, output_tokens)
+
+    def call_openai(self, messages, model="gpt-5", max_tokens=1000, temperature=0.7, timeout=None):
         """Apel catre OpenAI API (pentru varianta Pro) folosind Responses"""
         if not hasattr(self, "openai_client"):
             raise ValueError("OpenAI client nu este configurat")
 
         try:
+            optiuni = {"timeout": timeout} if timeout is not None else {}
             response = self.openai_client.responses.create(
                 model=model,
                 input=self._openai_messages_payload(messages),
                 temperature=temperature,
-                max_output_tokens=max_tokens
+                max_output_tokens=max_tokens,
+                **optiuni
             )
 
             content = self._openai_output_text(response)
@@ -240,10 +310,14 @@ class AIClientManager:
                 raise ValueError("OpenAI nu a returnat continut")
 
             tokens_used = self._openai_total_tokens(response, fallback=max_tokens)
-            return {
+            result = {
                 "content": content,
                 "tokens_used": tokens_used
             }
+            usage = self._openai_usage(response)
+            if usage is not None:
+                result["usage"] = usage
+            return result
 
         except Exception as e:
             logger.error(f"Eroare OpenAI API: {e}")
@@ -261,14 +335,31 @@ class AIClientManager:
         )
 
     def get_ai_response(self, prompt, subject, user_id="default", 
-                       is_free_tier=True, max_tokens=1000, temperature=0.7):
-        """Obtine raspuns de la AI cu toate optimizarile"""
+                       is_free_tier=True, max_tokens=1000, temperature=0.7,
+                       system_prompt=None, sesiune=None, termen=None):
+        """Obtine raspuns de la AI cu toate optimizarile
+
+        ``system_prompt`` este prefixul static (persona, materiale) trimis
+        primul si identic intre cereri, ca providerii sa-l poata servi din
+        cache-ul de prompt; ``prompt`` ramane doar partea variabila.
+        Cu ``sesiune`` (vezi ``sesiuni.SesiuneTutorat``) turele anterioare sunt
+        trimise intre prefix si intrebare, in limita bugetului modelului ales.
+        Cu ``termen`` (vezi ``termen_limita.TermenLimita``) apelul catre provider
+        primeste doar timpul ramas din cerere.
+        """
         
-        # Verifica cache-ul mai intai
         provider, model = self.choose_model(subject, is_free_tier)
-        cached_response = self.cache.get(prompt, model, temperature)
+        istoric = []
+        if sesiune is not None:
+            buget = buget_context_model(model) - self.estimate_tokens((system_prompt or "") + prompt)
+            istoric = sesiune.mesaje_context(max(0, buget), self.estimate_tokens)
+
+        # Verifica cache-ul mai intai (raspunsurile din sesiuni depind de context)
+        cached_response = None if istoric else self.cache.get(prompt, model, temperature, system_prompt)
         
         if cached_response:
+            if sesiune is not None:
+                sesiune.adauga_tura(prompt, cached_response)
             return {
                 "content": cached_response,
                 "tokens_used": 0,  # Nu consuma tokeni din cache
@@ -277,7 +368,8 @@ class AIClientManager:
             }
         
         # Estimeaza tokenii necesari
-        estimated_tokens = self.estimate_tokens(prompt) + max_tokens
+        estimated_tokens = self.estimate_tokens((system_prompt or "") + prompt) + max_tokens
+        estimated_tokens += sum(self.estimate_tokens(mesaj["content"]) for mesaj in istoric)
         
         # Verifica limitele pentru varianta gratuita
         if is_free_tier:
@@ -287,29 +379,40 @@ class AIClientManager:
         
         # Pregateste mesajele
         messages = [
-            {"role": "system", "content": "Esti un profesor prietenos si empatic care ajuta elevii sa invete."},
+            {"role": "system", "content": system_prompt or DEFAULT_SYSTEM_PROMPT},
+            *istoric,
             {"role": "user", "content": prompt}
         ]
         
-        # Apeleaza API-ul potrivit
+        # Apeleaza API-ul potrivit; fiecare incercare primeste doar timpul ramas din cerere
         handlers = {
-            "deepseek": lambda: self.call_deepseek(messages, model=model, max_tokens=max_tokens, temperature=temperature),
-            "claude": lambda: self.call_claude(messages, model=model, max_tokens=max_tokens, temperature=temperature),
-            "openai": lambda: self.call_openai(messages, model=model, max_tokens=max_tokens, temperature=temperature)
+            "deepseek": self.call_deepseek,
+            "claude": self.call_claude,
+            "openai": self.call_openai
         }
 
+        def apel(tentativa):
+            timeout = termen.timeout(TIMEOUT_PROVIDER, etapa=provider) if termen is not None else None
+            return handlers[provider](
+                messages, model=model, max_tokens=max_tokens, temperature=temperature, timeout=timeout
+            )
+
         try:
             if provider not in handlers:
                 raise ValueError(f"Provider necunoscut: {provider}")
 
-            result = handlers[provider]()
+            result = planificator_reincercari.executa(apel, furnizor=provider, termen=termen)
 
             # Adauga tokenii folositi
             if is_free_tier:
                 token_monitor.add_tokens(user_id, result["tokens_used"])
+                cost_monitor.log_usage(result.get("usage") or result["tokens_used"], model)
             
             # Salveaza in cache
-            self.cache.set(prompt, model, temperature, result["content"])
+            if not istoric:
+                self.cache.set(prompt, model, temperature, result["content"], system_prompt)
+            if sesiune is not None:
+                sesiune.adauga_tura(prompt, result["content"])
             
             result["provider"] = provider
             result["from_cache"] = False
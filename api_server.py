@@ -9,6 +9,8 @@ from dotenv import load_dotenv
 from flask import Blueprint, Flask, jsonify, request
 from flask_cors import CORS
 
+from termen_limita import TermenLimita
+
 load_dotenv()
 
 logging.basicConfig(
@@ -40,6 +42,10 @@ class DependencyContainer:
     token_monitor: Optional[Any] = None
     ai_client_manager: Optional[Any] = None
     Config: Optional[Any] = None
+    reimprospateaza_materiale: Optional[Callable[..., Any]] = None
+    registru_scoli: Optional[Any] = None
+    rutare_speculativa: Optional[Any] = None
+    planificator_reincercari: Optional[Any] = None
     errors: Dict[str, str] = field(default_factory=dict)
 
     @property
@@ -61,12 +67,26 @@ def load_dependencies() -> DependencyContainer:
         deps.errors["limiter"] = str(exc)
 
     try:
-        from main import creeaza_structura_educationala
+        from config import Config
+        from education.speculatie import get_rutare_speculativa
+        from reincercari import planificator_reincercari
+        from main import registru_scoli, reimprospateaza_materiale_scoli
 
-        scoala_normala_obj, scoala_muzica_obj = creeaza_structura_educationala()
+        scoala_normala_obj, scoala_muzica_obj = registru_scoli.obtine_scoli()
+        deps.registru_scoli = registru_scoli
+        deps.Config = Config
+        if Config.RASPUNS_SPECULATIV:
+            deps.rutare_speculativa = get_rutare_speculativa()
+        deps.planificator_reincercari = planificator_reincercari
         deps.scoala_normala = scoala_normala_obj
         deps.scoala_muzica = scoala_muzica_obj
         deps.main_system_available = True
+
+        def _reimprospateaza(diferenta: Optional[Any] = None) -> Dict[str, Any]:
+            return reimprospateaza_materiale_scoli([scoala_normala_obj, scoala_muzica_obj], diferenta)
+
+        deps.reimprospateaza_materiale = _reimprospateaza
+        _porneste_scanare_materiale(_reimprospateaza)
     except ImportError as exc:
         logger.error("Modulele principale nu pot fi importate: %s", exc)
         deps.errors["main"] = str(exc)
@@ -94,6 +114,20 @@ def load_dependencies() -> DependencyContainer:
     return deps
 
 
+def _porneste_scanare_materiale(callback: Callable[..., Any]) -> None:
+    try:
+        from config import Config
+        from education import get_gestor_materiale
+    except ImportError as exc:
+        logger.warning("Scanarea materialelor nu poate fi pornita: %s", exc)
+        return
+
+    interval = Config.MATERIALE_SCAN_INTERVAL
+    if interval > 0:
+        get_gestor_materiale().porneste_scanare_periodica(interval, callback)
+        logger.info("Scanare materiale pornita la fiecare %s secunde", interval)
+
+
 def verify_api_keys(env: Mapping[str, str] = os.environ) -> None:
     missing = [key for key in ("OPENAI_API_KEY", "DEEPSEEK_API_KEY", "CLAUDE_API_KEY") if not env.get(key)]
     if missing:
@@ -140,6 +174,8 @@ def create_pro_blueprint(deps: DependencyContainer, limiter: Any) -> Blueprint:
         intrebare = data.get("intrebare") if isinstance(data, dict) else None
         scoala_nume = data.get("scoala") if isinstance(data, dict) else None
         clasa = data.get("clasa") if isinstance(data, dict) else None
+        user_id = str(data.get("user_id") or "pro_user") if isinstance(data, dict) else "pro_user"
+        in_sesiune = bool(data.get("sesiune")) if isinstance(data, dict) else False
 
         if intrebare is None or scoala_nume is None or clasa is None:
             logger.warning("Date incomplete pentru /api/intreaba: intrebare=%s, scoala=%s, clasa=%s", intrebare, scoala_nume, clasa)
@@ -161,12 +197,25 @@ def create_pro_blueprint(deps: DependencyContainer, limiter: Any) -> Blueprint:
             logger.warning("Numele scolii este invalid: %s", scoala_nume)
             return jsonify({"success": False, "error": f"Scoala '{scoala_nume}' nu exista."}), 400
 
-        try:
-            director = scoala.directori[0]
-            profesor_ales = director.alege_profesor_pentru_intrebare(intrebare, clasa_int)
-        except Exception as exc:
-            logger.error("Eroare la selectarea profesorului: %s", exc, exc_info=True)
-            return jsonify({"success": False, "error": "Nu s-a putut selecta un profesor."}), 500
+        # Bugetul de timp al cererii, impartit intre director, profesor si provider
+        termen = TermenLimita(deps.Config.TERMEN_CERERE)
+        director = scoala.directori[0]
+        raspuns = None
+        if deps.rutare_speculativa is not None and not in_sesiune:
+            # Profesorul ghicit incepe sa raspunda cat timp directorul decide
+            try:
+                profesor_ales, raspuns = deps.rutare_speculativa.raspunde(
+                    director, intrebare, clasa_int, user_id=user_id, is_free_tier=False, termen=termen
+                )
+            except Exception as exc:
+                logger.error("Eroare la rutarea speculativa: %s", exc, exc_info=True)
+                return jsonify({"success": False, "error": "Nu s-a putut genera raspunsul."}), 500
+        else:
+            try:
+                profesor_ales = director.alege_profesor_pentru_intrebare(intrebare, clasa_int, termen=termen)
+            except Exception as exc:
+                logger.error("Eroare la selectarea profesorului: %s", exc, exc_info=True)
+                return jsonify({"success": False, "error": "Nu s-a putut selecta un profesor."}), 500
 
         if not profesor_ales:
             logger.warning("[PRO] Nu exista profesor potrivit pentru intrebarea: '%s'", intrebare)
@@ -175,7 +224,14 @@ def create_pro_blueprint(deps: DependencyContainer, limiter: Any) -> Blueprint:
         logger.info("[PRO] Intrebarea a fost asignata profesorului %s (%s)", profesor_ales.nume, profesor_ales.materie)
 
         try:
-            raspuns = profesor_ales.raspunde_intrebare(intrebare, user_id="pro_user", is_free_tier=False)
+            if raspuns is None and in_sesiune:
+                raspuns = profesor_ales.raspunde_in_sesiune(
+                    intrebare, user_id=user_id, is_free_tier=False, termen=termen
+                )
+            elif raspuns is None:
+                raspuns = profesor_ales.raspunde_intrebare(
+                    intrebare, user_id=user_id, is_free_tier=False, termen=termen
+                )
         except Exception as exc:
             logger.error("Eroare la generarea raspunsului profesorului: %s", exc, exc_info=True)
             return jsonify({"success": False, "error": "Nu s-a putut genera raspunsul."}), 500
@@ -192,6 +248,20 @@ def create_pro_blueprint(deps: DependencyContainer, limiter: Any) -> Blueprint:
             }
         )
 
+    @bp.route("/materiale/reindexeaza", methods=["POST"])
+    @limit("10/hour")
+    def reindexeaza_materiale() -> Any:
+        if not deps.main_system_available or deps.reimprospateaza_materiale is None:
+            return jsonify({"success": False, "error": "Sistemul principal nu este disponibil"}), 503
+
+        try:
+            rezultat = deps.reimprospateaza_materiale()
+        except Exception as exc:
+            logger.error("Reindexarea materialelor a esuat: %s", exc, exc_info=True)
+            return jsonify({"success": False, "error": "Reindexarea materialelor a esuat."}), 500
+
+        return jsonify({"success": True, "rezultat": rezultat})
+
     return bp
 
 
@@ -221,6 +291,7 @@ def create_free_blueprint(deps: DependencyContainer, limiter: Any) -> Blueprint:
                 intrebare=data["intrebare"],
                 scoala_nume=data["scoala"],
                 clasa=int(data["clasa"]),
+                termen=TermenLimita(deps.Config.TERMEN_CERERE),
             )
         except Exception as exc:
             logger.error("[FREE] Eroare la procesarea intrebarii: %s", exc, exc_info=True)
@@ -313,6 +384,9 @@ def register_common_routes(app: Flask, deps: DependencyContainer, limiter: Any)
                 "deepseek": "configured" if os.getenv("DEEPSEEK_API_KEY") else "missing",
                 "claude": "configured" if os.getenv("CLAUDE_API_KEY") else "missing",
             },
+            "build_times": deps.registru_scoli.timpi_construire() if deps.registru_scoli else {},
+            "speculation": deps.rutare_speculativa.statistici() if deps.rutare_speculativa else {},
+            "retries": deps.planificator_reincercari.statistici() if deps.planificator_reincercari else {},
             "errors": deps.errors,
         }
         return jsonify(status)
@@ -322,6 +396,7 @@ def register_common_routes(app: Flask, deps: DependencyContainer, limiter: Any)
     def test_endpoint() -> Any:
         endpoints = [
             "/api/intreaba" if deps.main_system_available else "/api/intreaba (unavailable)",
+            "/api/materiale/reindexeaza" if deps.main_system_available else "/api/materiale/reindexeaza (unavailable)",
             "/api/free/ask" if deps.free_system_available else "/api/free/ask (unavailable)",
             "/api/scoli",
             "/api/clase",
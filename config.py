@@ -37,6 +37,69 @@ class Config:
     CACHE_DURATION = 3600  # 1 ora in secunde
     CACHE_FILE = "cache_responses.json"
 
+    # Rescanare materiale didactice (0 = doar la cerere)
+    MATERIALE_SCAN_INTERVAL = int(os.getenv('MATERIALE_SCAN_INTERVAL', 0))
+    # Regenerare automata a rezumatelor pentru materialele modificate
+    REZUMATE_LA_REINDEXARE = os.getenv('REZUMATE_LA_REINDEXARE', 'false').lower() == 'true'
+    # Pornire rapida a workerilor din instantaneul structurii scolilor
+    INSTANTANEU_SCOLI = os.getenv('INSTANTANEU_SCOLI', 'true').lower() == 'true'
+
+    # Istoric conversatii si decizii (gol = doar in memorie)
+    ISTORIC_DB = os.getenv('ISTORIC_DB', 'istoric.db')
+    ISTORIC_CAPACITATE_CONVERSATII = int(os.getenv('ISTORIC_CAPACITATE_CONVERSATII', 50))
+    ISTORIC_CAPACITATE_DECIZII = int(os.getenv('ISTORIC_CAPACITATE_DECIZII', 200))
+
+    # Sesiuni de tutorat multi-tura
+    SESIUNE_TTL = int(os.getenv('SESIUNE_TTL', 1800))
+    SESIUNI_MAXIME = int(os.getenv('SESIUNI_MAXIME', 1000))
+    SESIUNE_MAX_TURE = int(os.getenv('SESIUNE_MAX_TURE', 20))
+    # Buget de tokeni de intrare per model (prompt static + istoric sesiune + intrebare)
+    BUGET_CONTEXT_MODELE = {
+        "gpt-5": 12000,
+        "gpt-5-nano": 4000,
+        "gpt-4.1-nano": 4000,
+        "deepseek-chat": 6000,
+        "claude-4.5-sonnet": 12000,
+    }
+    BUGET_CONTEXT_IMPLICIT = 4000
+
+    # Router local pentru alegerea profesorului (directorul LLM doar sub pragul de incredere)
+    ROUTER_LOCAL_ACTIV = os.getenv('ROUTER_LOCAL_ACTIV', 'true').lower() == 'true'
+    ROUTER_LOCAL_PRAG = float(os.getenv('ROUTER_LOCAL_PRAG', 0.6))
+    ROUTER_LOCAL_MAX_EXEMPLE = int(os.getenv('ROUTER_LOCAL_MAX_EXEMPLE', 400))
+    # Reantrenare dupa atatea decizii noi ale directorului LLM
+    ROUTER_LOCAL_REANTRENARE = int(os.getenv('ROUTER_LOCAL_REANTRENARE', 25))
+    # Reantrenarea ruleaza pe un fir separat; cererile folosesc modelul curent pana la inlocuire
+    ROUTER_LOCAL_FUNDAL = os.getenv('ROUTER_LOCAL_FUNDAL', 'true').lower() == 'true'
+    # Cache decizii de rutare per (scoala, clasa, intrebare normalizata); fisier gol = doar in memorie
+    CACHE_RUTARE_TTL = int(os.getenv('CACHE_RUTARE_TTL', 86400))
+    CACHE_RUTARE_CAPACITATE = int(os.getenv('CACHE_RUTARE_CAPACITATE', 5000))
+    CACHE_RUTARE_FILE = os.getenv('CACHE_RUTARE_FILE', '')
+    # Fisierul cache-ului se rescrie cel mult o data la atatea secunde (si la oprire)
+    CACHE_RUTARE_SALVARE_INTERVAL = float(os.getenv('CACHE_RUTARE_SALVARE_INTERVAL', 5))
+    # Raspuns speculativ: profesorul ghicit raspunde in paralel cu decizia directorului LLM
+    RASPUNS_SPECULATIV = os.getenv('RASPUNS_SPECULATIV', 'false').lower() == 'true'
+    RASPUNS_SPECULATIV_WORKERI = int(os.getenv('RASPUNS_SPECULATIV_WORKERI', 4))
+
+    # Termen limita per cerere API (director + profesor + provider)
+    TERMEN_CERERE = float(os.getenv('TERMEN_CERERE', 25))
+    # Timp pastrat pentru raspunsul profesorului cat timp decide directorul
+    TERMEN_REZERVA_PROFESOR = float(os.getenv('TERMEN_REZERVA_PROFESOR', 12))
+
+    # Reincercari pentru director si provideri (backoff exponential cu jitter)
+    REINCERCARI_MAXIME = int(os.getenv('REINCERCARI_MAXIME', 3))
+    REINCERCARI_BAZA = float(os.getenv('REINCERCARI_BAZA', 0.5))
+    REINCERCARI_PLAFON = float(os.getenv('REINCERCARI_PLAFON', 8))
+    # Fractiune din apeluri care poate fi reincercata per provider
+    REINCERCARI_RATA_BUGET = float(os.getenv('REINCERCARI_RATA_BUGET', 0.2))
+    # Intrebarile aceleiasi clase sosite in fereastra (secunde) sunt rutate intr-un singur apel LLM
+    RUTARE_LOT_ACTIVA = os.getenv('RUTARE_LOT_ACTIVA', 'false').lower() == 'true'
+    RUTARE_LOT_FEREASTRA = float(os.getenv('RUTARE_LOT_FEREASTRA', 0.05))
+    RUTARE_LOT_MAXIM = int(os.getenv('RUTARE_LOT_MAXIM', 8))
+
+    # Profilul directorului se genereaza pe un fir separat, in afara pornirii serverului
+    PROFIL_DIRECTOR_FUNDAL = os.getenv('PROFIL_DIRECTOR_FUNDAL', 'true').lower() == 'true'
+
 
 class ConfigFree:
     """Configuratii pentru versiunea gratuita"""
@@ -176,6 +239,13 @@ class TokenMonitor:
 
         self.save_usage()
 
+    def refund_tokens(self, user_id, tokens_used):
+        """Scade din cota utilizatorului tokenii unui raspuns aruncat (consumul zilnic real ramane)"""
+        users = self.usage_data["users"]
+        if user_id in users and tokens_used > 0:
+            users[user_id] = max(0, users[user_id] - tokens_used)
+            self.save_usage()
+
     def get_stats(self):
         """Returneaza statistici de utilizare"""
         self.reset_daily_if_needed()
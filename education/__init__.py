@@ -1,4 +1,10 @@
-from .gestor_materiale import GestorMateriale, get_gestor_materiale, slugify_text
-from .profesor import ConfigurariProfesor, Profesor
+from .gestor_materiale import DiferentaMateriale, GestorMateriale, get_gestor_materiale, slugify_text
+from .profesor import ConfigurariProfesor, CunostinteProfesor, Profesor, statistici_internare
 from .director import Director
+from .router_local import RouterLocal
+from .cache_rutare import CacheRutare, get_cache_rutare
+from .lot_rutare import LotRutare
+from .speculatie import RutareSpeculativa, get_rutare_speculativa
+from .istoric import DepozitIstoric, get_depozit_istoric
 
+from .rezumate import ConstructorRezumate
@@ -0,0 +1,42 @@
+import contextlib
+import os
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextlib.contextmanager
+def blocare_fisier(cale: Path, blocant: bool = True) -> Iterator[bool]:
+    """Inter-process exclusive lock on ``cale`` (created if missing).
+
+    Yields ``True`` when the lock is held. With ``blocant=False`` it yields
+    ``False`` immediately if another process already holds the lock.
+    """
+    cale = Path(cale)
+    cale.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(cale), os.O_RDWR | os.O_CREAT, 0o644)
+    obtinut = False
+    try:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocant else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:  # pragma: no cover - Windows
+                msvcrt.locking(fd, msvcrt.LK_LOCK if blocant else msvcrt.LK_NBLCK, 1)
+            obtinut = True
+        except OSError:
+            if blocant:
+                raise
+        yield obtinut
+    finally:
+        if obtinut:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        os.close(fd)
@@ -0,0 +1,187 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .blocare_fisier import blocare_fisier
+from .router_local import normalizeaza_intrebare
+
+logger = logging.getLogger(__name__)
+
+
+def amprenta_profesori(profesori: Iterable[Any]) -> str:
+    """Fingerprint of a class's teacher set; cached routes are dropped when it changes."""
+    perechi = sorted((profesor.nume, getattr(profesor, "materie", "")) for profesor in profesori)
+    return hashlib.sha1(json.dumps(perechi, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def cheie_rutare(scoala: str, clasa: int, intrebare: str) -> str:
+    return f"{scoala}|{clasa}|{' '.join(normalizeaza_intrebare(intrebare).split())}"
+
+
+class CacheRutare:
+    """TTL- and size-bounded cache of routing decisions keyed by (school, class, normalised question).
+
+    Every entry remembers the fingerprint of the teacher set it was decided
+    against, so adding, removing or renaming a teacher invalidates the routes
+    of that class on the next lookup. With a file path the cache is saved as
+    JSON and reloaded on start, so decisions survive restarts. Changes only
+    mark the cache as modified; the file is rewritten at most once every
+    ``interval_salvare`` seconds, and by ``salveaza()`` at shutdown, from a
+    snapshot so lookups never wait for the disk. Several workers can share
+    the file: each write takes the file lock and merges the unexpired entries
+    already on disk, so routes decided by other workers are kept (this
+    worker's entry wins on the same key) until ``goleste`` clears them.
+    """
+
+    def __init__(
+        self,
+        cale: Optional[Union[str, Path]] = None,
+        ttl: float = 86400,
+        capacitate: int = 5000,
+        interval_salvare: float = 5.0,
+    ) -> None:
+        self.cale = Path(cale) if cale else None
+        self.ttl = ttl
+        self.capacitate = capacitate
+        self.interval_salvare = interval_salvare
+        self._intrari: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializeaza scrierile fisierului, separat de lock-ul intrarilor
+        self._lock_salvare = threading.Lock()
+        self._modificat = False
+        # Dupa goleste() urmatoarea scriere inlocuieste fisierul in loc sa-l combine
+        self._golit = False
+        self._ultima_salvare = 0.0
+        self._incarca()
+
+    @property
+    def cale_lock(self) -> Path:
+        return self.cale.with_name(f".{self.cale.name}.lock")
+
+    def _citeste_disc(self) -> Dict[str, Dict[str, Any]]:
+        """Unexpired entries of the file, oldest first."""
+        if self.cale is None or not self.cale.exists():
+            return {}
+        try:
+            date = json.loads(self.cale.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Cache-ul de rutare nu a putut fi citit: %s", exc)
+            return {}
+        acum = time.time()
+        return {cheie: intrare for cheie, intrare in date.items() if intrare.get("expira", 0) > acum}
+
+    def _incarca(self) -> None:
+        self._intrari.update(self._citeste_disc())
+        while len(self._intrari) > self.capacitate:
+            self._intrari.popitem(last=False)
+
+    def salveaza(self, forteaza: bool = True) -> None:
+        """Write pending changes to the file; without ``forteaza`` only once the save interval has passed."""
+        if self.cale is None:
+            return
+        if not self._lock_salvare.acquire(blocking=forteaza):
+            return  # alt fir scrie deja; modificarile raman marcate pentru urmatoarea salvare
+        try:
+            with self._lock:
+                if not self._modificat:
+                    return
+                if not forteaza and time.monotonic() - self._ultima_salvare < self.interval_salvare:
+                    return
+                # Intrarile nu se modifica pe loc (seteaza pune un dict nou), deci o copie superficiala ajunge
+                instantaneu = dict(self._intrari)
+                imbina = not self._golit
+                self._modificat = False
+                self._golit = False
+                self._ultima_salvare = time.monotonic()
+            if not self._scrie(instantaneu, imbina):
+                with self._lock:
+                    self._modificat = True
+                    self._golit = self._golit or not imbina
+        finally:
+            self._lock_salvare.release()
+
+    def _scrie(self, intrari: Dict[str, Dict[str, Any]], imbina: bool = True) -> bool:
+        tmp_path = None
+        try:
+            with blocare_fisier(self.cale_lock):
+                if imbina:
+                    # Intrarile altor workeri raman, cele mai vechi primele la depasirea capacitatii
+                    de_pe_disc = self._citeste_disc()
+                    for cheie in intrari:
+                        de_pe_disc.pop(cheie, None)
+                    de_pe_disc.update(intrari)
+                    intrari = de_pe_disc
+                    for cheie in list(intrari)[: max(0, len(intrari) - self.capacitate)]:
+                        del intrari[cheie]
+                with tempfile.NamedTemporaryFile(
+                    "w", encoding="utf-8", dir=self.cale.parent,
+                    prefix=self.cale.name + ".", suffix=".tmp", delete=False,
+                ) as tmp:
+                    tmp_path = tmp.name
+                    json.dump(intrari, tmp, ensure_ascii=False)
+                os.replace(tmp_path, self.cale)
+            return True
+        except Exception as exc:
+            logger.warning("Cache-ul de rutare nu a putut fi salvat: %s", exc)
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+            return False
+
+    def obtine(self, scoala: str, clasa: int, intrebare: str, amprenta: str) -> Optional[str]:
+        """Cached teacher name, or None when missing, expired or decided for another teacher set."""
+        cheie = cheie_rutare(scoala, clasa, intrebare)
+        with self._lock:
+            intrare = self._intrari.get(cheie)
+            if intrare is None:
+                return None
+            if intrare["expira"] > time.time() and intrare["amprenta"] == amprenta:
+                self._intrari.move_to_end(cheie)
+                return intrare["profesor"]
+            del self._intrari[cheie]
+            self._modificat = True
+        self.salveaza(forteaza=False)
+        return None
+
+    def seteaza(self, scoala: str, clasa: int, intrebare: str, amprenta: str, profesor: str) -> None:
+        cheie = cheie_rutare(scoala, clasa, intrebare)
+        with self._lock:
+            self._intrari[cheie] = {"profesor": profesor, "amprenta": amprenta, "expira": time.time() + self.ttl}
+            self._intrari.move_to_end(cheie)
+            while len(self._intrari) > self.capacitate:
+                self._intrari.popitem(last=False)
+            self._modificat = True
+        self.salveaza(forteaza=False)
+
+    def goleste(self) -> None:
+        with self._lock:
+            self._intrari.clear()
+            self._modificat = True
+            self._golit = True
+        self.salveaza()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._intrari)
+
+
+def get_cache_rutare() -> CacheRutare:
+    if not hasattr(get_cache_rutare, "_instance"):
+        from config import Config
+
+        get_cache_rutare._instance = CacheRutare(
+            Config.CACHE_RUTARE_FILE or None,
+            ttl=Config.CACHE_RUTARE_TTL,
+            capacitate=Config.CACHE_RUTARE_CAPACITATE,
+            interval_salvare=Config.CACHE_RUTARE_SALVARE_INTERVAL,
+        )
+        # Modificarile din ultimul interval se scriu la oprirea procesului
+        atexit.register(get_cache_rutare._instance.salveaza)
+    return get_cache_rutare._instance
@@ -0,0 +1,237 @@
+import contextlib
+import json
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .blocare_fisier import blocare_fisier
+
+logger = logging.getLogger(__name__)
+
+_INDEX_FILENAME = "texte_index.json"
+_LOCK_FILENAME = ".texte.lock"
+# Un caracter UTF-8 ocupa cel mult 4 octeti
+_OCTETI_PE_CARACTER = 4
+
+
+class DepozitTextMapat:
+    """Append-only store of extracted texts shared by all worker processes.
+
+    Texts are written once into a UTF-8 blob file and located through a JSON
+    offset index keyed by content hash. Readers memory-map the blob read-only,
+    so the pages live once in the OS page cache no matter how many gunicorn
+    workers attach, and only the requested slice is decoded. Every lookup
+    stats the index file and reloads it, under the file lock, when another
+    worker has rewritten it (appended, replaced or compacted texts).
+    """
+
+    def __init__(self, director: Path) -> None:
+        self.director = Path(director)
+        self.cale_index = self.director / _INDEX_FILENAME
+        self.cale_lock = self.director / _LOCK_FILENAME
+        self._lock = threading.RLock()
+        self._index: Dict[str, Dict[str, int]] = {}
+        self._generatie = 0
+        self._nume_blob = ""
+        self._fisier = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._semnatura: Optional[tuple] = None
+        # Adevarat cat timp acest proces tine blocarea fisierului (flock nu este reentrant)
+        self._blocat = False
+        self._reincarca_index()
+
+    # ------------------------------------------------------------------ index
+    def _citeste_index_disc(self) -> Dict[str, object]:
+        if not self.cale_index.exists():
+            return {}
+        try:
+            return json.loads(self.cale_index.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Indexul depozitului de text nu a putut fi citit: %s", exc)
+            return {}
+
+    def _semnatura_index(self) -> Optional[tuple]:
+        """Identity of the index file on disk; ``os.replace`` gives every rewrite a new inode."""
+        try:
+            info = self.cale_index.stat()
+        except OSError:
+            return None
+        return (info.st_ino, info.st_mtime_ns, info.st_size)
+
+    def _verifica_index(self) -> None:
+        """Reload the index if another worker rewrote it since this view last read it."""
+        if self._blocat or self._semnatura_index() == self._semnatura:
+            return
+        with blocare_fisier(self.cale_lock):
+            self._reincarca_index()
+
+    def _reincarca_index(self) -> None:
+        semnatura = self._semnatura_index()
+        data = self._citeste_index_disc()
+        generatie = int(data.get("generatie", 0))
+        nume_blob = str(data.get("blob", ""))
+        with self._lock:
+            if nume_blob != self._nume_blob or generatie != self._generatie:
+                self._inchide_mapare()
+            self._index = data.get("texte", {})
+            self._generatie = generatie
+            self._nume_blob = nume_blob
+            self._semnatura = semnatura
+
+    def _scrie_index(self, texte: Dict[str, Dict[str, int]], generatie: int, nume_blob: str) -> None:
+        payload = {"generatie": generatie, "blob": nume_blob, "texte": texte}
+        tmp_path = self.cale_index.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.cale_index)
+
+    # ---------------------------------------------------------------- mapping
+    def _inchide_mapare(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._fisier is not None:
+            self._fisier.close()
+            self._fisier = None
+
+    def _mapare(self, sfarsit_necesar: int) -> Optional[mmap.mmap]:
+        """Return a read-only mapping of the blob that covers at least ``sfarsit_necesar`` bytes."""
+        if self._mmap is not None and len(self._mmap) >= sfarsit_necesar:
+            return self._mmap
+        self._inchide_mapare()
+        if not self._nume_blob:
+            return None
+        cale_blob = self.director / self._nume_blob
+        try:
+            self._fisier = open(cale_blob, "rb")
+            if os.fstat(self._fisier.fileno()).st_size == 0:
+                return None
+            self._mmap = mmap.mmap(self._fisier.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            logger.error("Blob-ul de text %s nu a putut fi mapat: %s", cale_blob, exc)
+            self._inchide_mapare()
+            return None
+        return self._mmap if len(self._mmap) >= sfarsit_necesar else None
+
+    # ----------------------------------------------------------------- public
+    def contine(self, sha: str) -> bool:
+        with self._lock:
+            self._verifica_index()
+            return sha in self._index
+
+    def lungime(self, sha: str) -> int:
+        with self._lock:
+            self._verifica_index()
+            intrare = self._index.get(sha)
+            return intrare["caractere"] if intrare else 0
+
+    def meta(self, sha: str) -> Dict[str, Any]:
+        """Metadata saved with the text (for example the normalisation version and token report)."""
+        with self._lock:
+            self._verifica_index()
+            intrare = self._index.get(sha)
+            return dict(intrare.get("meta", {})) if intrare else {}
+
+    def hashuri(self) -> List[str]:
+        with self._lock:
+            self._verifica_index()
+            return list(self._index)
+
+    def citeste(self, sha: str, limita_caractere: Optional[int] = None) -> Optional[str]:
+        """Decode the stored text for ``sha``, or only its first ``limita_caractere`` characters."""
+        with self._lock:
+            if not self.contine(sha):
+                return None
+            intrare = self._index[sha]
+            offset, lungime = intrare["offset"], intrare["octeti"]
+            if limita_caractere is not None:
+                lungime = min(lungime, limita_caractere * _OCTETI_PE_CARACTER)
+            harta = self._mapare(offset + intrare["octeti"])
+            if harta is None:
+                return None
+            text = harta[offset : offset + lungime].decode("utf-8", errors="ignore")
+        return text if limita_caractere is None else text[:limita_caractere]
+
+    def adauga(
+        self, sha: str, text: str, meta: Optional[Dict[str, Any]] = None, inlocuieste: bool = False
+    ) -> None:
+        """Append ``text`` under ``sha`` unless another worker already stored it.
+
+        With ``inlocuieste`` the index is pointed at the new bytes; the old ones
+        stay in the blob until the next ``compacteaza``.
+        """
+        with self._lock, self._blocare():
+            self._reincarca_index()
+            if sha in self._index and (not inlocuieste or self._index[sha].get("meta") == meta):
+                return
+            nume_blob = self._nume_blob or f"texte_{self._generatie}.blob"
+            cale_blob = self.director / nume_blob
+            date = text.encode("utf-8")
+            with open(cale_blob, "ab") as handler:
+                offset = handler.seek(0, os.SEEK_END)
+                handler.write(date)
+                handler.flush()
+                os.fsync(handler.fileno())
+            texte = dict(self._index)
+            texte[sha] = {"offset": offset, "octeti": len(date), "caractere": len(text)}
+            if meta:
+                texte[sha]["meta"] = meta
+            self._scrie_index(texte, self._generatie, nume_blob)
+            self._index = texte
+            self._nume_blob = nume_blob
+            self._semnatura = self._semnatura_index()
+
+    def compacteaza(self, hashuri_pastrate: Iterable[str]) -> int:
+        """Rewrite the blob keeping only ``hashuri_pastrate``; returns the number of dropped texts.
+
+        The compacted blob gets a new generation file name. Other workers
+        notice the rewritten index on their next lookup and remap; until then
+        a mapping of the previous blob stays readable.
+        """
+        pastrate = set(hashuri_pastrate)
+        with self._lock, self._blocare():
+            self._reincarca_index()
+            eliminate = [sha for sha in self._index if sha not in pastrate]
+            if not eliminate:
+                return 0
+            texte_pastrate = {sha: self.citeste(sha) for sha in self._index if sha in pastrate}
+            meta_pastrate = {sha: self._index[sha].get("meta") for sha in texte_pastrate}
+            blob_vechi = self.director / self._nume_blob if self._nume_blob else None
+            generatie = self._generatie + 1
+            nume_blob = f"texte_{generatie}.blob"
+            texte: Dict[str, Dict[str, int]] = {}
+            with open(self.director / nume_blob, "wb") as handler:
+                for sha, text in texte_pastrate.items():
+                    if text is None:
+                        continue
+                    date = text.encode("utf-8")
+                    texte[sha] = {"offset": handler.tell(), "octeti": len(date), "caractere": len(text)}
+                    if meta_pastrate[sha]:
+                        texte[sha]["meta"] = meta_pastrate[sha]
+                    handler.write(date)
+                handler.flush()
+                os.fsync(handler.fileno())
+            self._scrie_index(texte, generatie, nume_blob)
+            self._reincarca_index()
+            if blob_vechi is not None:
+                try:
+                    blob_vechi.unlink()
+                except OSError as exc:  # pragma: no cover - Windows pastreaza fisierele mapate
+                    logger.debug("Blob-ul vechi %s nu a putut fi sters: %s", blob_vechi, exc)
+        logger.info("Depozit text compactat: %d texte eliminate", len(eliminate))
+        return len(eliminate)
+
+    @contextlib.contextmanager
+    def _blocare(self) -> Iterator[None]:
+        with blocare_fisier(self.cale_lock):
+            self._blocat = True
+            try:
+                yield
+            finally:
+                self._blocat = False
+
+    def inchide(self) -> None:
+        with self._lock:
+            self._inchide_mapare()
@@ -1,22 +1,105 @@
 ﻿import json
 import logging
 import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import openai
 
 from ai_clients import ai_client_manager
+from config import Config
+from reincercari import planificator_reincercari
+from termen_limita import TermenDepasit, timeout_pentru
+from .blocare_fisier import blocare_fisier
+from .cache_rutare import amprenta_profesori, get_cache_rutare
 from .gestor_materiale import get_gestor_materiale
+from .istoric import get_depozit_istoric
+from .lot_rutare import LotRutare
+from .potrivire_cuvinte import AutomatCuvinteCheie
 from .profesor import ConfigurariProfesor
+from .rezumate import cheie_rezumat
+from .router_local import RouterLocal, exemple_din_cuvinte_cheie
+from .scorare_vectoriala import ScorareVectoriala, numpy_disponibil
 
 logger = logging.getLogger(__name__)
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Reincercarile sunt facute de planificator_reincercari, nu de SDK
+client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 
+_DIRECTOR_FOLDER = "director_pedagogie"
 _PROFILE_FILENAME = "profil_director.json"
 _MAX_PROFILE_SOURCE = 4096
 
+_DOMENII_FALLBACK: Dict[str, List[str]] = {
+    "matematica": ["matemat", "numar", "problem", "calcul", "arie", "fract", "geometr", "algebr"],
+    "romana": ["litera", "povest", "cuvant", "comunicare", "citit", "scris", "gramatic", "text", "compunere"],
+    "limba": ["litera", "povest", "cuvant", "comunicare", "citit", "scris", "gramatic", "text", "limba"],
+    "muzica": ["muzic", "sunet", "instrument", "cant", "ritm", "melodie"],
+    "stiinta": ["stiint", "experiment", "natura", "fizic", "chimic", "biolog"],
+    "arte": ["desen", "pictur", "culor", "creativ", "artistic"],
+    "sport": ["sport", "miscar", "exercit", "fizic", "joac"],
+    "educatie": ["civica", "moral", "comportament", "valori"],
+}
+
+_AUTOMAT_DOMENII = AutomatCuvinteCheie(_DOMENII_FALLBACK)
+# Doar deciziile directorului LLM sunt etichete de antrenare (nu si cele ale routerului sau fallback-ului)
+_METODE_ANTRENARE = ("director_ai",)
+
+
+def _confidence(valoare: Any) -> float:
+    """Confidence reported by the LLM as a float in [0, 1]; 0.5 when missing or not a number."""
+    try:
+        confidence = float(valoare)
+    except (TypeError, ValueError):
+        return 0.5
+    if confidence != confidence:  # NaN
+        return 0.5
+    return min(1.0, max(0.0, confidence))
+
+
+def _interpreteaza_decizie(content: str) -> Optional[Tuple[str, str, float]]:
+    """``(profesor, justificare, confidence)`` from the director's JSON answer (plain text is taken as the name)."""
+    if not content:
+        return None
+    try:
+        rezultat = json.loads(content)
+    except json.JSONDecodeError:
+        rezultat = None
+    if not isinstance(rezultat, dict):
+        # Fallback la text simplu
+        return content, "", 0.5
+    return str(rezultat.get("profesor", "")), rezultat.get("justificare", ""), _confidence(rezultat.get("confidence"))
+
+
+def _interpreteaza_decizii_lot(content: str, numar: int) -> List[Optional[Tuple[str, str, float]]]:
+    """Decisions of a batched answer, matched by their 1-based ``index`` (or by position)."""
+    decizii: List[Optional[Tuple[str, str, float]]] = [None] * numar
+    try:
+        rezultat = json.loads(content) if content else None
+    except json.JSONDecodeError:
+        logger.warning("Raspunsul directorului pentru lot nu este JSON valid: %s", content[:120])
+        return decizii
+    if isinstance(rezultat, dict):
+        # Un singur obiect {"profesor": ...} in loc de lista este tot o decizie (pentru index 1 daca lipseste)
+        elemente = rezultat.get("decizii") if "decizii" in rezultat else [rezultat]
+    else:
+        elemente = rezultat
+    if not isinstance(elemente, list):
+        return decizii
+    for pozitie, element in enumerate(elemente):
+        if not isinstance(element, dict):
+            continue
+        index = element.get("index")
+        index = index - 1 if isinstance(index, int) and 1 <= index <= numar else pozitie
+        if index < numar and decizii[index] is None:
+            decizii[index] = (
+                str(element.get("profesor", "")),
+                element.get("justificare", ""),
+                _confidence(element.get("confidence")),
+            )
+    return decizii
+
 
 class Director:
     """Directorul coordoneaza selectia profesorilor folosind cunostinte pedagogice."""
@@ -24,51 +107,301 @@ class Director:
     def __init__(self, nume: str, scoala, configurari: Optional[ConfigurariProfesor] = None) -> None:
         self.nume = nume
         self.scoala = scoala
-        self.configurari = configurari or ConfigurariProfesor(temperature=0.3, model="gpt-5")
-        self.istoric_decizii: List[Dict[str, Any]] = []
+        self.configurari = ConfigurariProfesor.interneaza(
+            configurari or ConfigurariProfesor(temperature=0.3, model="gpt-5")
+        )
         self.gestor_materiale = get_gestor_materiale()
         self.cunostinte_pedagogice = ""
+        self.referinte_materiale: List[Tuple[str, str]] = []
         self.profil_pedagogic: Dict[str, Any] = {}
+        self._fir_profil: Optional[threading.Thread] = None
+        self._lock_profil = threading.Lock()
+        self._initializeaza_router()
         self.incarca_materiale_pedagogice()
         self.incarca_sau_genereaza_profil()
 
+    def instantaneu(self) -> Dict[str, Any]:
+        """Serializable state needed to restore the director without reading materials or the profile."""
+        return {
+            "nume": self.nume,
+            "configurari": self.configurari.ca_dict(),
+            "cunostinte": self.cunostinte_pedagogice,
+            "referinte": [list(referinta) for referinta in self.referinte_materiale],
+            "profil": self.profil_pedagogic,
+        }
+
+    @classmethod
+    def din_instantaneu(cls, date: Dict[str, Any], scoala) -> "Director":
+        director = cls.__new__(cls)
+        director.nume = date["nume"]
+        director.scoala = scoala
+        director.configurari = ConfigurariProfesor.din_dict(date.get("configurari", {}))
+        director.gestor_materiale = get_gestor_materiale()
+        director.cunostinte_pedagogice = date.get("cunostinte", "")
+        director.referinte_materiale = [tuple(referinta) for referinta in date.get("referinte", [])]
+        director.profil_pedagogic = date.get("profil") or {}
+        director._fir_profil = None
+        director._lock_profil = threading.Lock()
+        director._initializeaza_router()
+        if director.cunostinte_pedagogice and not director.profil_pedagogic:
+            # Instantaneul poate fi salvat inainte ca profilul generat in fundal sa fie gata
+            director.incarca_sau_genereaza_profil()
+        return director
+
+    def _initializeaza_router(self) -> None:
+        self.router_local = RouterLocal()
+        self._decizii_ai_neinvatate = 0
+        self._contor_rutare = {"router_local": 0, "apeluri_llm": 0, "cache_hit": 0, "cache_miss": 0}
+        self._lock_router = threading.Lock()
+        self._fir_router: Optional[threading.Thread] = None
+        # Scorarea vectoriala per clasa, refolosita cat timp profesorii clasei nu se schimba
+        self._scorari_lot: Dict[int, Tuple[Tuple[str, Tuple[bool, ...]], ScorareVectoriala]] = {}
+        self._lot_rutare = LotRutare(
+            self._decide_lot_cu_fallback, fereastra=Config.RUTARE_LOT_FEREASTRA, maxim=Config.RUTARE_LOT_MAXIM
+        )
+        if Config.ROUTER_LOCAL_ACTIV:
+            # Primul model se antreneaza in fundal de la constructie; pana atunci decide directorul LLM
+            self.antreneaza_router()
+
+    def _profesori_scoala(self) -> List[Tuple[str, str]]:
+        perechi = {}
+        for clasa in self.scoala.clase.values():
+            for profesor in clasa.profesori.values():
+                perechi.setdefault(profesor.nume, profesor.materie)
+        return sorted(perechi.items())
+
+    def _exemple_antrenare(self, depozit=None) -> List[Tuple[str, str, float]]:
+        exemple = exemple_din_cuvinte_cheie(self._profesori_scoala(), _DOMENII_FALLBACK)
+        depozit = depozit or get_depozit_istoric()
+        decizii = depozit.cauta_decizii(proprietar=self.cheie_istoric, limita=Config.ROUTER_LOCAL_MAX_EXEMPLE)
+        if not decizii:
+            decizii = depozit.decizii_recente(self.cheie_istoric)
+        for decizie in decizii:
+            if decizie.get("metoda") in _METODE_ANTRENARE and decizie.get("profesor_ales"):
+                exemple.append((decizie.get("intrebare", ""), decizie["profesor_ales"], 1.0))
+        return exemple
+
+    def antreneaza_router(self, in_fundal: Optional[bool] = None) -> None:
+        """(Re)train the local router from the keyword tables and the logged LLM routing decisions.
+
+        By default (``ROUTER_LOCAL_FUNDAL``) training runs on a daemon thread,
+        also for the first model at construction, so neither server boot nor
+        snapshot restore waits for it. Requests keep using the current model
+        meanwhile (the director LLM before the first one); ``RouterLocal``
+        swaps the new weights in at once when training ends.
+        """
+        if in_fundal is None:
+            in_fundal = Config.ROUTER_LOCAL_FUNDAL
+        # Depozitul se rezolva pe firul apelant, ca antrenarea sa citeasca acelasi istoric
+        depozit = get_depozit_istoric()
+        with self._lock_router:
+            if self._fir_router is not None and self._fir_router.is_alive():
+                return
+            # Deciziile venite in timpul antrenarii se numara pentru urmatoarea reantrenare
+            self._decizii_ai_neinvatate = 0
+            if in_fundal:
+                self._fir_router = threading.Thread(
+                    target=self._antreneaza_router, args=(depozit,), name=f"router-{self.nume}", daemon=True
+                )
+                self._fir_router.start()
+                return
+        self._antreneaza_router(depozit)
+
+    def _antreneaza_router(self, depozit) -> None:
+        try:
+            self.router_local.antreneaza(self._exemple_antrenare(depozit))
+        except Exception as exc:
+            logger.error("Antrenarea routerului local a esuat: %s", exc)
+
+    def asteapta_router(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background router training; True when none is running anymore."""
+        fir = self._fir_router
+        if fir is not None:
+            fir.join(timeout)
+            return not fir.is_alive()
+        return True
+
+    def _numara_decizie_ai(self) -> None:
+        """Count a new LLM routing decision and retrain the router once enough have piled up."""
+        with self._lock_router:
+            self._decizii_ai_neinvatate += 1
+            reantrenare = self._decizii_ai_neinvatate >= Config.ROUTER_LOCAL_REANTRENARE
+        if reantrenare and Config.ROUTER_LOCAL_ACTIV:
+            self.antreneaza_router()
+
+    def _alege_profesor_din_cache(self, intrebare: str, profesori: List[Any], clasa_tinta: int, amprenta: str):
+        """Teacher remembered for the same question in this class, if the teacher set is unchanged."""
+        nume = get_cache_rutare().obtine(self.scoala.nume, clasa_tinta, intrebare, amprenta)
+        profesor = next((p for p in profesori if p.nume == nume), None) if nume else None
+        if profesor is None:
+            self._contor_rutare["cache_miss"] += 1
+            return None
+        self._contor_rutare["cache_hit"] += 1
+        self.inregistreaza_decizie(
+            {
+                "intrebare": intrebare,
+                "profesor_ales": profesor.nume,
+                "clasa": clasa_tinta,
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "metoda": "cache",
+            }
+        )
+        return profesor
+
+    def _alege_profesor_local(self, intrebare: str, profesori: List[Any], clasa_tinta: int):
+        """Teacher predicted by the local router, or None when its confidence is below the threshold."""
+        if not Config.ROUTER_LOCAL_ACTIV or not self.router_local.antrenat:
+            return None
+        dupa_nume = {profesor.nume: profesor for profesor in profesori}
+        nume, confidence = self.router_local.prezice(intrebare, dupa_nume)
+        if nume is None or confidence < Config.ROUTER_LOCAL_PRAG:
+            return None
+        self._contor_rutare["router_local"] += 1
+        self.inregistreaza_decizie(
+            {
+                "intrebare": intrebare,
+                "profesor_ales": nume,
+                "clasa": clasa_tinta,
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "metoda": "router_local",
+                "confidence": round(confidence, 3),
+            }
+        )
+        return dupa_nume[nume]
+
+    @property
+    def cheie_istoric(self) -> str:
+        return f"{getattr(self.scoala, 'nume', self.scoala)}/{self.nume}"
+
+    @property
+    def istoric_decizii(self) -> List[Dict[str, Any]]:
+        """Most recent routing decisions (bounded); older ones are queried from the history store."""
+        return get_depozit_istoric().decizii_recente(self.cheie_istoric)
+
+    def inregistreaza_decizie(self, decizie: Dict[str, Any]) -> None:
+        get_depozit_istoric().adauga_decizie(self.cheie_istoric, decizie)
+
     def incarca_materiale_pedagogice(self) -> None:
-        cale_director = self.gestor_materiale.cale_baza / "director_pedagogie"
-        cale_director.mkdir(exist_ok=True)
-        materiale = list(cale_director.glob("*.pdf"))
+        materiale = self.gestor_materiale.gaseste_materiale_director()
         cunostinte = []
+        referinte = []
         for material in materiale:
-            text = self.gestor_materiale.incarca_pdf_cu_cache(material)
+            sha = self.gestor_materiale.asigura_text_extras(material)
+            text = self.gestor_materiale.citeste_fragment(sha, 2584) if sha else ""
             if text:
-                cunostinte.append(f"Din {material.name}: {text[:2584]}...")
+                cunostinte.append(f"Din {material.name}: {text}...")
+                referinte.append((material.name, sha))
         self.cunostinte_pedagogice = "\n\n".join(cunostinte)
+        self.referinte_materiale = referinte
 
-    def incarca_sau_genereaza_profil(self) -> None:
-        cale_profil = self.gestor_materiale.cale_baza / "director_pedagogie" / _PROFILE_FILENAME
-        profil = None
-        # Check cache validity
-        if cale_profil.exists():
-            try:
-                profil = json.loads(cale_profil.read_text(encoding="utf-8"))
-                # Invalidare dacă PDF-urile s-au modificat
-                profile_mtime = cale_profil.stat().st_mtime
-                materiale = list((self.gestor_materiale.cale_baza / "director_pedagogie").glob("*.pdf"))
-                if any(m.stat().st_mtime > profile_mtime for m in materiale):
-                    logger.info("PDF-uri modificate, regenerare profil director")
-                    profil = None
-            except Exception as exc:
-                logger.warning("Nu s-a putut citi profilul directorului: %s", exc)
-        if profil is None:
-            profil = self.genereaza_profil_din_materiale()
-            if profil:
-                profil["generated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
-                materiale = list((self.gestor_materiale.cale_baza / "director_pedagogie").glob("*.pdf"))
-                profil["sources"] = [m.name for m in materiale]
-                try:
-                    cale_profil.write_text(json.dumps(profil, ensure_ascii=False, indent=2), encoding="utf-8")
-                except Exception as exc:
-                    logger.warning("Nu s-a putut scrie profilul directorului: %s", exc)
-        self.profil_pedagogic = profil or {}
+    @property
+    def cheie_rezumat(self) -> Optional[str]:
+        if not self.referinte_materiale:
+            return None
+        return cheie_rezumat("director", (sha for _, sha in self.referinte_materiale))
+
+    @property
+    def rezumat_pedagogic(self) -> Optional[str]:
+        cheie = self.cheie_rezumat
+        return self.gestor_materiale.depozit_rezumate.obtine(cheie) if cheie else None
+
+    def reimprospateaza_materiale(self, diferenta) -> bool:
+        """Reload pedagogy materials and regenerate the profile if the diff touches the director folder."""
+        if not diferenta.afecteaza([_DIRECTOR_FOLDER]):
+            return False
+        self.incarca_materiale_pedagogice()
+        self.incarca_sau_genereaza_profil(forteaza=True)
+        logger.info("Materiale pedagogice reincarcate pentru directorul %s", self.nume)
+        return True
+
+    @property
+    def cale_profil(self) -> Path:
+        return self.gestor_materiale.cale_baza / _DIRECTOR_FOLDER / _PROFILE_FILENAME
+
+    def _citeste_profil(self) -> Optional[Dict[str, Any]]:
+        """Saved profile, or None when missing, unreadable or older than the pedagogy PDFs."""
+        cale_profil = self.cale_profil
+        if not cale_profil.exists():
+            return None
+        try:
+            profil = json.loads(cale_profil.read_text(encoding="utf-8"))
+            # Invalidare dacă PDF-urile s-au modificat
+            profile_mtime = cale_profil.stat().st_mtime
+            materiale = self.gestor_materiale.gaseste_materiale_director()
+            if any(m.stat().st_mtime > profile_mtime for m in materiale):
+                logger.info("PDF-uri modificate, regenerare profil director")
+                return None
+            return profil
+        except Exception as exc:
+            logger.warning("Nu s-a putut citi profilul directorului: %s", exc)
+            return None
+
+    def incarca_sau_genereaza_profil(self, forteaza: bool = False, in_fundal: Optional[bool] = None) -> None:
+        """Load the saved profile, or generate it from the pedagogy materials.
+
+        A saved profile is read right away. Generation needs an LLM call, so by
+        default (``PROFIL_DIRECTOR_FUNDAL``) it runs on a daemon thread and the
+        director keeps serving with its current profile, empty at startup,
+        until the new one is ready.
+        """
+        profil = None if forteaza else self._citeste_profil()
+        if profil is not None:
+            self.profil_pedagogic = profil
+            return
+        if not self.cunostinte_pedagogice:
+            self.profil_pedagogic = {}
+            return
+        if in_fundal is None:
+            in_fundal = Config.PROFIL_DIRECTOR_FUNDAL
+        if not in_fundal:
+            self._genereaza_profil_partajat(forteaza)
+            return
+        with self._lock_profil:
+            if self._fir_profil is not None and self._fir_profil.is_alive():
+                return
+            self._fir_profil = threading.Thread(
+                target=self._genereaza_profil_partajat, args=(forteaza,), name=f"profil-{self.nume}", daemon=True
+            )
+            self._fir_profil.start()
+
+    def _genereaza_profil_partajat(self, forteaza: bool) -> None:
+        """Generate and save the profile under a file lock, so only one worker calls the LLM.
+
+        Workers that wait for the lock use the profile written meanwhile
+        instead of generating it again.
+        """
+        cale_profil = self.cale_profil
+        mtime_initial = cale_profil.stat().st_mtime if cale_profil.exists() else None
+        try:
+            with blocare_fisier(cale_profil.with_suffix(".lock")):
+                scris_intre_timp = cale_profil.exists() and cale_profil.stat().st_mtime != mtime_initial
+                profil = None if forteaza and not scris_intre_timp else self._citeste_profil()
+                if profil is None:
+                    profil = self.genereaza_profil_din_materiale()
+                    if profil:
+                        profil["generated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+                        materiale = self.gestor_materiale.gaseste_materiale_director()
+                        profil["sources"] = [m.name for m in materiale]
+                        try:
+                            tmp_path = cale_profil.with_suffix(".tmp")
+                            tmp_path.write_text(json.dumps(profil, ensure_ascii=False, indent=2), encoding="utf-8")
+                            os.replace(tmp_path, cale_profil)
+                        except Exception as exc:
+                            logger.warning("Nu s-a putut scrie profilul directorului: %s", exc)
+        except Exception as exc:
+            logger.error("Generarea profilului directorului %s a esuat: %s", self.nume, exc, exc_info=True)
+            return
+        if profil:
+            self.profil_pedagogic = profil
+            logger.info("Profilul directorului %s este gata", self.nume)
+
+    def asteapta_profil(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a background profile generation; True when none is running anymore."""
+        fir = self._fir_profil
+        if fir is not None:
+            fir.join(timeout)
+            return not fir.is_alive()
+        return True
 
     def genereaza_profil_din_materiale(self) -> Optional[Dict[str, Any]]:
         if not self.cunostinte_pedagogice:
@@ -127,9 +460,9 @@ class Director:
         return "\n".join(linii)
 
     def _formateaza_istoric(self) -> str:
-        if not self.istoric_decizii:
-            return ""
         ultimele = self.istoric_decizii[-3:]
+        if not ultimele:
+            return ""
         linii = ["Experienta recenta a directorului:"]
         for entry in reversed(ultimele):
             intrebare = entry.get("intrebare", "")[:80]
@@ -138,90 +471,155 @@ class Director:
             )
         return "\n".join(linii)
 
-    def alege_profesor_pentru_intrebare(self, intrebare: str, clasa_tinta: int):
-        if clasa_tinta not in self.scoala.clase:
+    def _profesori_clasa(self, clasa_tinta: int) -> List[Any]:
+        clasa = self.scoala.clase.get(clasa_tinta)
+        return list(clasa.profesori.values()) if clasa is not None else []
+
+    def alege_profesor_pentru_intrebare(self, intrebare: str, clasa_tinta: int, termen=None):
+        return self.alege_profesor_fara_llm(intrebare, clasa_tinta) or self.alege_profesor_cu_llm(
+            intrebare, clasa_tinta, termen
+        )
+
+    def alege_profesor_fara_llm(self, intrebare: str, clasa_tinta: int):
+        """Teacher from the routing cache or a confident local router, or None when the LLM is needed."""
+        profesori_disponibili = self._profesori_clasa(clasa_tinta)
+        if not profesori_disponibili:
             return None
-        clasa = self.scoala.clase[clasa_tinta]
-        profesori_disponibili = list(clasa.profesori.values())
+        amprenta = amprenta_profesori(profesori_disponibili)
+        profesor_cache = self._alege_profesor_din_cache(intrebare, profesori_disponibili, clasa_tinta, amprenta)
+        if profesor_cache is not None:
+            return profesor_cache
+
+        profesor_local = self._alege_profesor_local(intrebare, profesori_disponibili, clasa_tinta)
+        if profesor_local is not None:
+            get_cache_rutare().seteaza(self.scoala.nume, clasa_tinta, intrebare, amprenta, profesor_local.nume)
+        return profesor_local
+
+    def ghiceste_profesor(self, intrebare: str, clasa_tinta: int):
+        """Keyword-fallback prediction without recording a decision, used to start answering early."""
+        scoruri = self._scoruri_fallback(intrebare, self._profesori_clasa(clasa_tinta), clasa_tinta)
+        return scoruri[0]["profesor"] if scoruri else None
+
+    def alege_profesor_cu_llm(self, intrebare: str, clasa_tinta: int, termen=None):
+        """Ask the director LLM; falls back to the keyword scores when the call fails.
+
+        With a request ``termen`` the retries only use the time left after
+        ``TERMEN_REZERVA_PROFESOR`` is set aside for the teacher's answer, and
+        the keyword fallback is used as soon as that budget runs out. With
+        ``RUTARE_LOT_ACTIVA`` the questions of a class that arrive within
+        ``RUTARE_LOT_FEREASTRA`` seconds share one LLM call.
+        """
+        profesori_disponibili = self._profesori_clasa(clasa_tinta)
         if not profesori_disponibili:
             return None
+        amprenta = amprenta_profesori(profesori_disponibili)
+        termen_director = termen.subtermen(Config.TERMEN_REZERVA_PROFESOR) if termen is not None else None
+        if Config.RUTARE_LOT_ACTIVA:
+            rezultat = self._lot_rutare.ruteaza(clasa_tinta, intrebare, termen_director)
+        else:
+            rezultat = self._decide_lot_cu_fallback(clasa_tinta, [intrebare], termen_director)[0]
+        # Un urmas care nu a mai asteptat lotul primeste None si se puncteaza singur
+        decizie, scoruri_fallback = rezultat if rezultat is not None else (None, None)
 
-        prompt = self.creeaza_prompt_director(intrebare, clasa_tinta, profesori_disponibili)
+        if decizie is not None:
+            profesor_ales_nume, justificare, confidence = decizie
+            for profesor in profesori_disponibili:
+                if profesor.nume.lower() in profesor_ales_nume.lower():
+                    self.inregistreaza_decizie(
+                        {
+                            "intrebare": intrebare,
+                            "profesor_ales": profesor.nume,
+                            "clasa": clasa_tinta,
+                            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                            "metoda": "director_ai",
+                            "justificare": justificare,
+                            "confidence": confidence,
+                        }
+                    )
+                    self._numara_decizie_ai()
+                    get_cache_rutare().seteaza(self.scoala.nume, clasa_tinta, intrebare, amprenta, profesor.nume)
+                    return profesor
+            logger.info("Directorul nu a returnat un nume clar, se foloseste fallback-ul logic.")
 
-        # Retry cu exponential backoff
-        for tentativa in range(3):
-            try:
-                timeout = 5 * (2**tentativa)  # 5s, 10s, 20s
-                response = client.chat.completions.create(
-                    model=self.configurari.model,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=200,
-                    temperature=self.configurari.temperature,
-                    timeout=timeout,
-                )
-                content = response.choices[0].message.content.strip()
-
-                # Încearcă să parseze JSON
-                try:
-                    rezultat = json.loads(content)
-                    profesor_ales_nume = rezultat.get("profesor", "")
-                    justificare = rezultat.get("justificare", "")
-                    confidence = rezultat.get("confidence", 0.5)
-                except json.JSONDecodeError:
-                    # Fallback la text simplu
-                    profesor_ales_nume = content
-                    justificare = ""
-                    confidence = 0.5
-
-                for profesor in profesori_disponibili:
-                    if profesor.nume.lower() in profesor_ales_nume.lower():
-                        self.istoric_decizii.append(
-                            {
-                                "intrebare": intrebare,
-                                "profesor_ales": profesor.nume,
-                                "clasa": clasa_tinta,
-                                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                                "metoda": "director_ai",
-                                "justificare": justificare,
-                                "confidence": confidence,
-                            }
-                        )
-                        return profesor
-                logger.info("Directorul nu a returnat un nume clar, se foloseste fallback-ul logic.")
-                break  # success, nu mai reîncercăm
-
-            except openai.RateLimitError as exc:
-                if tentativa == 2:
-                    logger.error("Rate limit depășit după 3 încercări: %s", exc)
-                    break
-                time.sleep(2**tentativa)
-
-            except openai.APITimeoutError as exc:
-                if tentativa == 2:
-                    logger.error("Timeout după 3 încercări: %s", exc)
-                    break
-                time.sleep(1)
-
-            except Exception as exc:
-                logger.error("Eroare tentativa %d: %s", tentativa + 1, exc)
-                if tentativa == 2:
-                    break
-
-        fallback = self._alege_profesor_fallback(intrebare, profesori_disponibili, clasa_tinta)
+        fallback = self._alege_profesor_fallback(intrebare, profesori_disponibili, clasa_tinta, scoruri_fallback)
         return fallback or profesori_disponibili[0]
 
-    def creeaza_prompt_director(self, intrebare: str, clasa_tinta: int, profesori_disponibili: List) -> str:
-        profesori_text = ", ".join(f"{p.nume} ({p.materie})" for p in profesori_disponibili)
-        cunostinte = self.cunostinte_pedagogice[:2584] if self.cunostinte_pedagogice else ""
+    def _decide_lot_cu_fallback(
+        self, clasa_tinta: int, intrebari: List[str], termen_director=None
+    ) -> List[Tuple[Optional[Tuple[str, str, Any]], Optional[List[Dict[str, Any]]]]]:
+        """``(decizie, scoruri_fallback)`` per question: the LLM decision, or the keyword ranking when it gave none.
+
+        The questions left without a decision are scored together with
+        ``scoruri_fallback_lot``, so a failed batch call is not followed by
+        one keyword scan per waiting request.
+        """
+        decizii = self._decide_lot(clasa_tinta, intrebari, termen_director)
+        fara_decizie = [index for index, decizie in enumerate(decizii) if decizie is None]
+        scoruri: List[Optional[List[Dict[str, Any]]]] = [None] * len(intrebari)
+        if fara_decizie:
+            clasamente = self.scoruri_fallback_lot([intrebari[index] for index in fara_decizie], clasa_tinta)
+            for index, clasament in zip(fara_decizie, clasamente):
+                scoruri[index] = clasament
+        return list(zip(decizii, scoruri))
+
+    def _decide_lot(
+        self, clasa_tinta: int, intrebari: List[str], termen_director=None
+    ) -> List[Optional[Tuple[str, str, Any]]]:
+        """One director LLM call for ``intrebari``; ``(profesor, justificare, confidence)`` or None for each."""
+        profesori_disponibili = self._profesori_clasa(clasa_tinta)
+        prefix = self.creeaza_prefix_director()
+        if len(intrebari) == 1:
+            prompt = self.creeaza_prompt_director(intrebari[0], clasa_tinta, profesori_disponibili)
+        else:
+            prompt = self.creeaza_prompt_director_lot(intrebari, clasa_tinta, profesori_disponibili)
+
+        def apel(tentativa: int):
+            timeout = timeout_pentru(termen_director, 5 * (2**tentativa), etapa="director")  # 5s, 10s, 20s
+            if tentativa == 0:
+                self._contor_rutare["apeluri_llm"] += 1
+            return client.chat.completions.create(
+                model=self.configurari.model,
+                messages=[
+                    {"role": "system", "content": prefix},
+                    {"role": "user", "content": prompt},
+                ],
+                max_tokens=200 * len(intrebari),
+                temperature=self.configurari.temperature,
+                timeout=timeout,
+            )
+
+        # Reincercari cu backoff exponential si jitter, in limita termenului directorului
+        try:
+            response = planificator_reincercari.executa(apel, furnizor="director", termen=termen_director)
+            content = response.choices[0].message.content.strip()
+        except TermenDepasit as exc:
+            logger.warning("Directorul trece la fallback: %s", exc)
+            return [None] * len(intrebari)
+        except Exception as exc:
+            logger.error("Directorul nu a putut decide, se foloseste fallback-ul logic: %s", exc)
+            return [None] * len(intrebari)
+        if len(intrebari) == 1:
+            return [_interpreteaza_decizie(content)]
+        return _interpreteaza_decizii_lot(content, len(intrebari))
+
+    def creeaza_prefix_director(self) -> str:
+        """Static routing instructions, profile and knowledge, sent first so the provider can cache them."""
+        cunostinte = self.rezumat_pedagogic or self.cunostinte_pedagogice[:2584]
         profil_text = self.format_profil_pentru_prompt()
-        istoric_text = self._formateaza_istoric()
         return (
             "Esti Directorul scolii cu expertiza profunda in pedagogie si psihologia copilului.\n"
             "Foloseste ghidul tau profesional pentru a alege profesorul cel mai potrivit.\n\n"
             f"{profil_text}\n\n"
-            f"{istoric_text}\n\n"
             "Materiale studiate recent:\n"
-            f"{cunostinte}\n\n"
+            f"{cunostinte}"
+        )
+
+    def creeaza_prompt_director(self, intrebare: str, clasa_tinta: int, profesori_disponibili: List) -> str:
+        """Per-question part of the routing prompt, with its answer format; it follows ``creeaza_prefix_director``."""
+        profesori_text = ", ".join(f"{p.nume} ({p.materie})" for p in profesori_disponibili)
+        istoric_text = self._formateaza_istoric()
+        return (
+            f"{istoric_text}\n\n"
             f"Profesorii disponibili pentru clasa {clasa_tinta}:\n"
             f"{profesori_text}\n\n"
             "Intrebarea elevului:\n"
@@ -230,21 +628,32 @@ class Director:
             '{"profesor": "Nume Profesor", "justificare": "Motivul alegerii in 1 propozitie", "confidence": 0.0-1.0}'
         )
 
-    def _alege_profesor_fallback(self, intrebare: str, profesori: List[Any], clasa_tinta: int):
-        """Fallback cu confidence tracking pentru monitoring."""
+    def creeaza_prompt_director_lot(self, intrebari: List[str], clasa_tinta: int, profesori_disponibili: List) -> str:
+        """Per-batch part of the routing prompt: numbered questions and a JSON list answer."""
+        profesori_text = ", ".join(f"{p.nume} ({p.materie})" for p in profesori_disponibili)
+        istoric_text = self._formateaza_istoric()
+        intrebari_text = "\n".join(f'{index}. "{intrebare}"' for index, intrebare in enumerate(intrebari, 1))
+        return (
+            f"{istoric_text}\n\n"
+            f"Profesorii disponibili pentru clasa {clasa_tinta}:\n"
+            f"{profesori_text}\n\n"
+            f"Intrebarile elevilor ({len(intrebari)}, alege separat pentru fiecare):\n"
+            f"{intrebari_text}\n\n"
+            "Returneaza DOAR un JSON valid cu cate o decizie pentru fiecare intrebare:\n"
+            '{"decizii": [{"index": 1, "profesor": "Nume Profesor", "justificare": "...", "confidence": 0.0-1.0}]}'
+        )
+
+    def _scoruri_fallback(
+        self, intrebare: str, profesori: List[Any], clasa_tinta: int, alesi_recent: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Keyword scores of ``profesori`` for the question, best first."""
         if not profesori:
-            return None
+            return []
         intrebare_lower = intrebare.lower()
-        domenii = {
-            "matematica": ["matemat", "numar", "problem", "calcul", "arie", "fract", "geometr", "algebr"],
-            "romana": ["litera", "povest", "cuvant", "comunicare", "citit", "scris", "gramatic", "text", "compunere"],
-            "limba": ["litera", "povest", "cuvant", "comunicare", "citit", "scris", "gramatic", "text", "limba"],
-            "muzica": ["muzic", "sunet", "instrument", "cant", "ritm", "melodie"],
-            "stiinta": ["stiint", "experiment", "natura", "fizic", "chimic", "biolog"],
-            "arte": ["desen", "pictur", "culor", "creativ", "artistic"],
-            "sport": ["sport", "miscar", "exercit", "fizic", "joac"],
-            "educatie": ["civica", "moral", "comportament", "valori"],
-        }
+        cuvinte_gasite = _AUTOMAT_DOMENII.cuvinte_gasite(intrebare_lower)
+        if alesi_recent is None:
+            alesi_recent = {entry.get("profesor_ales") for entry in self.istoric_decizii[-5:]}
+        alesi_recent = set(alesi_recent)
         scoruri = []
         for profesor in profesori:
             scor = {
@@ -259,9 +668,9 @@ class Director:
                     scor["total"] += 8
                     scor["breakdown"]["materie_exacta"] = 8
                 # Potrivire semantică (5 puncte max)
-                for domeniu, cuvinte in domenii.items():
+                for domeniu in _DOMENII_FALLBACK:
                     if domeniu in materie_lower or any(part in materie_lower for part in domeniu.split("_")):
-                        matches = [c for c in cuvinte if c in intrebare_lower]
+                        matches = cuvinte_gasite.get(domeniu, ())
                         if matches:
                             puncte = min(5, len(matches) * 2)
                             scor["total"] += puncte
@@ -272,17 +681,90 @@ class Director:
                 scor["total"] += 3
                 scor["breakdown"]["clasa"] = 3
             # Materiale didactice (2 puncte)
-            if getattr(profesor, "cunostinte_din_materiale", ""):
+            if getattr(profesor, "are_materiale", False):
                 scor["total"] += 2
                 scor["breakdown"]["materiale"] = 2
             # Experiență recentă (1 punct)
-            if any(
-                entry.get("profesor_ales") == getattr(profesor, "nume", "") for entry in self.istoric_decizii[-5:]
-            ):
+            if getattr(profesor, "nume", "") in alesi_recent:
                 scor["total"] += 1
                 scor["breakdown"]["istoric"] = 1
             scoruri.append(scor)
         scoruri.sort(key=lambda x: x["total"], reverse=True)
+        return scoruri
+
+    def scoruri_fallback_lot(
+        self, intrebari: List[str], clasa_tinta: int, alesi_recent: Optional[Iterable[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Keyword scores for a batch of questions, as ``_scoruri_fallback`` would give them one by one.
+
+        Uses the NumPy scorer when numpy is installed; it backs the batch
+        routing fallback and ``evalueaza_rutare``. ``alesi_recent`` overrides
+        the recently chosen teachers that earn the history bonus.
+        """
+        profesori = self._profesori_clasa(clasa_tinta)
+        if alesi_recent is None:
+            alesi_recent = {entry.get("profesor_ales") for entry in self.istoric_decizii[-5:]}
+        if not numpy_disponibil():
+            return [
+                self._scoruri_fallback(intrebare, profesori, clasa_tinta, alesi_recent) for intrebare in intrebari
+            ]
+        return self._scorare_vectoriala(profesori, clasa_tinta).clasamente(intrebari, alesi_recent)
+
+    def _scorare_vectoriala(self, profesori: List[Any], clasa_tinta: int) -> ScorareVectoriala:
+        """NumPy scorer for the class, rebuilt only when its teacher set or their materials change."""
+        cheie = (
+            amprenta_profesori(profesori),
+            tuple(bool(getattr(profesor, "are_materiale", False)) for profesor in profesori),
+        )
+        salvat = self._scorari_lot.get(clasa_tinta)
+        if salvat is not None and salvat[0] == cheie and salvat[1].profesori == profesori:
+            return salvat[1]
+        scorare = ScorareVectoriala(profesori, clasa_tinta, _DOMENII_FALLBACK, _AUTOMAT_DOMENII)
+        self._scorari_lot[clasa_tinta] = (cheie, scorare)
+        return scorare
+
+    def evalueaza_rutare(self, limita: int = 1000) -> Dict[str, Any]:
+        """Replay logged LLM routing decisions and measure how often the cheaper routers agree.
+
+        The logged questions of each class are scored in one batch by the
+        keyword fallback (without the recent-teacher bonus, which depends on
+        the order of live requests) and predicted by the local router. The
+        router is trained on these same decisions, so its figure is an upper
+        bound rather than a held-out accuracy.
+        """
+        depozit = get_depozit_istoric()
+        decizii = depozit.cauta_decizii(proprietar=self.cheie_istoric, limita=limita)
+        if not decizii:
+            decizii = depozit.decizii_recente(self.cheie_istoric)
+        pe_clase: Dict[Any, List[Dict[str, Any]]] = {}
+        for decizie in decizii:
+            if decizie.get("metoda") in _METODE_ANTRENARE and decizie.get("profesor_ales"):
+                pe_clase.setdefault(decizie.get("clasa"), []).append(decizie)
+
+        total = 0
+        acorduri = {"fallback": 0, "router_local": 0}
+        for clasa, grup in pe_clase.items():
+            intrebari = [decizie.get("intrebare", "") for decizie in grup]
+            clasamente = self.scoruri_fallback_lot(intrebari, clasa, alesi_recent=())
+            candidati = [profesor.nume for profesor in self._profesori_clasa(clasa)]
+            for decizie, intrebare, clasament in zip(grup, intrebari, clasamente):
+                total += 1
+                if clasament and clasament[0]["profesor"].nume == decizie["profesor_ales"]:
+                    acorduri["fallback"] += 1
+                prezis, _ = self.router_local.prezice(intrebare, candidati)
+                if prezis == decizie["profesor_ales"]:
+                    acorduri["router_local"] += 1
+        rezultat: Dict[str, Any] = {"decizii": total}
+        for metoda, numar in acorduri.items():
+            rezultat[f"acord_{metoda}"] = round(numar / total * 100, 2) if total else 0
+        return rezultat
+
+    def _alege_profesor_fallback(
+        self, intrebare: str, profesori: List[Any], clasa_tinta: int, scoruri: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Fallback cu confidence tracking pentru monitoring."""
+        if scoruri is None:
+            scoruri = self._scoruri_fallback(intrebare, profesori, clasa_tinta)
         if scoruri:
             best = scoruri[0]
             # Log confidence pentru monitoring
@@ -295,7 +777,7 @@ class Director:
                 best["breakdown"],
             )
             # Salvează în istoric decizie
-            self.istoric_decizii.append(
+            self.inregistreaza_decizie(
                 {
                     "intrebare": intrebare,
                     "profesor_ales": best["profesor"].nume,
@@ -310,32 +792,46 @@ class Director:
         return None
 
     def get_metrici_performanta(self) -> Dict[str, Any]:
-        """Metrici pentru monitoring calitate decizii."""
-        if not self.istoric_decizii:
+        """Metrici pentru monitoring calitate decizii (pe fereastra deciziilor recente).
+
+        Read from the running aggregates kept by the history store, so a
+        monitoring poll costs the same whatever the history size.
+        """
+        agregat = get_depozit_istoric().metrici_decizii(self.cheie_istoric)
+        total = agregat["total"]
+        if not total:
             return {}
-        total = len(self.istoric_decizii)
-        ai_decizii = [d for d in self.istoric_decizii if d.get("metoda") == "director_ai"]
-        fallback_decizii = [d for d in self.istoric_decizii if d.get("metoda") == "fallback"]
-        avg_confidence_ai = (
-            sum(d.get("confidence", 0) for d in ai_decizii) / len(ai_decizii) if ai_decizii else 0
-        )
-        avg_scor_fallback = (
-            sum(d.get("scor", 0) for d in fallback_decizii) / len(fallback_decizii) if fallback_decizii else 0
-        )
+        per_metoda = agregat["per_metoda"]
+        ai_decizii = per_metoda.get("director_ai", 0)
+        fallback_decizii = per_metoda.get("fallback", 0)
+        contor = self._contor_rutare
+        rutari = contor["cache_hit"] + contor["router_local"] + contor["apeluri_llm"]
+        cautari_cache = contor["cache_hit"] + contor["cache_miss"]
+        avg_confidence_ai = agregat["suma_confidence_ai"] / ai_decizii if ai_decizii else 0
+        avg_scor_fallback = agregat["suma_scor_fallback"] / fallback_decizii if fallback_decizii else 0
         return {
             "total_decizii": total,
-            "ai_decizii": len(ai_decizii),
-            "fallback_decizii": len(fallback_decizii),
-            "rata_succes_ai": round(len(ai_decizii) / total * 100, 2) if total > 0 else 0,
+            "ai_decizii": ai_decizii,
+            "fallback_decizii": fallback_decizii,
+            "router_local_decizii": per_metoda.get("router_local", 0),
+            "apeluri_llm": contor["apeluri_llm"],
+            "rata_apeluri_llm": round(contor["apeluri_llm"] / rutari * 100, 2) if rutari else 0,
+            "cache_hit": contor["cache_hit"],
+            "cache_miss": contor["cache_miss"],
+            "rata_cache_hit": round(contor["cache_hit"] / cautari_cache * 100, 2) if cautari_cache else 0,
+            "rutare_lot": self._lot_rutare.statistici(),
+            "rata_succes_ai": round(ai_decizii / total * 100, 2) if total > 0 else 0,
             "avg_confidence_ai": round(avg_confidence_ai, 2),
             "avg_scor_fallback": round(avg_scor_fallback, 2),
-            "profesori_populari": self._get_profesori_populari(),
+            "profesori_populari": agregat["profesori_populari"],
         }
 
-    def _get_profesori_populari(self) -> List[Dict[str, Any]]:
+    def _get_profesori_populari(self, istoric: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
         """Top 3 profesori cei mai aleși."""
+        if istoric is None:
+            return get_depozit_istoric().metrici_decizii(self.cheie_istoric)["profesori_populari"]
         counter = {}
-        for d in self.istoric_decizii[-50:]:  # ultimele 50
+        for d in istoric[-50:]:  # ultimele 50
             prof = d.get("profesor_ales")
             if prof:
                 counter[prof] = counter.get(prof, 0) + 1
@@ -1,15 +1,32 @@
-﻿import logging
+﻿import hashlib
+import json
+import logging
 import os
 import re
+import tempfile
+import threading
 import time
 import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import PyPDF2
 
+from .depozit_text import DepozitTextMapat
+from .normalizare_text import VERSIUNE_NORMALIZARE, normalizeaza_pagini
+from .potrivire_cuvinte import AutomatCuvinteCheie
+from .rezumate import DepozitRezumate
+
 logger = logging.getLogger(__name__)
 
+_MANIFEST_FILENAME = "manifest_materiale.json"
+_DIRECTOR_FOLDER = "director_pedagogie"
+_TEXT_CACHE_FOLDER = ".cache_text"
+_REZUMATE_FOLDER = ".rezumate"
+_HASH_CHUNK_SIZE = 1024 * 1024
+
 _ROMANIAN_REPLACEMENTS = {
     "ă": "a",
     "â": "a",
@@ -28,6 +45,195 @@ _ROMANIAN_REPLACEMENTS = {
 }
 
 
+# Structura pentru școli
+_STRUCTURA_SCOLI: Dict[str, Dict[int, List[str]]] = {
+    "Scoala_Normala": {
+        0: [  # Pregătitoare
+            "Comunicare_in_Limba_Romana",
+            "Matematica_si_Explorarea_mediului",
+            "Limba_moderna_Engleza",
+            "Muzica_si_Miscare",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Dezvoltare_personala",
+            "Religie",
+        ],
+        1: [  # Clasa I
+            "Comunicare_in_Limba_Romana",
+            "Matematica_si_Explorarea_mediului",
+            "Limba_moderna_Engleza",
+            "Muzica_si_Miscare",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Dezvoltare_personala",
+            "Religie",
+        ],
+        2: [  # Clasa a II-a
+            "Comunicare_in_Limba_Romana",
+            "Matematica_si_Explorarea_mediului",
+            "Limba_moderna",
+            "Muzica_si_Miscare",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Dezvoltare_personala",
+            "Religie",
+        ],
+        3: [  # Clasa a III-a
+            "Limba_si_Literatura_Romana",
+            "Matematica",
+            "Limba_moderna",
+            "Stiinte_ale_naturii",
+            "Muzica_si_Miscare",
+            "Arte_vizuale",
+            "Educatie_civica",
+            "Educatie_fizica",
+            "Joc_si_Miscare",
+            "Religie",
+        ],
+        4: [  # Clasa a IV-a
+            "Limba_si_Literatura_Romana",
+            "Matematica",
+            "Limba_moderna",
+            "Stiinte_ale_naturii",
+            "Istorie",
+            "Geografie",
+            "Muzica_si_Miscare",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Joc_si_Miscare",
+            "Religie",
+        ]
+    },
+    "Scoala_de_Muzica_George_Enescu": {
+        0: [  # Pregătitoare
+            "Comunicare_in_Limba_Romana",
+            "Matematica_si_Explorarea_mediului",
+            "Limba_moderna_Engleza",
+            "Muzica_si_Miscare",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Dezvoltare_personala",
+            "Religie",
+        ],
+        1: [  # Clasa I
+            "Comunicare_in_Limba_Romana",
+            "Matematica_si_Explorarea_mediului",
+            "Limba_moderna_Engleza",
+            "Muzica_si_Miscare",
+            "Teorie_Solfegiu_Dicteu",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Dezvoltare_personala",
+            "Religie",
+        ],
+        2: [  # Clasa a II-a
+            "Comunicare_in_Limba_Romana",
+            "Matematica_si_Explorarea_mediului",
+            "Limba_moderna_Engleza",
+            "Muzica_si_Miscare",
+            "Teorie_Solfegiu_Dicteu",
+            "Arte_vizuale",
+            "Educatie_fizica",
+            "Dezvoltare_personala",
+            "Religie",
+        ],
+        3: [  # Clasa a III-a
+            "Limba_si_Literatura_Romana",
+            "Matematica",
+            "Limba_moderna_Engleza",
+            "Stiinte_ale_naturii",
+            "Muzica_si_Miscare",
+            "Teorie_Solfegiu_Dicteu",
+            "Arte_vizuale",
+            "Educatie_civica",
+            "Educatie_fizica",
+            "Joc_si_Miscare",
+            "Religie",
+        ],
+        4: [  # Clasa a IV-a
+            "Limba_si_Literatura_Romana",
+            "Matematica",
+            "Limba_moderna_Engleza",
+            "Stiinte_ale_naturii",
+            "Istorie",
+            "Geografie",
+            "Muzica_si_Miscare",
+            "Teorie_Solfegiu_Dicteu",
+            "Arte_vizuale",
+            "Educatie_civica",
+            "Educatie_fizica",
+            "Joc_si_Miscare",
+            "Religie",
+        ]
+    }
+}
+
+# Maparea profesori pentru fiecare materie (nume standardizat pentru foldere)
+_MAPARE_PROFESORI: Dict[str, str] = {
+    "Comunicare_in_Limba_Romana": "Prof_Ion_Creanga",
+    "Matematica_si_Explorarea_mediului": "Prof_Pitagora",
+    "Limba_moderna_Engleza": "Prof_William_Shakespeare",
+    "Muzica_si_Miscare": "Prof_Antonio_Vivaldi",
+    "Arte_vizuale": "Prof_Leonardo_da_Vinci",
+    "Educatie_fizica": "Prof_Nadia_Comaneci",
+    "Dezvoltare_personala": "Prof_Carl_Jung",
+    "Religie": "Prof_Arsenie_Boca",
+    "Teorie_Solfegiu_Dicteu": "Prof_Ennio_Morricone",
+    "Limba_moderna": "Prof_Charles_Dickens",
+    "Limba_si_Literatura_Romana": "Prof_Mihai_Eminescu",
+    "Matematica": "Prof_Euclid",
+    "Stiinte_ale_naturii": "Prof_Albert_Einstein",
+    "Educatie_civica": "Prof_Malala_Yousafzai",
+    "Joc_si_Miscare": "Prof_Bruce_Lee",
+    "Istorie": "Prof_Herodot",
+    "Geografie": "Prof_Jacques_Yves_Cousteau",
+}
+
+_CATEGORII_PEDAGOGICE: Dict[str, List[str]] = {
+    "psihologie": [
+        "inteligenta emotionala",
+        "dezvoltare cognitiva",
+        "comportament pozitiv",
+        "empatie",
+        "gestionarea emotiilor",
+        "inteligenta sociala",
+    ],
+    "pedagogie": [
+        "invatare accelerata",
+        "metode interactive",
+        "predare inovativa",
+        "motivatia elevului",
+        "gandire critica",
+    ],
+    "management": [
+        "leadership educational",
+        "organizare eficienta",
+        "managementul clasei",
+        "strategii pedagogice",
+        "dezvoltare profesionala",
+    ],
+    "comunicare": [
+        "relatie profesor-elev",
+        "comunicare empatica",
+        "dialog eficient",
+        "colaborare familie-scoala",
+        "solutionarea conflictelor",
+    ],
+}
+
+_AUTOMAT_CATEGORII = AutomatCuvinteCheie(_CATEGORII_PEDAGOGICE)
+
+_STRUCTURA_VERSIUNE = 1
+_STRUCTURA_STAMP_PREFIX = ".structura_"
+
+
+@lru_cache(maxsize=1)
+def _semnatura_structura() -> str:
+    continut = json.dumps([_STRUCTURA_SCOLI, _MAPARE_PROFESORI], sort_keys=True)
+    return hashlib.sha256(continut.encode("utf-8")).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1024)
 def slugify_text(txt: str) -> str:
     """Create a filesystem friendly slug from the provided text."""
     if not txt:
@@ -41,173 +247,113 @@ def slugify_text(txt: str) -> str:
     return text.strip("_")
 
 
+@lru_cache(maxsize=1024)
+def _foldere_profesor(scoala: str, clasa: int, materie: str, profesor: str) -> Tuple[str, ...]:
+    baza = f"{slugify_text(scoala)}/clasa_{clasa}/{slugify_text(materie)}"
+    return tuple(dict.fromkeys((f"{baza}/{profesor}", f"{baza}/{slugify_text(profesor)}")))
+
+
+def calculeaza_hash_fisier(cale: Path) -> str:
+    """Return the SHA-256 digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(cale, "rb") as handler:
+        for chunk in iter(lambda: handler.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class DiferentaMateriale:
+    """Result of a manifest scan: material paths (relative, POSIX) that changed on disk."""
+
+    adaugate: List[str] = field(default_factory=list)
+    modificate: List[str] = field(default_factory=list)
+    sterse: List[str] = field(default_factory=list)
+
+    @property
+    def goala(self) -> bool:
+        return not (self.adaugate or self.modificate or self.sterse)
+
+    def toate(self) -> List[str]:
+        return self.adaugate + self.modificate + self.sterse
+
+    def afecteaza(self, foldere: Iterable[str]) -> bool:
+        """True if any changed file lives directly inside one of the given relative folders."""
+        foldere_set = set(foldere)
+        return any(cale.rpartition("/")[0] in foldere_set for cale in self.toate())
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {"adaugate": self.adaugate, "modificate": self.modificate, "sterse": self.sterse}
+
+
 class GestorMateriale:
     """Manage the on-disk teaching material hierarchy and cached PDF excerpts."""
 
     def __init__(self, cale_baza: str = "materiale_didactice") -> None:
         self.cale_baza = Path(cale_baza)
-        self.cale_baza.mkdir(exist_ok=True)
         self.materiale_incarcate: Dict[str, Path] = {}
-        self.cache_pdf: Dict[str, str] = {}
-        self.creeaza_structura_completa()
+        # Text extras per continut (sha256), partajat de toate copiile si de toti workerii
+        self.depozit_text = DepozitTextMapat(self.cale_baza / _TEXT_CACHE_FOLDER)
+        self.depozit_rezumate = DepozitRezumate(self.cale_baza / _REZUMATE_FOLDER)
+        self.cale_manifest = self.cale_baza / _MANIFEST_FILENAME
+        self.manifest: Dict[str, Dict[str, Any]] = self._incarca_manifest()
+        # Folder relativ (scoala/clasa/materie/profesor sau director_pedagogie) -> fisiere PDF
+        self.index_materiale: Dict[str, List[Path]] = {}
+        for cheie in self.manifest:
+            self._indexeaza(cheie)
+        self._lock_manifest = threading.RLock()
+        self._oprire_scanare = threading.Event()
+        self._fir_scanare: Optional[threading.Thread] = None
+        if not self.structura_este_actuala():
+            self.creeaza_structura_completa()
+        self._scanare_initiala()
+
+    def _scanare_initiala(self) -> None:
+        """Reconcile the loaded manifest with the disk before anything reads it.
+
+        On a warm start this costs one ``stat`` per PDF; only files added,
+        changed or removed while the service was down are hashed or dropped,
+        so content-hash keys and ``amprenta_materiale`` match the disk.
+        """
+        cald = bool(self.manifest)
+        diferenta = self.scaneaza_materiale()
+        if cald and not diferenta.goala:
+            logger.warning("Materiale schimbate cat serviciul a fost oprit: %s", diferenta.to_dict())
+        if not self.cale_manifest.exists():
+            # Manifest gol scris explicit, ca urmatoarea pornire sa nu mai caute un manifest lipsa
+            self._salveaza_manifest()
+
+    @property
+    def cale_stamp_structura(self) -> Path:
+        """Stamp file whose name encodes the layout version, so checking it costs a single stat."""
+        return self.cale_baza / f"{_STRUCTURA_STAMP_PREFIX}v{_STRUCTURA_VERSIUNE}_{_semnatura_structura()}"
+
+    def structura_este_actuala(self) -> bool:
+        return self.cale_stamp_structura.exists()
+
+    def _scrie_stamp_structura(self) -> None:
+        for stamp_vechi in self.cale_baza.glob(f"{_STRUCTURA_STAMP_PREFIX}*"):
+            stamp_vechi.unlink(missing_ok=True)
+        self.cale_stamp_structura.write_text(
+            f"Structura materiale v{_STRUCTURA_VERSIUNE} creata la {time.strftime('%Y-%m-%d %H:%M:%S')}\n",
+            encoding="utf-8",
+        )
 
     def creeaza_structura_completa(self) -> None:
         """Build the full folder structure for both schools and all subjects."""
         logger.info("Starting full material directory initialisation...")
+        self.cale_baza.mkdir(parents=True, exist_ok=True)
 
         # Folderul pentru director
-        cale_director = self.cale_baza / "director_pedagogie"
+        cale_director = self.cale_baza / _DIRECTOR_FOLDER
         cale_director.mkdir(exist_ok=True)
 
-        # Structura pentru școli
-        scoli_config: Dict[str, Dict[int, List[str]]] = {
-            "Scoala_Normala": {
-                0: [  # Pregătitoare
-                    "Comunicare_in_Limba_Romana",
-                    "Matematica_si_Explorarea_mediului",
-                    "Limba_moderna_Engleza",
-                    "Muzica_si_Miscare",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Dezvoltare_personala",
-                    "Religie",
-                ],
-                1: [  # Clasa I
-                    "Comunicare_in_Limba_Romana",
-                    "Matematica_si_Explorarea_mediului",
-                    "Limba_moderna_Engleza",
-                    "Muzica_si_Miscare",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Dezvoltare_personala",
-                    "Religie",
-                ],
-                2: [  # Clasa a II-a
-                    "Comunicare_in_Limba_Romana",
-                    "Matematica_si_Explorarea_mediului",
-                    "Limba_moderna",
-                    "Muzica_si_Miscare",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Dezvoltare_personala",
-                    "Religie",
-                ],
-                3: [  # Clasa a III-a
-                    "Limba_si_Literatura_Romana",
-                    "Matematica",
-                    "Limba_moderna",
-                    "Stiinte_ale_naturii",
-                    "Muzica_si_Miscare",
-                    "Arte_vizuale",
-                    "Educatie_civica",
-                    "Educatie_fizica",
-                    "Joc_si_Miscare",
-                    "Religie",
-                ],
-                4: [  # Clasa a IV-a
-                    "Limba_si_Literatura_Romana",
-                    "Matematica",
-                    "Limba_moderna",
-                    "Stiinte_ale_naturii",
-                    "Istorie",
-                    "Geografie",
-                    "Muzica_si_Miscare",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Joc_si_Miscare",
-                    "Religie",
-                ]
-            },
-            "Scoala_de_Muzica_George_Enescu": {
-                0: [  # Pregătitoare
-                    "Comunicare_in_Limba_Romana",
-                    "Matematica_si_Explorarea_mediului",
-                    "Limba_moderna_Engleza",
-                    "Muzica_si_Miscare",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Dezvoltare_personala",
-                    "Religie",
-                ],
-                1: [  # Clasa I
-                    "Comunicare_in_Limba_Romana",
-                    "Matematica_si_Explorarea_mediului",
-                    "Limba_moderna_Engleza",
-                    "Muzica_si_Miscare",
-                    "Teorie_Solfegiu_Dicteu",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Dezvoltare_personala",
-                    "Religie",
-                ],
-                2: [  # Clasa a II-a
-                    "Comunicare_in_Limba_Romana",
-                    "Matematica_si_Explorarea_mediului",
-                    "Limba_moderna_Engleza",
-                    "Muzica_si_Miscare",
-                    "Teorie_Solfegiu_Dicteu",
-                    "Arte_vizuale",
-                    "Educatie_fizica",
-                    "Dezvoltare_personala",
-                    "Religie",
-                ],
-                3: [  # Clasa a III-a
-                    "Limba_si_Literatura_Romana",
-                    "Matematica",
-                    "Limba_moderna_Engleza",
-                    "Stiinte_ale_naturii",
-                    "Muzica_si_Miscare",
-                    "Teorie_Solfegiu_Dicteu",
-                    "Arte_vizuale",
-                    "Educatie_civica",
-                    "Educatie_fizica",
-                    "Joc_si_Miscare",
-                    "Religie",
-                ],
-                4: [  # Clasa a IV-a
-                    "Limba_si_Literatura_Romana",
-                    "Matematica",
-                    "Limba_moderna_Engleza",
-                    "Stiinte_ale_naturii",
-                    "Istorie",
-                    "Geografie",
-                    "Muzica_si_Miscare",
-                    "Teorie_Solfegiu_Dicteu",
-                    "Arte_vizuale",
-                    "Educatie_civica",
-                    "Educatie_fizica",
-                    "Joc_si_Miscare",
-                    "Religie",
-                ]
-            }
-        }
-        
-        # Maparea profesori pentru fiecare materie (nume standardizat pentru foldere)
-        mapare_profesori = {
-            "Comunicare_in_Limba_Romana": "Prof_Ion_Creanga",
-            "Matematica_si_Explorarea_mediului": "Prof_Pitagora",
-            "Limba_moderna_Engleza": "Prof_William_Shakespeare",
-            "Muzica_si_Miscare": "Prof_Antonio_Vivaldi",
-            "Arte_vizuale": "Prof_Leonardo_da_Vinci",
-            "Educatie_fizica": "Prof_Nadia_Comaneci",
-            "Dezvoltare_personala": "Prof_Carl_Jung",
-            "Religie": "Prof_Arsenie_Boca",
-            "Teorie_Solfegiu_Dicteu": "Prof_Ennio_Morricone",
-            "Limba_moderna": "Prof_Charles_Dickens",
-            "Limba_si_Literatura_Romana": "Prof_Mihai_Eminescu",
-            "Matematica": "Prof_Euclid",
-            "Stiinte_ale_naturii": "Prof_Albert_Einstein",
-            "Educatie_civica": "Prof_Malala_Yousafzai",
-            "Joc_si_Miscare": "Prof_Bruce_Lee",
-            "Istorie": "Prof_Herodot",
-            "Geografie": "Prof_Jacques_Yves_Cousteau"            
-        }
 
         # Creăm folderele pentru fiecare școală, clasă, materie și profesor
-        for nume_scoala, clase in scoli_config.items():
+        for nume_scoala, clase in _STRUCTURA_SCOLI.items():
             for numar_clasa, materii in clase.items():
                 for materie in materii:
-                    profesor_folder = mapare_profesori.get(materie, "Prof_Necunoscut")
+                    profesor_folder = _MAPARE_PROFESORI.get(materie, "Prof_Necunoscut")
                     cale_profesor = (
                         self.cale_baza
                         / slugify_text(nume_scoala)
@@ -225,8 +371,8 @@ class GestorMateriale:
         if not readme_director.exists():
             self._scrie_readme_director(readme_director)
 
+        self._scrie_stamp_structura()
         logger.info("Structure created at: %s", self.cale_baza)
-        self.afiseaza_structura_creata()
 
     def _scrie_readme_profesor(self, readme_path: Path, scoala: str, clasa: int, materie: str, profesor: str) -> None:
         template = f"""
@@ -291,77 +437,242 @@ TIPURI DE MATERIALE RECOMANDATE:
         print(f"\nTotal directories created: {foldere_create}")
 
     def gaseste_materiale_profesor(self, scoala: str, clasa: int, materie: str, profesor: str) -> List[Path]:
-        scoala_slug = slugify_text(scoala)
-        materie_slug = slugify_text(materie)
-        paths_to_check = [profesor, slugify_text(profesor)]
         results: List[Path] = []
-        for nume in paths_to_check:
-            cale_profesor = self.cale_baza / scoala_slug / f"clasa_{clasa}" / materie_slug / nume
-            if cale_profesor.exists():
-                results = list(cale_profesor.glob("*.pdf"))
-                if results:
-                    break
+        for folder in self.foldere_profesor(scoala, clasa, materie, profesor):
+            results = self.index_materiale.get(folder, [])
+            if results:
+                break
         if not results:
             logger.warning("No PDF materials found for %s - %s (class %s)", profesor, materie, clasa)
-        return results
+        return list(results)
 
     def gaseste_materiale_director(self) -> List[Path]:
-        cale_director = self.cale_baza / "director_pedagogie"
-        if not cale_director.exists():
-            return []
-        return list(cale_director.glob("*.pdf"))
+        return list(self.index_materiale.get(_DIRECTOR_FOLDER, []))
+
+    def are_materiale(self, scoala: str, clasa: int, materie: str, profesor: str) -> bool:
+        return any(self.index_materiale.get(folder) for folder in self.foldere_profesor(scoala, clasa, materie, profesor))
+
+    def foldere_profesor(self, scoala: str, clasa: int, materie: str, profesor: str) -> Tuple[str, ...]:
+        """Relative folders that ``gaseste_materiale_profesor`` may read for this teacher."""
+        return _foldere_profesor(scoala, clasa, materie, profesor)
+
+    def _indexeaza(self, cheie: str) -> None:
+        folder, _, _ = cheie.rpartition("/")
+        fisiere = self.index_materiale.setdefault(folder, [])
+        cale = self.cale_baza / cheie
+        if cale not in fisiere:
+            fisiere.append(cale)
+            fisiere.sort()
+
+    def _deindexeaza(self, cheie: str) -> None:
+        folder, _, _ = cheie.rpartition("/")
+        fisiere = self.index_materiale.get(folder)
+        if not fisiere:
+            return
+        cale = self.cale_baza / cheie
+        if cale in fisiere:
+            fisiere.remove(cale)
+        if not fisiere:
+            del self.index_materiale[folder]
+
+    def _incarca_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not self.cale_manifest.exists():
+            return {}
+        try:
+            data = json.loads(self.cale_manifest.read_text(encoding="utf-8"))
+            return data.get("fisiere", {}) if isinstance(data, dict) else {}
+        except Exception as exc:
+            logger.warning("Manifestul materialelor nu a putut fi citit: %s", exc)
+            return {}
 
-    def incarca_pdf_cu_cache(self, cale_pdf: Path) -> Optional[str]:
-        key = str(cale_pdf)
-        if key in self.cache_pdf:
-            return self.cache_pdf[key]
+    def _salveaza_manifest(self) -> None:
+        payload = {"generat": time.strftime("%Y-%m-%d %H:%M:%S"), "fisiere": self.manifest}
+        tmp_path = None
+        try:
+            # Nume temporar unic: mai multi workeri gunicorn pot salva manifestul in acelasi timp
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.cale_manifest.parent,
+                prefix=self.cale_manifest.name + ".", suffix=".tmp", delete=False,
+            ) as tmp:
+                tmp_path = tmp.name
+                json.dump(payload, tmp, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cale_manifest)
+        except Exception as exc:
+            logger.warning("Manifestul materialelor nu a putut fi salvat: %s", exc)
+            if tmp_path is not None:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def scaneaza_materiale(self) -> DiferentaMateriale:
+        """Compare the PDFs on disk with the manifest and return what was added, changed or removed.
+
+        Files whose size and mtime are unchanged are not re-hashed, so a scan of an
+        unchanged tree costs one ``stat`` per file. Cached text for changed or removed
+        files is dropped so the next read re-extracts it.
+        """
+        with self._lock_manifest:
+            diferenta = DiferentaMateriale()
+            vazute = set()
+            manifest_modificat = False
+            for root, _, files in os.walk(self.cale_baza):
+                for nume_fisier in files:
+                    if not nume_fisier.lower().endswith(".pdf"):
+                        continue
+                    cale = Path(root) / nume_fisier
+                    cheie = cale.relative_to(self.cale_baza).as_posix()
+                    vazute.add(cheie)
+                    self._indexeaza(cheie)
+                    try:
+                        info = cale.stat()
+                    except OSError as exc:
+                        logger.warning("Nu s-a putut citi %s: %s", cale, exc)
+                        continue
+                    anterior = self.manifest.get(cheie)
+                    if anterior and anterior["size"] == info.st_size and anterior["mtime"] == info.st_mtime:
+                        continue
+                    try:
+                        sha = calculeaza_hash_fisier(cale)
+                    except OSError as exc:
+                        logger.warning("Nu s-a putut calcula hash-ul pentru %s: %s", cale, exc)
+                        continue
+                    self.manifest[cheie] = {"size": info.st_size, "mtime": info.st_mtime, "hash": sha}
+                    manifest_modificat = True
+                    if anterior is None:
+                        diferenta.adaugate.append(cheie)
+                    elif anterior.get("hash") != sha:
+                        diferenta.modificate.append(cheie)
+            for cheie in set(self.manifest) - vazute:
+                del self.manifest[cheie]
+                self._deindexeaza(cheie)
+                diferenta.sterse.append(cheie)
+                manifest_modificat = True
+            if manifest_modificat:
+                self._salveaza_manifest()
+        if not diferenta.goala:
+            logger.info(
+                "Materiale modificate: %d adaugate, %d modificate, %d sterse",
+                len(diferenta.adaugate),
+                len(diferenta.modificate),
+                len(diferenta.sterse),
+            )
+        return diferenta
+
+    def porneste_scanare_periodica(
+        self, interval_secunde: float, callback: Callable[[DiferentaMateriale], None]
+    ) -> None:
+        """Scan the manifest every ``interval_secunde`` on a daemon thread and report non-empty diffs."""
+        if self._fir_scanare and self._fir_scanare.is_alive():
+            return
+        self._oprire_scanare.clear()
+
+        def _ruleaza() -> None:
+            while not self._oprire_scanare.wait(interval_secunde):
+                try:
+                    diferenta = self.scaneaza_materiale()
+                    if not diferenta.goala:
+                        callback(diferenta)
+                except Exception as exc:
+                    logger.error("Scanarea periodica a materialelor a esuat: %s", exc, exc_info=True)
+
+        self._fir_scanare = threading.Thread(target=_ruleaza, name="scanare-materiale", daemon=True)
+        self._fir_scanare.start()
+
+    def opreste_scanare_periodica(self) -> None:
+        self._oprire_scanare.set()
+
+    def hash_material(self, cale_pdf: Path) -> str:
+        """Content hash for a material, taken from the manifest when the file is tracked."""
+        try:
+            cheie = Path(cale_pdf).relative_to(self.cale_baza).as_posix()
+        except ValueError:
+            cheie = None
+        intrare = self.manifest.get(cheie) if cheie else None
+        if intrare:
+            return intrare["hash"]
+        return calculeaza_hash_fisier(Path(cale_pdf))
+
+    def statistici_deduplicare(self) -> Dict[str, int]:
+        hashuri = {intrare["hash"] for intrare in self.manifest.values()}
+        return {
+            "fisiere": len(self.manifest),
+            "documente_unice": len(hashuri),
+            "texte_extrase": sum(1 for sha in hashuri if self.depozit_text.contine(sha)),
+        }
+
+    def amprenta_materiale(self) -> str:
+        """Fingerprint of every material path and content hash plus the layout and normalisation versions.
+
+        Anything derived from the materials (snapshots, profiles) is stale when it changes.
+        """
+        with self._lock_manifest:
+            fisiere = sorted((cheie, intrare["hash"]) for cheie, intrare in self.manifest.items())
+        continut = json.dumps([_semnatura_structura(), VERSIUNE_NORMALIZARE, fisiere])
+        return hashlib.sha256(continut.encode("utf-8")).hexdigest()
+
+    def compacteaza_texte(self) -> int:
+        """Drop stored texts no longer referenced by the manifest."""
+        return self.depozit_text.compacteaza(intrare["hash"] for intrare in self.manifest.values())
+
+    def asigura_text_extras(self, cale_pdf: Path) -> Optional[str]:
+        """Extract the PDF into the shared text store if needed and return its content hash."""
+        try:
+            key = self.hash_material(cale_pdf)
+        except OSError as exc:
+            logger.error("Failed to read PDF %s: %s", cale_pdf, exc)
+            return None
+        existent = self.depozit_text.contine(key)
+        if existent and self.depozit_text.meta(key).get("normalizare") == VERSIUNE_NORMALIZARE:
+            return key
         try:
             with open(cale_pdf, "rb") as handler:
                 reader = PyPDF2.PdfReader(handler)
-                content = "".join(page.extract_text() or "" for page in reader.pages)
-                self.cache_pdf[key] = content
-                return content
+                pagini = [page.extract_text() or "" for page in reader.pages]
         except Exception as exc:
             logger.error("Failed to read PDF %s: %s", cale_pdf, exc)
             return None
+        content, statistici = normalizeaza_pagini(pagini)
+        logger.info(
+            "PDF %s normalizat: %d -> %d tokeni estimati (%d economisiti)",
+            Path(cale_pdf).name,
+            statistici["tokeni_initiali"],
+            statistici["tokeni_finali"],
+            statistici["tokeni_economisiti"],
+        )
+        meta = {"normalizare": VERSIUNE_NORMALIZARE, **statistici}
+        self.depozit_text.adauga(key, content, meta=meta, inlocuieste=existent)
+        return key
+
+    def raport_normalizare(self) -> Dict[str, Dict[str, Any]]:
+        """Token savings from normalisation for every tracked material that has been extracted."""
+        raport: Dict[str, Dict[str, Any]] = {}
+        for cheie, intrare in self.manifest.items():
+            meta = self.depozit_text.meta(intrare["hash"])
+            if meta:
+                raport[cheie] = {
+                    "tokeni_initiali": meta.get("tokeni_initiali", 0),
+                    "tokeni_finali": meta.get("tokeni_finali", 0),
+                    "tokeni_economisiti": meta.get("tokeni_economisiti", 0),
+                }
+        return raport
+
+    def citeste_fragment(self, sha: str, limita_caractere: Optional[int] = None) -> str:
+        """Read (a prefix of) an extracted text from the shared store, decoding only that slice."""
+        return self.depozit_text.citeste(sha, limita_caractere) or ""
+
+    def incarca_pdf_cu_cache(self, cale_pdf: Path) -> Optional[str]:
+        key = self.asigura_text_extras(cale_pdf)
+        if key is None:
+            return None
+        return self.depozit_text.citeste(key)
 
     def analizeaza_continut_pdf(self, text_pdf: str, nume_fisier: str) -> List[str]:
-        categorii = {
-            "psihologie": [
-                "inteligenta emotionala",
-                "dezvoltare cognitiva",
-                "comportament pozitiv",
-                "empatie",
-                "gestionarea emotiilor",
-                "inteligenta sociala",
-            ],
-            "pedagogie": [
-                "invatare accelerata",
-                "metode interactive",
-                "predare inovativa",
-                "motivatia elevului",
-                "gandire critica",
-            ],
-            "management": [
-                "leadership educational",
-                "organizare eficienta",
-                "managementul clasei",
-                "strategii pedagogice",
-                "dezvoltare profesionala",
-            ],
-            "comunicare": [
-                "relatie profesor-elev",
-                "comunicare empatica",
-                "dialog eficient",
-                "colaborare familie-scoala",
-                "solutionarea conflictelor",
-            ],
-        }
-        text_lower = text_pdf.lower()
-        categorii_gasite = [cat for cat, cuvinte in categorii.items() if any(cuvant in text_lower for cuvant in cuvinte)]
+        categorii_gasite = _AUTOMAT_CATEGORII.categorii_prezente(text_pdf)
         logger.debug("PDF %s classified into: %s", nume_fisier, categorii_gasite)
         return categorii_gasite
 
+    def numara_categorii_pdf(self, text_pdf: str) -> Dict[str, int]:
+        """Keyword hits per pedagogy category; each distinct keyword is counted once over the text."""
+        return _AUTOMAT_CATEGORII.numara(text_pdf)
+
     def genereaza_raport_materiale(self) -> Path:
         lines = ["RAPORT MATERIALE DIDACTICE", f"Generat: {time.strftime('%Y-%m-%d %H:%M:%S')}", ""]
         total_pdf = 0
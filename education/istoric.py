@@ -0,0 +1,307 @@
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Moment = Union[datetime, float, None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversatii (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    proprietar TEXT NOT NULL,
+    profesor TEXT,
+    user_id TEXT,
+    timestamp REAL NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversatii_proprietar ON conversatii (proprietar, timestamp);
+CREATE INDEX IF NOT EXISTS idx_conversatii_profesor ON conversatii (profesor, timestamp);
+CREATE INDEX IF NOT EXISTS idx_conversatii_user ON conversatii (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_conversatii_timestamp ON conversatii (timestamp);
+CREATE TABLE IF NOT EXISTS decizii (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    proprietar TEXT NOT NULL,
+    profesor TEXT,
+    clasa INTEGER,
+    metoda TEXT,
+    timestamp REAL NOT NULL,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decizii_proprietar ON decizii (proprietar, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decizii_profesor ON decizii (profesor, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decizii_timestamp ON decizii (timestamp);
+"""
+
+# Coloanele indexate, extrase din intrare la scriere
+_TABELE = {
+    "conversatii": {"profesor": "profesor", "user_id": "user_id"},
+    "decizii": {"profesor": "profesor_ales", "clasa": "clasa", "metoda": "metoda"},
+}
+
+
+# Fereastra si numarul profesorilor populari raportati in metricile directorului
+_FEREASTRA_POPULARI = 50
+_TOP_POPULARI = 3
+
+
+def _valoare_numerica(valoare: Any) -> float:
+    """Numeric value of a logged field; anything that is not a finite number counts as 0."""
+    try:
+        numar = float(valoare)
+    except (TypeError, ValueError):
+        return 0.0
+    return numar if math.isfinite(numar) else 0.0
+
+
+def _secunde(moment: Moment) -> Optional[float]:
+    if moment is None:
+        return None
+    if isinstance(moment, datetime):
+        return moment.timestamp()
+    return float(moment)
+
+
+class AgregatDecizii:
+    """Running aggregates over one owner's decision ring, updated as entries enter and leave it.
+
+    Keeps the counts per routing method, the confidence and score sums and,
+    for the last ``fereastra`` decisions, the positions of every teacher's
+    picks, so metrics reads do not rescan the history.
+    """
+
+    def __init__(self, fereastra: int = _FEREASTRA_POPULARI) -> None:
+        self.total = 0
+        self.per_metoda: Dict[Any, int] = defaultdict(int)
+        self.suma_confidence_ai = 0.0
+        self.suma_scor_fallback = 0.0
+        self._fereastra_maxima = fereastra
+        self._fereastra: Deque[Any] = deque()
+        self._pozitii: Dict[str, Deque[int]] = {}
+        self._secventa = 0
+
+    def _contribuie(self, intrare: Dict[str, Any], semn: int) -> None:
+        self.total += semn
+        metoda = intrare.get("metoda")
+        self.per_metoda[metoda] += semn
+        if metoda == "director_ai":
+            self.suma_confidence_ai += semn * _valoare_numerica(intrare.get("confidence", 0))
+        elif metoda == "fallback":
+            self.suma_scor_fallback += semn * _valoare_numerica(intrare.get("scor", 0))
+
+    def adauga(self, intrare: Dict[str, Any], evacuata: Optional[Dict[str, Any]] = None) -> None:
+        """Count ``intrare``; ``evacuata`` is the entry it pushed out of the ring, if any."""
+        if evacuata is not None:
+            self._contribuie(evacuata, -1)
+        self._contribuie(intrare, 1)
+        if self._fereastra_maxima <= 0:
+            return
+        if len(self._fereastra) == self._fereastra_maxima:
+            profesor_vechi = self._fereastra.popleft()
+            if profesor_vechi:
+                pozitii = self._pozitii[profesor_vechi]
+                pozitii.popleft()
+                if not pozitii:
+                    del self._pozitii[profesor_vechi]
+        profesor = intrare.get("profesor_ales")
+        self._fereastra.append(profesor)
+        if profesor:
+            self._pozitii.setdefault(profesor, deque()).append(self._secventa)
+        self._secventa += 1
+
+    def profesori_populari(self, top: int = _TOP_POPULARI) -> List[Dict[str, Any]]:
+        """Most picked teachers in the window; ties go to the one picked first, as a recount would."""
+        clasament = sorted(self._pozitii.items(), key=lambda item: (-len(item[1]), item[1][0]))
+        return [{"nume": profesor, "count": len(pozitii)} for profesor, pozitii in clasament[:top]]
+
+    def instantaneu(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "per_metoda": dict(self.per_metoda),
+            "suma_confidence_ai": self.suma_confidence_ai,
+            "suma_scor_fallback": self.suma_scor_fallback,
+            "profesori_populari": self.profesori_populari(),
+        }
+
+
+class DepozitIstoric:
+    """Conversation and routing-decision history with flat memory use.
+
+    Each owner (a teacher or a director) keeps only its most recent entries in
+    a fixed-size ring buffer; every entry is also appended to SQLite, where it
+    can be queried by user, teacher and date. Ring buffers are warmed from the
+    database on first access, so recent context survives restarts. Without a
+    database path the store is memory-only.
+    """
+
+    def __init__(
+        self,
+        cale_db: Optional[Union[str, Path]] = None,
+        capacitate_conversatii: int = 50,
+        capacitate_decizii: int = 200,
+    ) -> None:
+        self.cale_db = Path(cale_db) if cale_db else None
+        self._capacitati = {"conversatii": capacitate_conversatii, "decizii": capacitate_decizii}
+        self._inele: Dict[str, Dict[str, Deque[Dict[str, Any]]]] = {"conversatii": {}, "decizii": {}}
+        self._agregate: Dict[str, AgregatDecizii] = {}
+        self._lock = threading.RLock()
+        self._conexiune: Optional[sqlite3.Connection] = None
+        if self.cale_db is not None:
+            self._deschide()
+
+    def _deschide(self) -> None:
+        try:
+            self.cale_db.parent.mkdir(parents=True, exist_ok=True)
+            conexiune = sqlite3.connect(str(self.cale_db), timeout=5.0, check_same_thread=False)
+            conexiune.execute("PRAGMA journal_mode=WAL")
+            conexiune.executescript(_SCHEMA)
+            conexiune.commit()
+            self._conexiune = conexiune
+        except sqlite3.Error as exc:
+            logger.error("Istoricul nu poate fi persistat in %s: %s", self.cale_db, exc)
+            self._conexiune = None
+
+    # ------------------------------------------------------------------ inele
+    def _inel(self, tabel: str, proprietar: str) -> Deque[Dict[str, Any]]:
+        inele = self._inele[tabel]
+        inel = inele.get(proprietar)
+        if inel is None:
+            inel = deque(self._ultimele_din_db(tabel, proprietar), maxlen=self._capacitati[tabel])
+            inele[proprietar] = inel
+            if tabel == "decizii":
+                agregat = AgregatDecizii(min(_FEREASTRA_POPULARI, self._capacitati[tabel]))
+                for intrare in inel:
+                    agregat.adauga(intrare)
+                self._agregate[proprietar] = agregat
+        return inel
+
+    def _ultimele_din_db(self, tabel: str, proprietar: str) -> List[Dict[str, Any]]:
+        if self._conexiune is None:
+            return []
+        randuri = self._conexiune.execute(
+            f"SELECT date FROM {tabel} WHERE proprietar = ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+            (proprietar, self._capacitati[tabel]),
+        ).fetchall()
+        return [json.loads(rand[0]) for rand in reversed(randuri)]
+
+    def _adauga(self, tabel: str, proprietar: str, intrare: Dict[str, Any]) -> None:
+        with self._lock:
+            inel = self._inel(tabel, proprietar)
+            if tabel == "decizii" and inel.maxlen:
+                evacuata = inel[0] if len(inel) == inel.maxlen else None
+                self._agregate[proprietar].adauga(intrare, evacuata)
+            inel.append(intrare)
+            if self._conexiune is None:
+                return
+            coloane = _TABELE[tabel]
+            nume_coloane = ["proprietar", "timestamp", "date", *coloane]
+            valori = [proprietar, time.time(), json.dumps(intrare, ensure_ascii=False, default=str)]
+            valori.extend(intrare.get(cheie) for cheie in coloane.values())
+            try:
+                self._conexiune.execute(
+                    f"INSERT INTO {tabel} ({', '.join(nume_coloane)}) VALUES ({', '.join('?' * len(valori))})",
+                    valori,
+                )
+                self._conexiune.commit()
+            except sqlite3.Error as exc:
+                logger.warning("Intrarea de istoric nu a putut fi salvata: %s", exc)
+
+    def _cauta(
+        self,
+        tabel: str,
+        filtre: Dict[str, Any],
+        de_la: Moment,
+        pana_la: Moment,
+        limita: int,
+    ) -> List[Dict[str, Any]]:
+        conditii, parametri = [], []
+        for coloana, valoare in filtre.items():
+            if valoare is not None:
+                conditii.append(f"{coloana} = ?")
+                parametri.append(valoare)
+        if de_la is not None:
+            conditii.append("timestamp >= ?")
+            parametri.append(_secunde(de_la))
+        if pana_la is not None:
+            conditii.append("timestamp < ?")
+            parametri.append(_secunde(pana_la))
+        where = f"WHERE {' AND '.join(conditii)}" if conditii else ""
+        with self._lock:
+            if self._conexiune is None:
+                return []
+            randuri = self._conexiune.execute(
+                f"SELECT date FROM {tabel} {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (*parametri, limita),
+            ).fetchall()
+        return [json.loads(rand[0]) for rand in randuri]
+
+    # ----------------------------------------------------------------- public
+    def adauga_conversatie(self, proprietar: str, intrare: Dict[str, Any]) -> None:
+        self._adauga("conversatii", proprietar, intrare)
+
+    def conversatii_recente(self, proprietar: str) -> List[Dict[str, Any]]:
+        """Most recent conversations of one teacher, oldest first (bounded by the ring size)."""
+        with self._lock:
+            return list(self._inel("conversatii", proprietar))
+
+    def cauta_conversatii(
+        self,
+        user_id: Optional[str] = None,
+        profesor: Optional[str] = None,
+        proprietar: Optional[str] = None,
+        de_la: Moment = None,
+        pana_la: Moment = None,
+        limita: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Persisted conversations matching all given filters, newest first."""
+        filtre = {"user_id": user_id, "profesor": profesor, "proprietar": proprietar}
+        return self._cauta("conversatii", filtre, de_la, pana_la, limita)
+
+    def adauga_decizie(self, proprietar: str, intrare: Dict[str, Any]) -> None:
+        self._adauga("decizii", proprietar, intrare)
+
+    def decizii_recente(self, proprietar: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._inel("decizii", proprietar))
+
+    def metrici_decizii(self, proprietar: str) -> Dict[str, Any]:
+        """Aggregates over the decisions currently in the owner's ring, without rescanning it."""
+        with self._lock:
+            self._inel("decizii", proprietar)
+            return self._agregate[proprietar].instantaneu()
+
+    def cauta_decizii(
+        self,
+        proprietar: Optional[str] = None,
+        profesor: Optional[str] = None,
+        de_la: Moment = None,
+        pana_la: Moment = None,
+        limita: int = 100,
+    ) -> List[Dict[str, Any]]:
+        filtre = {"proprietar": proprietar, "profesor": profesor}
+        return self._cauta("decizii", filtre, de_la, pana_la, limita)
+
+    def inchide(self) -> None:
+        with self._lock:
+            if self._conexiune is not None:
+                self._conexiune.close()
+                self._conexiune = None
+
+
+def get_depozit_istoric() -> DepozitIstoric:
+    if not hasattr(get_depozit_istoric, "_instance"):
+        from config import Config
+
+        get_depozit_istoric._instance = DepozitIstoric(
+            Config.ISTORIC_DB or None,
+            capacitate_conversatii=Config.ISTORIC_CAPACITATE_CONVERSATII,
+            capacitate_decizii=Config.ISTORIC_CAPACITATE_DECIZII,
+        )
+    return get_depozit_istoric._instance
@@ -0,0 +1,81 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Lot:
+    def __init__(self) -> None:
+        self.intrebari: List[str] = []
+        self.rezultate: List[Any] = []
+        self.plin = threading.Event()
+        self.gata = threading.Event()
+
+
+class LotRutare:
+    """Micro-batches routing requests that arrive close together for the same key (a class).
+
+    The first caller opens a batch and waits up to ``fereastra`` seconds (or
+    until ``maxim`` questions joined), then makes one ``decide(cheie,
+    intrebari, termen)`` call for the whole batch and hands every waiting
+    caller its own result. Followers wait at most until their own deadline;
+    on timeout, or when ``decide`` fails, they get None and use the
+    keyword fallback.
+    """
+
+    def __init__(
+        self,
+        decide: Callable[[Hashable, List[str], Any], List[Any]],
+        fereastra: float = 0.05,
+        maxim: int = 8,
+    ) -> None:
+        self._decide = decide
+        self.fereastra = fereastra
+        self.maxim = max(1, maxim)
+        self._deschise: Dict[Hashable, _Lot] = {}
+        self._lock = threading.Lock()
+        self._statistici = {"loturi": 0, "intrebari": 0, "asteptari_expirate": 0}
+
+    def ruteaza(self, cheie: Hashable, intrebare: str, termen=None) -> Any:
+        with self._lock:
+            lot = self._deschise.get(cheie)
+            lider = lot is None
+            if lider:
+                lot = self._deschise[cheie] = _Lot()
+            pozitie = len(lot.intrebari)
+            lot.intrebari.append(intrebare)
+            if len(lot.intrebari) >= self.maxim:
+                del self._deschise[cheie]
+                lot.plin.set()
+
+        if lider:
+            self._executa(cheie, lot, termen)
+        elif not lot.gata.wait(termen.ramas() if termen is not None else None):
+            with self._lock:
+                self._statistici["asteptari_expirate"] += 1
+            return None
+        return lot.rezultate[pozitie]
+
+    def _executa(self, cheie: Hashable, lot: _Lot, termen) -> None:
+        lot.plin.wait(self.fereastra)
+        with self._lock:
+            if self._deschise.get(cheie) is lot:
+                del self._deschise[cheie]
+            intrebari = list(lot.intrebari)
+            self._statistici["loturi"] += 1
+            self._statistici["intrebari"] += len(intrebari)
+        try:
+            rezultate = list(self._decide(cheie, intrebari, termen))
+        except Exception as exc:
+            logger.error("Rutarea in lot a esuat pentru %s: %s", cheie, exc)
+            rezultate = []
+        lot.rezultate = (rezultate + [None] * len(intrebari))[: len(intrebari)]
+        lot.gata.set()
+
+    def statistici(self) -> Dict[str, Any]:
+        with self._lock:
+            statistici = dict(self._statistici)
+        loturi = statistici["loturi"]
+        statistici["intrebari_per_lot"] = round(statistici["intrebari"] / loturi, 2) if loturi else 0
+        return statistici
@@ -0,0 +1,149 @@
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+# Creste la fiecare schimbare de reguli, pentru a re-normaliza textele deja salvate
+VERSIUNE_NORMALIZARE = 3
+
+_LINII_MARGINE = 2
+_PRAG_REPETARE = 0.5
+_MIN_PAGINI_ANTET = 3
+
+_RE_NUMAR_PAGINA = re.compile(
+    r"^[-–—\s]*(?:pag(?:ina)?\.?\s*|page\s*)?\d{1,4}(?:\s*(?:/|din|of)\s*\d{1,4})?[-–—\s]*$",
+    re.IGNORECASE,
+)
+_RE_BOILERPLATE = re.compile(
+    r"^(?:©|\(c\)\s|copyright\b|toate drepturile rezervate|all rights reserved|isbn\b|www\.\S+$|https?://\S+$)",
+    re.IGNORECASE,
+)
+_RE_CRATIMA_RAND = re.compile(r"(\w+)-\n(\w+)")
+_RE_CUVANT = re.compile(r"\w+")
+_RE_COMPUS = re.compile(r"\w+-\w+")
+# Forme scurte legate prin cratima (s-a, l-am, nu-mi, dintr-o); cu si fara diacritice
+_CLITICE_STANGA = frozenset(
+    "c ca că ce d de i îi ii l la le m mi ne n nu pe s sa să se și si t te ti ți v va vă "
+    "într intr dintr printr".split()
+)
+_CLITICE_DREAPTA = frozenset(
+    "a ai al am ar as aș au ati ați i l le lea lui m ma mă mi n ne o s se și si te ti ți "
+    "ul un una v va vă".split()
+)
+# Compuse frecvente in materialele didactice, pastrate cu cratima
+_COMPUSE_CUNOSCUTE = frozenset(
+    "profesor-elev elev-profesor familie-scoala familie-școală scoala-familie școală-familie "
+    "parinte-copil părinte-copil cauza-efect cauză-efect intrebare-raspuns întrebare-răspuns "
+    "nord-est nord-vest sud-est sud-vest dupa-amiaza după-amiază floarea-soarelui".split()
+)
+_PREFIXE_COMPUSE = frozenset("ex nord sud vice".split())
+_RE_SPATII = re.compile(r"[ \t\f\v\u00a0]+")
+_RE_RANDURI_GOALE = re.compile(r"\n{3,}")
+
+
+def estimeaza_tokeni(text: str) -> int:
+    """Same rough estimate as ``AIClientManager.estimate_tokens`` (about 3 characters per token)."""
+    return len(text) // 3
+
+
+def _cheie_linie(linie: str) -> str:
+    return _RE_SPATII.sub(" ", linie.strip().lower())
+
+
+def _linii_repetate(pagini_linii: List[List[str]]) -> set:
+    """Header/footer candidates: identical edge lines repeated on most pages.
+
+    Lines that only differ by a number (``Lectia 1``, ``Lectia 2``) are kept;
+    bare page numbers on the edge lines are handled by ``_RE_NUMAR_PAGINA``.
+    """
+    if len(pagini_linii) < _MIN_PAGINI_ANTET:
+        return set()
+    aparitii: Counter = Counter()
+    for linii in pagini_linii:
+        margini = linii[:_LINII_MARGINE] + linii[-_LINII_MARGINE:]
+        aparitii.update({_cheie_linie(linie) for linie in margini if linie.strip()})
+    prag = max(2, int(len(pagini_linii) * _PRAG_REPETARE))
+    return {cheie for cheie, numar in aparitii.items() if numar >= prag}
+
+
+def _uneste_cratime(text: str) -> str:
+    """Rejoin words broken across lines with a hyphen.
+
+    The line break is always removed. The hyphen is dropped (a syllable
+    split, ``natu-`` + ``rale``) when both parts are lowercase letters,
+    unless either part is a clitic (``s-a``, ``l-am``, ``da-mi``), the
+    compound is a known one (``profesor-elev``) or the hyphenated form is
+    written on one line elsewhere in the document. A joined form found
+    unbroken elsewhere always wins.
+    """
+    cuvinte = {cuvant.lower() for cuvant in _RE_CUVANT.findall(text)}
+    compuse = {compus.lower() for compus in _RE_COMPUS.findall(text)}
+
+    def uneste(potrivire: "re.Match[str]") -> str:
+        inceput, sfarsit = potrivire.group(1), potrivire.group(2)
+        stanga, dreapta = inceput.lower(), sfarsit.lower()
+        if stanga + dreapta in cuvinte:
+            return inceput + sfarsit
+        silabe = inceput[-1].isalpha() and inceput[-1].islower() and sfarsit.isalpha() and sfarsit.islower()
+        if (
+            not silabe
+            or stanga in _CLITICE_STANGA
+            or dreapta in _CLITICE_DREAPTA
+            or f"{stanga}-{dreapta}" in compuse
+            or f"{stanga}-{dreapta}" in _COMPUSE_CUNOSCUTE
+            or stanga in _PREFIXE_COMPUSE
+        ):
+            return f"{inceput}-{sfarsit}"
+        return inceput + sfarsit
+
+    return _RE_CRATIMA_RAND.sub(uneste, text)
+
+
+def normalizeaza_pagini(pagini: Sequence[str]) -> Tuple[str, Dict[str, int]]:
+    """Clean PyPDF2 page texts before they are stored and sent to prompts.
+
+    Removes repeated page headers/footers, page numbers and publishing
+    boilerplate, rejoins words hyphenated across line breaks and collapses
+    whitespace. Returns the text and a small report with the estimated
+    tokens saved.
+    """
+    text_initial = "".join(pagini)
+    pagini_linii = [pagina.splitlines() for pagina in pagini]
+    repetate = _linii_repetate(pagini_linii)
+
+    statistici = {"linii_antet_subsol": 0, "numere_pagina": 0, "linii_boilerplate": 0}
+    pagini_curate = []
+    for linii in pagini_linii:
+        pastrate = []
+        for index, linie in enumerate(linii):
+            curata = linie.strip()
+            pe_margine = index < _LINII_MARGINE or index >= len(linii) - _LINII_MARGINE
+            if pe_margine and curata and _cheie_linie(curata) in repetate:
+                statistici["linii_antet_subsol"] += 1
+                continue
+            if pe_margine and curata and _RE_NUMAR_PAGINA.match(curata):
+                statistici["numere_pagina"] += 1
+                continue
+            if curata and _RE_BOILERPLATE.match(curata):
+                statistici["linii_boilerplate"] += 1
+                continue
+            pastrate.append(linie)
+        pagini_curate.append("\n".join(pastrate))
+
+    text = "\n".join(pagini_curate)
+    text = _uneste_cratime(text)
+    text = _RE_SPATII.sub(" ", text)
+    text = "\n".join(linie.strip() for linie in text.split("\n"))
+    text = _RE_RANDURI_GOALE.sub("\n\n", text).strip()
+
+    tokeni_initiali = estimeaza_tokeni(text_initial)
+    tokeni_finali = estimeaza_tokeni(text)
+    statistici.update(
+        {
+            "caractere_initiale": len(text_initial),
+            "caractere_finale": len(text),
+            "tokeni_initiali": tokeni_initiali,
+            "tokeni_finali": tokeni_finali,
+            "tokeni_economisiti": max(0, tokeni_initiali - tokeni_finali),
+        }
+    )
+    return text, statistici
@@ -0,0 +1,88 @@
+import logging
+from typing import Dict, Iterable, Iterator, List, Mapping, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AutomatCuvinteCheie:
+    """Keyword classifier compiled once from a ``{categorie: [cuvinte]}`` table.
+
+    Matching is plain substring search, like the ``cuvant in text`` scans it
+    replaces, but every distinct keyword is searched once per text (keywords
+    shared by several categories are not rescanned) with the C-level
+    ``str`` search methods. A pure-Python character-by-character automaton
+    was measured to be several times slower than these scans on both short
+    questions and megabyte-sized PDF texts.
+    """
+
+    def __init__(self, categorii: Mapping[str, Iterable[str]]) -> None:
+        self.categorii: List[str] = list(categorii)
+        self._cuvinte_categorie: Dict[str, List[str]] = {}
+        self._categorii_cuvant: Dict[str, List[str]] = {}
+
+        for categorie, cuvinte in categorii.items():
+            lista = self._cuvinte_categorie.setdefault(categorie, [])
+            for cuvant in cuvinte:
+                cuvant = cuvant.lower()
+                if not cuvant:
+                    continue
+                if cuvant not in lista:
+                    lista.append(cuvant)
+                self._categorii_cuvant.setdefault(cuvant, [])
+                if categorie not in self._categorii_cuvant[cuvant]:
+                    self._categorii_cuvant[cuvant].append(categorie)
+        self._cuvinte: List[str] = list(self._categorii_cuvant)
+        logger.debug("Cuvinte cheie: %d distincte in %d categorii", len(self._cuvinte), len(self.categorii))
+
+    def cuvinte_prezente(self, text: str) -> Set[str]:
+        """Distinct keywords that occur in the lowercased text."""
+        text = text.lower()
+        return {cuvant for cuvant in self._cuvinte if cuvant in text}
+
+    def potriviri(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield ``(pozitie_final, cuvant)`` for every keyword occurrence, overlapping ones included."""
+        text = text.lower()
+        gasite = []
+        for cuvant in self._cuvinte:
+            pozitie = text.find(cuvant)
+            while pozitie != -1:
+                gasite.append((pozitie + len(cuvant) - 1, cuvant))
+                pozitie = text.find(cuvant, pozitie + 1)
+        gasite.sort()
+        return iter(gasite)
+
+    def cuvinte_gasite(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct keywords found in the text, grouped by category."""
+        rezultat: Dict[str, Set[str]] = {}
+        for cuvant in self.cuvinte_prezente(text):
+            for categorie in self._categorii_cuvant[cuvant]:
+                rezultat.setdefault(categorie, set()).add(cuvant)
+        return rezultat
+
+    def categorii_prezente(self, text: str) -> List[str]:
+        """Categories with at least one keyword in the text; stops at a category's first hit."""
+        text = text.lower()
+        verificate: Dict[str, bool] = {}
+        rezultat = []
+        for categorie in self.categorii:
+            for cuvant in self._cuvinte_categorie[categorie]:
+                if cuvant not in verificate:
+                    verificate[cuvant] = cuvant in text
+                if verificate[cuvant]:
+                    rezultat.append(categorie)
+                    break
+        return rezultat
+
+    def numara(self, text: str) -> Dict[str, int]:
+        """Number of keyword occurrences per category (categories without hits are reported as 0).
+
+        Occurrences of one keyword are counted without overlap, as ``str.count`` does.
+        """
+        text = text.lower()
+        rezultat = {categorie: 0 for categorie in self.categorii}
+        for cuvant in self._cuvinte:
+            numar = text.count(cuvant)
+            if numar:
+                for categorie in self._categorii_cuvant[cuvant]:
+                    rezultat[categorie] += numar
+        return rezultat
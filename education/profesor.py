@@ -1,17 +1,68 @@
 ﻿import logging
+import threading
 import time
-from typing import Any, Dict, List, Optional
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from config import Config
 from ai_clients import ai_client_manager
+from sesiuni import manager_sesiuni
+from termen_limita import TermenDepasit
 
 from .gestor_materiale import get_gestor_materiale
+from .istoric import get_depozit_istoric
+from .rezumate import cheie_rezumat
 
 logger = logging.getLogger(__name__)
 
+_LIMITA_FRAGMENT_MATERIAL = 2584
+_LIMITA_MATERIALE_PROMPT = 1597
+
+_PROMPT_PERSONALITATE = {
+    "prietenos": "Esti profesorul preferat al copiilor, mereu vesel, cald si empatic.",
+    "serios": "Esti un profesor respectat, riguros si atent la detalii.",
+    "energic": "Esti un profesor plin de viata, entuziast, care inspira elevii sa-si depaseasca limitele.",
+    "calm": "Esti profesorul care ofera siguranta emotionala, liniste si rabdare elevilor.",
+    "creativ": "Esti profesorul care aduce mereu idei noi, captivante si inovatoare, stimuland imaginatia elevilor.",
+}
+_PERSONALITATE_IMPLICITA = "Esti un profesor remarcabil care inspira elevii"
+_PROMPT_CLASA = {
+    0: "Vei folosi un limbaj simplu, povesti captivante si exemple interactive pentru copii de 5-6 ani.",
+    1: "Vei explica intr-un mod clar si direct, folosind exemple din viata de zi cu zi pentru copiii de 6-7 ani.",
+    2: "Raspunsurile tale vor fi interactive, incurajand curiozitatea copiilor de 7-8 ani, cu explicatii accesibile.",
+    3: "Te vei adresa elevilor de 8-9 ani incurajand gandirea critica si argumentarea logica.",
+    4: "Vei introduce concepte avansate pentru copiii de 9-10 ani, folosind limbaj matur si provocator.",
+}
+_CLASA_IMPLICITA = "Adapteaza-ti raspunsul pentru varsta elevilor, stimuland imaginatia si gandirea."
+_SABLON_INTREBARE = 'Intrebarea elevului este: "{}"'
+
+_MESAJ_TERMEN_DEPASIT = "Raspunsul dureaza mai mult decat de obicei. Te rog sa incerci din nou in cateva momente."
+
+_CAMPURI_CONFIGURARE = (
+    "temperature",
+    "max_tokens",
+    "model",
+    "personalitate",
+    "stil_predare",
+    "nivel_pacienta",
+    "stil_comunicare",
+    "tehnici_speciale",
+)
+
+# Obiectele partajate traiesc cat timp le foloseste cel putin un profesor
+_LOCK_INTERNARE = threading.Lock()
+_CONFIGURARI_INTERNATE: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+_CUNOSTINTE_INTERNATE: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+
 
 class ConfigurariProfesor:
-    """Configuratii specifice fiecarui profesor AI."""
+    """Configuratii specifice fiecarui profesor AI.
+
+    Instances are immutable so identical configurations can be shared by every
+    teacher that uses them (see ``interneaza``).
+    """
+
+    __slots__ = _CAMPURI_CONFIGURARE + ("__weakref__",)
 
     def __init__(
         self,
@@ -20,20 +71,158 @@ class ConfigurariProfesor:
         model: str = "gpt-5-nano",
         personalitate: str = "prietenos",
         stil_predare: str = "interactiv",
-        tehnici_speciale: Optional[List[str]] = None,
+        tehnici_speciale: Optional[Iterable[str]] = None,
+        nivel_pacienta: str = "ridicat",
+        stil_comunicare: str = "adaptat_varstei",
     ) -> None:
-        self.temperature = temperature
-        self.max_tokens = max_tokens
-        self.model = model
-        self.personalitate = personalitate
-        self.stil_predare = stil_predare
-        self.nivel_pacienta = "ridicat"
-        self.stil_comunicare = "adaptat_varstei"
-        self.tehnici_speciale = tehnici_speciale or []
+        valori = {
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "model": model,
+            "personalitate": personalitate,
+            "stil_predare": stil_predare,
+            "nivel_pacienta": nivel_pacienta,
+            "stil_comunicare": stil_comunicare,
+            "tehnici_speciale": tuple(tehnici_speciale or ()),
+        }
+        for camp, valoare in valori.items():
+            object.__setattr__(self, camp, valoare)
+
+    def __setattr__(self, camp: str, valoare: Any) -> None:
+        raise AttributeError(f"ConfigurariProfesor este imutabila; nu se poate seta {camp}")
+
+    def _cheie(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, camp) for camp in _CAMPURI_CONFIGURARE)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ConfigurariProfesor) and self._cheie() == other._cheie()
+
+    def __hash__(self) -> int:
+        return hash(self._cheie())
+
+    def ca_dict(self) -> Dict[str, Any]:
+        date = {camp: getattr(self, camp) for camp in _CAMPURI_CONFIGURARE}
+        date["tehnici_speciale"] = list(self.tehnici_speciale)
+        return date
+
+    @classmethod
+    def din_dict(cls, date: Dict[str, Any]) -> "ConfigurariProfesor":
+        return cls.interneaza(cls(**{camp: date[camp] for camp in _CAMPURI_CONFIGURARE if camp in date}))
+
+    @classmethod
+    def interneaza(cls, configurari: "ConfigurariProfesor") -> "ConfigurariProfesor":
+        """Return the shared instance equal to ``configurari``."""
+        cheie = configurari._cheie()
+        with _LOCK_INTERNARE:
+            existent = _CONFIGURARI_INTERNATE.get(cheie)
+            if existent is None:
+                _CONFIGURARI_INTERNATE[cheie] = existent = configurari
+        return existent
+
+
+class CunostinteProfesor:
+    """Immutable material knowledge shared by every teacher with the same subject and sources.
+
+    The same teacher is instantiated for many classes and both schools; they
+    all point at one interned instance holding the material references, the
+    digest key and the rendered material section of the prompt.
+    """
+
+    __slots__ = ("materie", "referinte_materiale", "cheie_rezumat", "rezumat", "context_materiale", "__weakref__")
+
+    def __init__(
+        self,
+        materie: str,
+        referinte_materiale: Iterable[Tuple[str, str]],
+        rezumat: Optional[str],
+        context_materiale: str,
+    ) -> None:
+        referinte = tuple((str(nume), str(sha)) for nume, sha in referinte_materiale)
+        cheie = cheie_rezumat(f"profesor:{materie}", (sha for _, sha in referinte)) if referinte else None
+        object.__setattr__(self, "materie", materie)
+        object.__setattr__(self, "referinte_materiale", referinte)
+        object.__setattr__(self, "cheie_rezumat", cheie)
+        object.__setattr__(self, "rezumat", rezumat)
+        object.__setattr__(self, "context_materiale", context_materiale)
+
+    def __setattr__(self, camp: str, valoare: Any) -> None:
+        raise AttributeError(f"CunostinteProfesor este imutabila; nu se poate seta {camp}")
+
+    def ca_dict(self) -> Dict[str, Any]:
+        return {
+            "materie": self.materie,
+            "referinte": [list(referinta) for referinta in self.referinte_materiale],
+            "rezumat": self.rezumat,
+            "context": self.context_materiale,
+        }
+
+    @classmethod
+    def din_dict(cls, date: Dict[str, Any]) -> "CunostinteProfesor":
+        return cls._interneaza(
+            date["materie"], tuple(tuple(r) for r in date.get("referinte", [])), date.get("rezumat"),
+            lambda: date.get("context", ""),
+        )
+
+    @classmethod
+    def interneaza(cls, materie: str, referinte: Iterable[Tuple[str, str]], gestor_materiale) -> "CunostinteProfesor":
+        """Shared knowledge for these sources; the material section is rendered only on first use."""
+        referinte = tuple((nume, sha) for nume, sha in referinte)
+        rezumat = None
+        if referinte:
+            cheie = cheie_rezumat(f"profesor:{materie}", (sha for _, sha in referinte))
+            rezumat = gestor_materiale.depozit_rezumate.obtine(cheie)
+
+        def randeaza() -> str:
+            if rezumat:
+                return f"\n\nRezumatul materialelor didactice:\n{rezumat}"
+            if referinte:
+                extrase = "\n\n".join(
+                    f"Din {nume}: {gestor_materiale.citeste_fragment(sha, _LIMITA_FRAGMENT_MATERIAL)}..."
+                    for nume, sha in referinte
+                )
+                return f"\n\nMateriale didactice disponibile:\n{extrase[:_LIMITA_MATERIALE_PROMPT]}"
+            return ""
+
+        return cls._interneaza(materie, referinte, rezumat, randeaza)
+
+    @classmethod
+    def _interneaza(cls, materie, referinte, rezumat, randeaza) -> "CunostinteProfesor":
+        cheie = (materie, referinte, rezumat)
+        with _LOCK_INTERNARE:
+            existent = _CUNOSTINTE_INTERNATE.get(cheie)
+        if existent is not None:
+            return existent
+        cunostinte = cls(materie, referinte, rezumat, randeaza())
+        with _LOCK_INTERNARE:
+            return _CUNOSTINTE_INTERNATE.setdefault(cheie, cunostinte)
+
+
+def statistici_internare() -> Dict[str, int]:
+    """Number of distinct shared configurations and knowledge objects currently alive."""
+    with _LOCK_INTERNARE:
+        return {"configurari": len(_CONFIGURARI_INTERNATE), "cunostinte": len(_CUNOSTINTE_INTERNATE)}
 
 
 class Profesor:
-    """Reprezinta un profesor AI cu configuratii si materiale asociate."""
+    """Reprezinta un profesor AI cu configuratii si materiale asociate.
+
+    Only class-specific state lives on the instance; configuration and
+    material knowledge are shared flyweights. Materials are loaded on first
+    use, so startup and memory scale with the teachers that get questions.
+    """
+
+    __slots__ = (
+        "nume",
+        "materie",
+        "clasa",
+        "scoala",
+        "configurari",
+        "gestor_materiale",
+        "cunostinte",
+        "_antet",
+        "_materiale_incarcate",
+        "_lock_materiale",
+    )
 
     def __init__(
         self,
@@ -48,88 +237,237 @@ class Profesor:
         self.materie = materie
         self.clasa = clasa
         self.scoala = scoala
-        self.configurari = configurari or ConfigurariProfesor()
-        self.istoric_conversatii: List[Dict[str, Any]] = []
+        self.configurari = ConfigurariProfesor.interneaza(configurari or ConfigurariProfesor())
         self.gestor_materiale = gestor_materiale or get_gestor_materiale()
-        self.cunostinte_din_materiale = ""
-        self.incarca_materiale_didactice()
+        self.cunostinte = CunostinteProfesor.interneaza(self.materie, (), self.gestor_materiale)
+        self._antet = ""
+        self._materiale_incarcate = False
+        self._lock_materiale = threading.Lock()
+
+    def instantaneu(self) -> Dict[str, Any]:
+        """Class-specific state; configuration and knowledge are saved once by the caller."""
+        return {
+            "nume": self.nume,
+            "materie": self.materie,
+            "clasa": self.clasa,
+            "scoala": self.scoala,
+            "materiale_incarcate": self._materiale_incarcate,
+        }
+
+    @classmethod
+    def din_instantaneu(
+        cls,
+        date: Dict[str, Any],
+        configurari: ConfigurariProfesor,
+        cunostinte: CunostinteProfesor,
+        gestor_materiale=None,
+    ) -> "Profesor":
+        """Rebuild a teacher from ``instantaneu`` output, skipping material loading.
+
+        Teachers whose materials were not loaded when the snapshot was taken
+        keep loading them on first use.
+        """
+        profesor = cls.__new__(cls)
+        profesor.nume = date["nume"]
+        profesor.materie = date["materie"]
+        profesor.clasa = date["clasa"]
+        profesor.scoala = date["scoala"]
+        profesor.configurari = ConfigurariProfesor.interneaza(configurari)
+        profesor.gestor_materiale = gestor_materiale or get_gestor_materiale()
+        profesor.cunostinte = cunostinte
+        profesor._antet = profesor._randeaza_antet()
+        profesor._materiale_incarcate = date.get("materiale_incarcate", True)
+        profesor._lock_materiale = threading.Lock()
+        return profesor
 
     def incarca_materiale_didactice(self) -> None:
         materiale = self.gestor_materiale.gaseste_materiale_profesor(
             self.scoala, self.clasa, self.materie, self.nume
         )
-        cunostinte = []
+        referinte = []
         for material in materiale:
-            text = self.gestor_materiale.incarca_pdf_cu_cache(material)
-            if text:
-                cunostinte.append(f"Din {material.name}: {text[:2584]}...")
-        self.cunostinte_din_materiale = "\n\n".join(cunostinte)
+            sha = self.gestor_materiale.asigura_text_extras(material)
+            if sha and self.gestor_materiale.depozit_text.lungime(sha):
+                referinte.append((material.name, sha))
+        self.referinte_materiale = referinte
+        self.compileaza_prompt()
 
-    def obtine_prompt_personalizat(self, intrebare: str) -> str:
-        prompt_personalitate = {
-            "prietenos": "Esti profesorul preferat al copiilor, mereu vesel, cald si empatic.",
-            "serios": "Esti un profesor respectat, riguros si atent la detalii.",
-            "energic": "Esti un profesor plin de viata, entuziast, care inspira elevii sa-si depaseasca limitele.",
-            "calm": "Esti profesorul care ofera siguranta emotionala, liniste si rabdare elevilor.",
-            "creativ": "Esti profesorul care aduce mereu idei noi, captivante si inovatoare, stimuland imaginatia elevilor.",
-        }
-        prompt_clasa = {
-            0: "Vei folosi un limbaj simplu, povesti captivante si exemple interactive pentru copii de 5-6 ani.",
-            1: "Vei explica intr-un mod clar si direct, folosind exemple din viata de zi cu zi pentru copiii de 6-7 ani.",
-            2: "Raspunsurile tale vor fi interactive, incurajand curiozitatea copiilor de 7-8 ani, cu explicatii accesibile.",
-            3: "Te vei adresa elevilor de 8-9 ani incurajand gandirea critica si argumentarea logica.",
-            4: "Vei introduce concepte avansate pentru copiii de 9-10 ani, folosind limbaj matur si provocator.",
-        }
-        materiale_context = ""
-        if self.cunostinte_din_materiale:
-            materiale_context = f"\n\nMateriale didactice disponibile:\n{self.cunostinte_din_materiale[:1597]}"
+    def asigura_materiale(self) -> None:
+        """Load the teaching materials the first time they are needed."""
+        if self._materiale_incarcate:
+            return
+        with self._lock_materiale:
+            if not self._materiale_incarcate:
+                self.incarca_materiale_didactice()
+
+    @property
+    def materiale_incarcate(self) -> bool:
+        return self._materiale_incarcate
+
+    @property
+    def are_materiale(self) -> bool:
+        """Whether the teacher has materials, answered from the material index until they are loaded."""
+        if self._materiale_incarcate:
+            return bool(self.cunostinte.referinte_materiale)
+        return self.gestor_materiale.are_materiale(self.scoala, self.clasa, self.materie, self.nume)
+
+    @property
+    def cheie_istoric(self) -> str:
+        return f"{self.scoala}/{self.clasa}/{self.materie}/{self.nume}"
+
+    @property
+    def istoric_conversatii(self) -> List[Dict[str, Any]]:
+        """Most recent conversations (bounded); older ones are queried from the history store."""
+        return get_depozit_istoric().conversatii_recente(self.cheie_istoric)
+
+    @property
+    def referinte_materiale(self) -> List[Tuple[str, str]]:
+        """(nume fisier, hash continut) - textul ramane in depozitul partajat"""
+        self.asigura_materiale()
+        return list(self.cunostinte.referinte_materiale)
+
+    @referinte_materiale.setter
+    def referinte_materiale(self, referinte: Iterable[Tuple[str, str]]) -> None:
+        self.cunostinte = CunostinteProfesor.interneaza(self.materie, referinte, self.gestor_materiale)
+        self._materiale_incarcate = True
+
+    @property
+    def cunostinte_din_materiale(self) -> str:
+        """Material excerpts, read on demand from the shared memory-mapped text store."""
+        self.asigura_materiale()
+        return "\n\n".join(
+            f"Din {nume}: {self.gestor_materiale.citeste_fragment(sha, _LIMITA_FRAGMENT_MATERIAL)}..."
+            for nume, sha in self.cunostinte.referinte_materiale
+        )
+
+    @property
+    def cheie_rezumat(self) -> Optional[str]:
+        self.asigura_materiale()
+        return self.cunostinte.cheie_rezumat
+
+    @property
+    def rezumat_materiale(self) -> Optional[str]:
+        """Precomputed digest of this teacher's materials, if the offline builder produced one."""
+        cheie = self.cheie_rezumat
+        return self.gestor_materiale.depozit_rezumate.obtine(cheie) if cheie else None
+
+    def reimprospateaza_materiale(self, diferenta) -> bool:
+        """Reload materials only if the manifest diff touches this teacher's folders."""
+        foldere = self.gestor_materiale.foldere_profesor(self.scoala, self.clasa, self.materie, self.nume)
+        if not diferenta.afecteaza(foldere):
+            return False
+        if not self._materiale_incarcate:
+            # Vor fi citite la prima utilizare, direct in varianta noua
+            return True
+        self.incarca_materiale_didactice()
+        logger.info("Materiale reincarcate pentru %s (%s, clasa %s)", self.nume, self.materie, self.clasa)
+        return True
+
+    def _randeaza_antet(self) -> str:
         return f"""
-        {prompt_personalitate.get(self.configurari.personalitate, "Esti un profesor remarcabil care inspira elevii").strip()}
+        {_PROMPT_PERSONALITATE.get(self.configurari.personalitate, _PERSONALITATE_IMPLICITA).strip()}
         Te numesti {self.nume}, profesor de {self.materie} la {self.scoala}, special pentru clasa {self.clasa}.
 
-        {prompt_clasa.get(self.clasa, "Adapteaza-ti raspunsul pentru varsta elevilor, stimuland imaginatia si gandirea.")}
+        {_PROMPT_CLASA.get(self.clasa, _CLASA_IMPLICITA)}
 
         Metoda ta de predare este {self.configurari.stil_predare}, bazata pe implicare activa si empatie profunda.
         Nivelul tau de rabdare este {self.configurari.nivel_pacienta}, asigurand ca fiecare elev se simte valoros si ascultat.
 
-        {materiale_context}
-
-        Intrebarea elevului este: "{intrebare}"
-
         Raspunde intr-un mod captivant, clar si plin de empatie, oferind exemple practice si incurajand curiozitatea.
         """.strip()
 
-    def raspunde_intrebare(self, intrebare: str, user_id: str = "default", is_free_tier: bool = True) -> str:
-        prompt = self.obtine_prompt_personalizat(intrebare)
+    def compileaza_prompt(self) -> None:
+        """Render the invariant persona header once and refresh the shared material section.
+
+        Called after (re)loading materials; ``obtine_prefix_static`` only
+        refreshes the knowledge when a digest for these materials appears or changes.
+        """
+        self._antet = self._randeaza_antet()
+        self.cunostinte = CunostinteProfesor.interneaza(
+            self.materie, self.cunostinte.referinte_materiale, self.gestor_materiale
+        )
+
+    def obtine_prefix_static(self) -> str:
+        """Persona and material context, identical for every question to this teacher.
+
+        It is sent first, as the system prompt, so the providers' prompt caches
+        (Anthropic ``cache_control``, OpenAI/DeepSeek automatic prefix caching)
+        can reuse it; nothing request-specific may be added here.
+        """
+        self.asigura_materiale()
+        if self.rezumat_materiale != self.cunostinte.rezumat:
+            self.compileaza_prompt()
+        return self._antet + self.cunostinte.context_materiale
+
+    @staticmethod
+    def obtine_sufix_intrebare(intrebare: str) -> str:
+        return _SABLON_INTREBARE.format(intrebare)
+
+    def obtine_prompt_personalizat(self, intrebare: str) -> str:
+        return f"{self.obtine_prefix_static()}\n\n{self.obtine_sufix_intrebare(intrebare)}"
+
+    def raspunde_in_sesiune(
+        self, intrebare: str, user_id: str = "default", is_free_tier: bool = True, termen=None
+    ) -> str:
+        """Answer as part of the student's ongoing session, so follow-up questions keep their context."""
+        sesiune = manager_sesiuni.obtine(user_id, self.cheie_istoric)
+        return self.raspunde_intrebare(
+            intrebare, user_id=user_id, is_free_tier=is_free_tier, sesiune=sesiune, termen=termen
+        )
+
+    def incheie_sesiune(self, user_id: str) -> bool:
+        return manager_sesiuni.inchide(user_id, self.cheie_istoric)
+
+    def genereaza_raspuns(
+        self, intrebare: str, user_id: str = "default", is_free_tier: bool = True, sesiune=None, termen=None
+    ) -> Dict[str, Any]:
+        """Model response for the question without recording it in the conversation history."""
+        return ai_client_manager.get_ai_response(
+            prompt=self.obtine_sufix_intrebare(intrebare),
+            subject=self.materie,
+            user_id=user_id,
+            is_free_tier=is_free_tier,
+            max_tokens=self.configurari.max_tokens,
+            temperature=self.configurari.temperature,
+            system_prompt=self.obtine_prefix_static(),
+            sesiune=sesiune,
+            termen=termen,
+        )
+
+    def inregistreaza_conversatie(self, intrebare: str, user_id: str, result: Dict[str, Any]) -> None:
+        get_depozit_istoric().adauga_conversatie(
+            self.cheie_istoric,
+            {
+                "profesor": self.nume,
+                "intrebare": intrebare,
+                "raspuns": result["content"],
+                "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "provider": result["provider"],
+                "tokens_used": result["tokens_used"],
+                "from_cache": result.get("from_cache", False),
+                "user_id": user_id,
+                "configurari_folosite": {
+                    "model": result["provider"],
+                    "temperature": self.configurari.temperature,
+                },
+            },
+        )
+
+    def raspunde_intrebare(
+        self, intrebare: str, user_id: str = "default", is_free_tier: bool = True, sesiune=None, termen=None
+    ) -> str:
         try:
             if is_free_tier and not Config.FREE_TIER_ENABLED:
                 return "Sistemul gratuit este temporar indisponibil. Va rugam sa incercati mai tarziu."
 
-            result = ai_client_manager.get_ai_response(
-                prompt=prompt,
-                subject=self.materie,
-                user_id=user_id,
-                is_free_tier=is_free_tier,
-                max_tokens=self.configurari.max_tokens,
-                temperature=self.configurari.temperature,
-            )
-            raspuns = result["content"]
-            self.istoric_conversatii.append(
-                {
-                    "intrebare": intrebare,
-                    "raspuns": raspuns,
-                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "provider": result["provider"],
-                    "tokens_used": result["tokens_used"],
-                    "from_cache": result.get("from_cache", False),
-                    "user_id": user_id,
-                    "configurari_folosite": {
-                        "model": result["provider"],
-                        "temperature": self.configurari.temperature,
-                    },
-                }
+            result = self.genereaza_raspuns(
+                intrebare, user_id=user_id, is_free_tier=is_free_tier, sesiune=sesiune, termen=termen
             )
-            return raspuns
+            self.inregistreaza_conversatie(intrebare, user_id, result)
+            return result["content"]
+        except TermenDepasit as exc:
+            logger.warning("Raspunsul profesorului %s a depasit termenul: %s", self.nume, exc)
+            return _MESAJ_TERMEN_DEPASIT
         except Exception as exc:
             error_msg = f"Eroare la obtinerea raspunsului: {exc}"
             logger.error(error_msg)
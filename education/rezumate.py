@@ -0,0 +1,163 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Creste cand se schimba promptul de rezumare, pentru a invalida rezumatele vechi
+VERSIUNE_REZUMAT = 1
+_MAX_SURSA_PER_MATERIAL = 6000
+_MAX_SURSA_TOTALA = 16000
+_MAX_TOKENI_REZUMAT = 600
+_TTL_REZUMAT_LIPSA = 60.0
+
+
+def cheie_rezumat(tip: str, hashuri: Iterable[str]) -> str:
+    """Digest key derived from the content hashes of its sources, independent of file paths."""
+    continut = json.dumps([VERSIUNE_REZUMAT, tip, sorted(set(hashuri))])
+    return hashlib.sha256(continut.encode("utf-8")).hexdigest()
+
+
+class DepozitRezumate:
+    """Condensed knowledge digests stored as one JSON file per source-content key."""
+
+    def __init__(self, director: Path) -> None:
+        self.director = Path(director)
+        # cheie -> (rezumat sau None, momentul citirii)
+        self._cache: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _cale(self, cheie: str) -> Path:
+        return self.director / f"{cheie}.json"
+
+    def obtine(self, cheie: str) -> Optional[str]:
+        with self._lock:
+            intrare = self._cache.get(cheie)
+        if intrare is not None:
+            rezumat, moment = intrare
+            # Lipsa unui rezumat se reverifica periodic: il poate genera alt proces
+            if rezumat is not None or time.monotonic() - moment < _TTL_REZUMAT_LIPSA:
+                return rezumat
+        rezumat = None
+        cale = self._cale(cheie)
+        if cale.exists():
+            try:
+                rezumat = json.loads(cale.read_text(encoding="utf-8")).get("rezumat") or None
+            except Exception as exc:
+                logger.warning("Rezumatul %s nu a putut fi citit: %s", cale.name, exc)
+        with self._lock:
+            self._cache[cheie] = (rezumat, time.monotonic())
+        return rezumat
+
+    def salveaza(self, cheie: str, rezumat: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        self.director.mkdir(parents=True, exist_ok=True)
+        payload = {"rezumat": rezumat, "generat": time.strftime("%Y-%m-%d %H:%M:%S"), **(meta or {})}
+        cale = self._cale(cheie)
+        tmp_path = cale.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, cale)
+        with self._lock:
+            self._cache[cheie] = (rezumat, time.monotonic())
+
+
+class ConstructorRezumate:
+    """Offline builder that condenses teacher and director materials into compact digests.
+
+    Digests are keyed by the content hashes of the sources, so identical
+    materials shared by several classes or schools cost one LLM call, and a
+    digest is only regenerated when the underlying files change.
+    """
+
+    def __init__(self, gestor_materiale, ai_client=None) -> None:
+        self.gestor_materiale = gestor_materiale
+        self.depozit = gestor_materiale.depozit_rezumate
+        if ai_client is None:
+            from ai_clients import ai_client_manager
+
+            ai_client = ai_client_manager
+        self.ai_client = ai_client
+
+    def _text_sursa(self, referinte: List[Tuple[str, str]]) -> str:
+        parti = []
+        for nume, sha in referinte:
+            fragment = self.gestor_materiale.citeste_fragment(sha, _MAX_SURSA_PER_MATERIAL)
+            if fragment:
+                parti.append(f"Din {nume}:\n{fragment}")
+        return "\n\n".join(parti)[:_MAX_SURSA_TOTALA]
+
+    def _genereaza(self, cheie: str, referinte: List[Tuple[str, str]], descriere: str, subject: str) -> bool:
+        text_sursa = self._text_sursa(referinte)
+        if not text_sursa:
+            return False
+        prompt = (
+            f"Condenseaza materialele de mai jos intr-un rezumat compact pentru {descriere}.\n"
+            "Pastreaza conceptele cheie, definitiile, exemplele si metodele didactice recomandate.\n"
+            "Scrie in romana, maxim 250 de cuvinte, fara introducere sau concluzie.\n\n"
+            f"{text_sursa}"
+        )
+        try:
+            response = self.ai_client.get_ai_response(
+                prompt=prompt,
+                subject=subject,
+                user_id="rezumate",
+                is_free_tier=False,
+                max_tokens=_MAX_TOKENI_REZUMAT,
+                temperature=0.2,
+            )
+        except Exception as exc:
+            logger.warning("Rezumatul pentru %s nu a putut fi generat: %s", descriere, exc)
+            return False
+        rezumat = (response or {}).get("content", "").strip()
+        if not rezumat:
+            return False
+        self.depozit.salveaza(cheie, rezumat, {"surse": [nume for nume, _ in referinte], "descriere": descriere})
+        logger.info("Rezumat generat pentru %s (%d caractere)", descriere, len(rezumat))
+        return True
+
+    def construieste_pentru_profesor(self, profesor, forteaza: bool = False) -> bool:
+        """Build the digest for one teacher if it is missing; returns True when an LLM call was made."""
+        cheie = profesor.cheie_rezumat
+        if cheie is None or (not forteaza and self.depozit.obtine(cheie)):
+            return False
+        descriere = f"profesorul {profesor.nume} ({profesor.materie})"
+        return self._genereaza(cheie, profesor.referinte_materiale, descriere, profesor.materie)
+
+    def construieste_pentru_director(self, director, forteaza: bool = False) -> bool:
+        cheie = director.cheie_rezumat
+        if cheie is None or (not forteaza and self.depozit.obtine(cheie)):
+            return False
+        descriere = f"directorul {director.nume} (pedagogie si psihologia copilului)"
+        return self._genereaza(cheie, director.referinte_materiale, descriere, "Pedagogie")
+
+    def construieste_toate(self, scoli: Iterable[Any], forteaza: bool = False) -> Dict[str, int]:
+        """Build every missing digest for the given schools; shared keys are generated once."""
+        statistici = {"generate": 0, "existente": 0, "esuate": 0, "fara_materiale": 0}
+        vazute = set()
+        for scoala in scoli:
+            participanti = [p for clasa in scoala.clase.values() for p in clasa.profesori.values()]
+            participanti.extend(scoala.directori)
+            for participant in participanti:
+                cheie = participant.cheie_rezumat
+                if cheie is None:
+                    statistici["fara_materiale"] += 1
+                    continue
+                if cheie in vazute:
+                    continue
+                vazute.add(cheie)
+                if hasattr(participant, "materie"):
+                    generat = self.construieste_pentru_profesor(participant, forteaza)
+                else:
+                    generat = self.construieste_pentru_director(participant, forteaza)
+                if generat:
+                    statistici["generate"] += 1
+                elif self.depozit.obtine(cheie):
+                    statistici["existente"] += 1
+                else:
+                    statistici["esuate"] += 1
+        logger.info("Rezumate: %s", statistici)
+        return statistici
@@ -0,0 +1,155 @@
+import logging
+import math
+import random
+import threading
+import unicodedata
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Dimensiunea spatiului de trasaturi (hashing trick), putere a lui 2
+_DIMENSIUNE_HASH = 1 << 18
+_LUNGIMI_NGRAME = (3, 4)
+_EPOCI = 8
+_RATA_INVATARE = 1.0
+_REGULARIZARE = 1e-4
+# Exemplele sintetice (tabelele de cuvinte cheie) cantaresc mai putin decat deciziile reale
+_PONDERE_SEMINTE = 1.0
+_EXEMPLE_SEMINTE_PER_PROFESOR = 8
+# Cuvinte de legatura care apar in intrebari de la orice materie
+_CUVINTE_IGNORATE = frozenset(
+    "a al ale am ar are as asa au avem aveti ca care ce cel cea cei cele cu cum da dar de despre "
+    "din dintr e este eu fi la le lui ma mai mi mie nu o pe pentru poti prin sa se si sunt "
+    "te tu un una unde unei unui va vreau".split()
+)
+
+
+def normalizeaza_intrebare(text: str) -> str:
+    """Lowercase, strip diacritics and replace punctuation with spaces (words are kept in order)."""
+    fara_diacritice = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c if c.isalnum() else " " for c in fara_diacritice if not unicodedata.combining(c))
+
+
+def trasaturi(text: str) -> Dict[int, float]:
+    """Hashed word unigrams and in-word character n-grams, L2-normalised.
+
+    ``zlib.crc32`` is used instead of ``hash()`` so feature ids are stable
+    across processes and interpreter runs.
+    """
+    valori: Dict[int, float] = defaultdict(float)
+    for cuvant in normalizeaza_intrebare(text).split():
+        if cuvant in _CUVINTE_IGNORATE:
+            continue
+        valori[zlib.crc32(f"w:{cuvant}".encode("utf-8")) % _DIMENSIUNE_HASH] += 1.0
+        cuvant_marcat = f" {cuvant} "
+        for n in _LUNGIMI_NGRAME:
+            for start in range(len(cuvant_marcat) - n + 1):
+                ngrama = cuvant_marcat[start : start + n]
+                valori[zlib.crc32(f"c:{ngrama}".encode("utf-8")) % _DIMENSIUNE_HASH] += 1.0
+    norma = math.sqrt(sum(v * v for v in valori.values()))
+    return {cheie: v / norma for cheie, v in valori.items()} if norma else {}
+
+
+def _softmax(scoruri: Mapping[str, float]) -> Dict[str, float]:
+    if not scoruri:
+        return {}
+    maxim = max(scoruri.values())
+    exponentiale = {eticheta: math.exp(scor - maxim) for eticheta, scor in scoruri.items()}
+    total = sum(exponentiale.values())
+    return {eticheta: valoare / total for eticheta, valoare in exponentiale.items()}
+
+
+def _scor(ponderi: Mapping[int, float], x: Mapping[int, float]) -> float:
+    return sum(ponderi.get(f, 0.0) * v for f, v in x.items())
+
+
+class RouterLocal:
+    """Multinomial logistic regression over hashed n-grams that maps a question to a teacher name.
+
+    There is no bias term, so the label frequency in the logs does not pull
+    unrelated questions towards the most popular teacher. The model is small
+    enough to train in-process in well under a second from the keyword
+    tables and the logged routing decisions, and prediction is a few sparse
+    dot products, so most questions never need the director LLM call.
+    ``antreneaza`` builds the new weights aside and swaps them in under the
+    lock, so ``prezice`` can run while a retraining is in progress.
+    """
+
+    def __init__(self, seed: int = 13) -> None:
+        self._ponderi: Dict[str, Dict[int, float]] = {}
+        self._seed = seed
+        self._lock = threading.Lock()
+        self.exemple_antrenare = 0
+
+    @property
+    def antrenat(self) -> bool:
+        return bool(self._ponderi)
+
+    @property
+    def etichete(self) -> List[str]:
+        return list(self._ponderi)
+
+    def antreneaza(self, exemple: Sequence[Tuple[str, str, float]]) -> None:
+        """Fit on ``(text, eticheta, pondere)`` triples; replaces any previous model."""
+        date = [(trasaturi(text), eticheta, pondere) for text, eticheta, pondere in exemple if text and eticheta]
+        date = [(x, eticheta, pondere) for x, eticheta, pondere in date if x]
+        etichete = sorted({eticheta for _, eticheta, _ in date})
+        ponderi: Dict[str, Dict[int, float]] = {eticheta: defaultdict(float) for eticheta in etichete}
+        generator = random.Random(self._seed)
+        for epoca in range(_EPOCI if len(etichete) > 1 else 0):
+            generator.shuffle(date)
+            rata = _RATA_INVATARE / (1 + epoca * 0.5)
+            for x, eticheta, pondere in date:
+                probabilitati = _softmax({e: _scor(ponderi[e], x) for e in etichete})
+                for e in etichete:
+                    gradient = (probabilitati[e] - (1.0 if e == eticheta else 0.0)) * pondere * rata
+                    if abs(gradient) < 1e-6:
+                        continue
+                    w = ponderi[e]
+                    for f, v in x.items():
+                        w[f] -= gradient * v + rata * _REGULARIZARE * w[f]
+        with self._lock:
+            self._ponderi = {e: dict(w) for e, w in ponderi.items()}
+            self.exemple_antrenare = len(date)
+        logger.info("Router local antrenat: %d exemple, %d etichete", len(date), len(etichete))
+
+    def prezice(self, text: str, candidati: Optional[Iterable[str]] = None) -> Tuple[Optional[str], float]:
+        """Best label among ``candidati`` (all known labels by default) and its probability.
+
+        Probabilities are renormalised over the candidates that the model
+        knows, so a class with fewer teachers still yields calibrated scores.
+        """
+        with self._lock:
+            ponderi = self._ponderi
+        etichete = [e for e in (candidati if candidati is not None else ponderi) if e in ponderi]
+        if len(etichete) < 2:
+            return (etichete[0], 1.0) if etichete else (None, 0.0)
+        x = trasaturi(text)
+        if not x:
+            return None, 0.0
+        probabilitati = _softmax({e: _scor(ponderi[e], x) for e in etichete})
+        eticheta = max(probabilitati, key=probabilitati.get)
+        return eticheta, probabilitati[eticheta]
+
+
+def exemple_din_cuvinte_cheie(
+    profesori: Iterable[Tuple[str, str]], domenii: Mapping[str, Iterable[str]]
+) -> List[Tuple[str, str, float]]:
+    """Seed examples from ``(nume, materie)`` pairs and the director's keyword table.
+
+    Every teacher gets its subject name and each keyword of the domains the
+    subject belongs to, using the same domain match as the keyword fallback.
+    """
+    exemple: List[Tuple[str, str, float]] = []
+    for nume, materie in profesori:
+        materie_lower = materie.lower()
+        texte = [materie.replace("_", " ")]
+        for domeniu, cuvinte in domenii.items():
+            if domeniu in materie_lower or any(part in materie_lower for part in domeniu.split("_")):
+                texte.extend(cuvant for cuvant in cuvinte if cuvant not in texte)
+        # Aceeasi masa totala per profesor, ca sa nu fie favorizate materiile cu multe cuvinte cheie
+        pondere = _PONDERE_SEMINTE * _EXEMPLE_SEMINTE_PER_PROFESOR / len(texte)
+        exemple.extend((text, nume, pondere) for text in texte)
+    return exemple
@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy este optional; fara el directorul puncteaza intrebarile pe rand
+    np = None
+
+from .potrivire_cuvinte import AutomatCuvinteCheie
+
+logger = logging.getLogger(__name__)
+
+# Punctajele scorarii prin cuvinte cheie, aceleasi ca in Director._scoruri_fallback
+_PUNCTE_MATERIE = 8
+_PUNCTE_CUVANT = 2
+_MAXIM_SEMANTIC = 5
+_PUNCTE_CLASA = 3
+_PUNCTE_MATERIALE = 2
+_PUNCTE_ISTORIC = 1
+
+
+def numpy_disponibil() -> bool:
+    return np is not None
+
+
+class ScorareVectoriala:
+    """Keyword fallback scores for a batch of questions, computed with NumPy.
+
+    The teacher side is precomputed once: which domains each subject
+    belongs to and the per-teacher class/material bonuses. A batch of
+    questions becomes a sparse 0/1 question x keyword matrix; multiplied by
+    the keyword x domain matrix it gives the distinct keyword hits per
+    domain, from which each teacher takes its first matching domain, like
+    the sequential scorer. Totals, breakdowns and the order of ties are
+    identical to ``Director._scoruri_fallback``.
+    """
+
+    def __init__(
+        self,
+        profesori: Sequence[Any],
+        clasa_tinta: int,
+        domenii: Mapping[str, Iterable[str]],
+        automat: AutomatCuvinteCheie,
+    ) -> None:
+        if np is None:
+            raise ImportError("ScorareVectoriala necesita numpy")
+        self.profesori = list(profesori)
+        self._automat = automat
+        nume_domenii = list(domenii)
+        cuvinte = sorted({cuvant.lower() for lista in domenii.values() for cuvant in lista if cuvant})
+        self._index_cuvinte = {cuvant: i for i, cuvant in enumerate(cuvinte)}
+
+        self._cuvinte_domenii = np.zeros((len(cuvinte), len(nume_domenii)), dtype=np.int64)
+        for j, domeniu in enumerate(nume_domenii):
+            for cuvant in domenii[domeniu]:
+                if cuvant:
+                    self._cuvinte_domenii[self._index_cuvinte[cuvant.lower()], j] = 1
+
+        self._materii = [getattr(profesor, "materie", "").lower() for profesor in self.profesori]
+        self._domenii_profesori = np.array(
+            [
+                [
+                    bool(materie)
+                    and (domeniu in materie or any(part in materie for part in domeniu.split("_")))
+                    for domeniu in nume_domenii
+                ]
+                for materie in self._materii
+            ],
+            dtype=bool,
+        ).reshape(len(self.profesori), len(nume_domenii))
+        self._clasa = np.array(
+            [_PUNCTE_CLASA if getattr(profesor, "clasa", None) == clasa_tinta else 0 for profesor in self.profesori],
+            dtype=np.int64,
+        )
+        self._materiale = np.array(
+            [_PUNCTE_MATERIALE if getattr(profesor, "are_materiale", False) else 0 for profesor in self.profesori],
+            dtype=np.int64,
+        )
+
+    def _matrice_cuvinte(self, intrebari_lower: Sequence[str]):
+        """0/1 question x keyword matrix (distinct keywords found in each question)."""
+        matrice = np.zeros((len(intrebari_lower), len(self._index_cuvinte)), dtype=np.int64)
+        for i, intrebare in enumerate(intrebari_lower):
+            for cuvant in self._automat.cuvinte_prezente(intrebare):
+                matrice[i, self._index_cuvinte[cuvant]] = 1
+        return matrice
+
+    def componente(self, intrebari: Sequence[str], alesi_recent: Iterable[str] = ()) -> Dict[str, Any]:
+        """Per-criterion score matrices of shape (questions, teachers)."""
+        intrebari_lower = [intrebare.lower() for intrebare in intrebari]
+        lovituri = self._matrice_cuvinte(intrebari_lower) @ self._cuvinte_domenii
+        candidati = np.where(self._domenii_profesori[None, :, :], lovituri[:, None, :], 0)
+        primul = (candidati > 0).argmax(axis=2)
+        potriviri = np.take_along_axis(candidati, primul[..., None], axis=2)[..., 0]
+
+        materie = np.array(
+            [
+                [
+                    _PUNCTE_MATERIE if materie and (materie in intrebare or intrebare in materie) else 0
+                    for materie in self._materii
+                ]
+                for intrebare in intrebari_lower
+            ],
+            dtype=np.int64,
+        ).reshape(len(intrebari_lower), len(self.profesori))
+        alesi = set(alesi_recent)
+        istoric = np.array(
+            [_PUNCTE_ISTORIC if getattr(profesor, "nume", "") in alesi else 0 for profesor in self.profesori],
+            dtype=np.int64,
+        )
+        forma = materie.shape
+        return {
+            "materie_exacta": materie,
+            "semantica": np.minimum(_MAXIM_SEMANTIC, potriviri * _PUNCTE_CUVANT),
+            "clasa": np.broadcast_to(self._clasa, forma),
+            "materiale": np.broadcast_to(self._materiale, forma),
+            "istoric": np.broadcast_to(istoric, forma),
+        }
+
+    def totaluri(self, intrebari: Sequence[str], alesi_recent: Iterable[str] = ()):
+        """Total score matrix of shape (questions, teachers)."""
+        return sum(self.componente(intrebari, alesi_recent).values())
+
+    def clasamente(self, intrebari: Sequence[str], alesi_recent: Iterable[str] = ()) -> List[List[Dict[str, Any]]]:
+        """For every question, the same ranked list of score dicts as ``Director._scoruri_fallback``."""
+        if not self.profesori:
+            return [[] for _ in intrebari]
+        componente = self.componente(intrebari, alesi_recent)
+        totaluri = sum(componente.values())
+        ordine = np.argsort(-totaluri, axis=1, kind="stable")
+        rezultat = []
+        for i, rand in enumerate(ordine):
+            scoruri = []
+            for j in rand:
+                breakdown = {
+                    criteriu: int(valori[i, j]) for criteriu, valori in componente.items() if valori[i, j]
+                }
+                scoruri.append({"total": int(totaluri[i, j]), "breakdown": breakdown, "profesor": self.profesori[j]})
+            rezultat.append(scoruri)
+        return rezultat
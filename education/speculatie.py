@@ -0,0 +1,127 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from config import Config, token_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class RutareSpeculativa:
+    """Start the answer of the keyword-predicted teacher while the director LLM decides.
+
+    When the director agrees, the speculative answer is used as is and the
+    routing latency is hidden. When it disagrees, the speculative answer is
+    discarded without touching the conversation history; its tokens are
+    refunded from the student's quota, but stay in the daily totals and cost
+    log since they were really spent. The chosen teacher's call starts at
+    once; a speculative call that already finished is refunded before it, one
+    still running is refunded when it ends.
+    Questions routed by the cache or the local router are answered directly,
+    as there is no LLM latency to hide.
+    """
+
+    def __init__(self, max_workeri: int = 4) -> None:
+        self.max_workeri = max_workeri
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._statistici = {"fara_speculatie": 0, "acorduri": 0, "dezacorduri": 0, "tokeni_irositi": 0}
+
+    def _executor_activ(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workeri, thread_name_prefix="speculativ")
+            return self._executor
+
+    def _numara(self, cheie: str, valoare: int = 1) -> None:
+        with self._lock:
+            self._statistici[cheie] += valoare
+
+    def raspunde(
+        self,
+        director,
+        intrebare: str,
+        clasa: int,
+        user_id: str = "default",
+        is_free_tier: bool = True,
+        termen=None,
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """Route and answer the question; returns ``(profesor, raspuns)`` or ``(None, None)``."""
+        profesor = director.alege_profesor_fara_llm(intrebare, clasa)
+        ghicit = director.ghiceste_profesor(intrebare, clasa) if profesor is None else None
+        if ghicit is None or (is_free_tier and not Config.FREE_TIER_ENABLED):
+            if profesor is None:
+                profesor = director.alege_profesor_cu_llm(intrebare, clasa, termen)
+            self._numara("fara_speculatie")
+            if profesor is None:
+                return None, None
+            return profesor, profesor.raspunde_intrebare(
+                intrebare, user_id=user_id, is_free_tier=is_free_tier, termen=termen
+            )
+
+        viitor = self._executor_activ().submit(
+            ghicit.genereaza_raspuns, intrebare, user_id, is_free_tier, termen=termen
+        )
+        try:
+            ales = director.alege_profesor_cu_llm(intrebare, clasa, termen)
+        except Exception:
+            viitor.add_done_callback(lambda f: self._arunca(f, user_id, is_free_tier))
+            raise
+
+        if ales is not None and ales.nume == ghicit.nume:
+            self._numara("acorduri")
+            try:
+                result = viitor.result()
+            except Exception as exc:
+                logger.warning("Raspunsul speculativ a esuat, se reia secvential: %s", exc)
+                return ales, ales.raspunde_intrebare(
+                    intrebare, user_id=user_id, is_free_tier=is_free_tier, termen=termen
+                )
+            ales.inregistreaza_conversatie(intrebare, user_id, result)
+            return ales, result["content"]
+
+        self._numara("dezacorduri")
+        logger.info(
+            "Speculatie respinsa: ghicit %s, ales %s", ghicit.nume, getattr(ales, "nume", None)
+        )
+        self._renunta(viitor, user_id, is_free_tier)
+        if ales is None:
+            return None, None
+        return ales, ales.raspunde_intrebare(intrebare, user_id=user_id, is_free_tier=is_free_tier, termen=termen)
+
+    def _renunta(self, viitor: Future, user_id: str, is_free_tier: bool) -> None:
+        """Drop the rejected speculative call without waiting for it.
+
+        A call that already finished has already been charged, so its refund
+        runs right here, before the winner's quota check. A call still running
+        has not been charged yet; it is refunded from its done-callback.
+        """
+        if viitor.cancel():
+            return
+        viitor.add_done_callback(lambda f: self._arunca(f, user_id, is_free_tier))
+
+    def _arunca(self, viitor: Future, user_id: str, is_free_tier: bool) -> None:
+        if viitor.cancelled() or viitor.exception() is not None:
+            return
+        result = viitor.result()
+        if result.get("from_cache"):
+            return
+        tokeni = int(result.get("tokens_used") or 0)
+        self._numara("tokeni_irositi", tokeni)
+        if is_free_tier:
+            token_monitor.refund_tokens(user_id, tokeni)
+
+    def statistici(self) -> Dict[str, Any]:
+        with self._lock:
+            statistici = dict(self._statistici)
+        speculatii = statistici["acorduri"] + statistici["dezacorduri"]
+        statistici["speculatii"] = speculatii
+        statistici["rata_acord"] = round(statistici["acorduri"] / speculatii * 100, 2) if speculatii else 0
+        return statistici
+
+
+def get_rutare_speculativa() -> RutareSpeculativa:
+    if not hasattr(get_rutare_speculativa, "_instance"):
+        get_rutare_speculativa._instance = RutareSpeculativa(Config.RASPUNS_SPECULATIV_WORKERI)
+    return get_rutare_speculativa._instance
@@ -2,6 +2,9 @@ import os
 from dotenv import load_dotenv
 import time
 import json
+import hashlib
+import tempfile
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional
 import logging
@@ -11,6 +14,8 @@ from ai_clients import ai_client_manager
 from education import (
     GestorMateriale,
     ConfigurariProfesor,
+    ConstructorRezumate,
+    CunostinteProfesor,
     Director,
     Profesor,
     get_gestor_materiale,
@@ -29,6 +34,10 @@ logger = logging.getLogger(__name__)
 # Încarcă variabilele din fișierul .env
 load_dotenv()
 
+# Crește la schimbarea formatului instantaneului structurii școlilor
+VERSIUNE_INSTANTANEU = 2
+_INSTANTANEU_FILENAME = ".instantaneu_scoli.json"
+
 class ClasaEducationala:
     """
     Reprezintă o clasă educațională cu toți profesorii săi
@@ -94,320 +103,557 @@ class Scoala:
             for materie, profesor in clasa.profesori.items():
                 print(f"  {materie}: {profesor.nume} ({profesor.configurari.model})")
 
+# Configurările sunt imutabile după creare, așa că tabelul e construit o singură dată
+# și aceleași instanțe sunt partajate de toți profesorii unei materii
+CONFIGURARI_PER_MATERIE = {
+    # Materii care necesită creativitate și interacțiune complexă
+    "Comunicare_in_Limba_Romana": ConfigurariProfesor(
+        temperature=0.9,
+        model="gpt-5",
+        personalitate="prietenos",
+        stil_predare="narativ si interactiv",
+        tehnici_speciale=["storytelling", "metafore"],
+        max_tokens=2584
+    ),
+    "Limba_si_Literatura_Romana": ConfigurariProfesor(
+        temperature=0.9,
+        model="gpt-5",
+        personalitate="creativ",
+        stil_predare="poetic si expresiv",
+        tehnici_speciale=["poezie", "interpretare"],
+        max_tokens=2584
+    ),
+    "Matematica_si_Explorarea_mediului": ConfigurariProfesor(
+        temperature=0.9,
+        model="claude-sonnet-4-5-20250929",
+        personalitate="creativ",
+        stil_predare="poetic si expresiv",
+        tehnici_speciale=["poezie", "interpretare"],
+        max_tokens=1597
+    ),
+    "Matematica": ConfigurariProfesor(
+        temperature=0.4,
+        model="claude-sonnet-4-5-20250929",
+        personalitate="serios",
+        stil_predare="precis si analitic",
+        tehnici_speciale=["rezolvare probleme", "rationament matematic"],
+        max_tokens=1597
+    ),
+    "Limba_moderna_Engleza": ConfigurariProfesor(
+        temperature=0.8,
+        model="gpt-5",
+        personalitate="prietenos",
+        stil_predare="conversational si interactiv",
+        tehnici_speciale=["dialoguri", "jocuri de rol"],
+        max_tokens=987
+    ),
+    "Limba_moderna": ConfigurariProfesor(
+        temperature=0.8,
+        model="gpt-5",
+        personalitate="empatic",
+        stil_predare="contextual si practic",
+        tehnici_speciale=["scenarii reale", "activitati interactive"],
+        max_tokens=987
+    ),
+    "Educatie_fizica": ConfigurariProfesor(
+        temperature=0.6,
+        model="gpt-5-nano",
+        personalitate="energic",
+        stil_predare="dinamic si motivational",
+        tehnici_speciale=["motivare pozitiva", "competitie sanatoasa"],
+        max_tokens=987
+    ),
+    "Arte_vizuale": ConfigurariProfesor(
+        temperature=0.8,
+        model="gpt-5",
+        personalitate="creativ",
+        stil_predare="vizual si experimental",
+        tehnici_speciale=["desen intuitiv", "gandire vizuala"],
+        max_tokens=1597
+    ),      
+    "Dezvoltare_personala": ConfigurariProfesor(
+        temperature=0.7,
+        model="gpt-5",
+        personalitate="calm",
+        stil_predare="reflectiv si empatic",
+        tehnici_speciale=["intrebari socratice", "exercitii mindfulness"],
+        max_tokens=2584
+    ),
+    "Religie": ConfigurariProfesor(
+        temperature=0.5,
+        model="gpt-5",
+        personalitate="calm",
+        stil_predare="reflectiv si etic",
+        tehnici_speciale=["pilde", "discutii morale"],
+        max_tokens=987
+    ),
+    "Joc_si_Miscare": ConfigurariProfesor(
+        temperature=0.8,
+        model="gpt-5",
+        personalitate="energic",
+        stil_predare="auditiv si kinestezic",
+        tehnici_speciale=["ritm", "exercitii vocale"],
+        max_tokens=987
+    ),
+    "Muzica_si_Miscare": ConfigurariProfesor(
+        temperature=0.9,
+        model="gpt-5",
+        personalitate="energic",
+        stil_predare="ritmic si kinestezic",
+        tehnici_speciale=["dans", "coordonare ritmica"],
+        max_tokens=1597
+    ),
+    "Teorie_Solfegiu_Dicteu": ConfigurariProfesor(
+        temperature=0.6,
+        model="gpt-5",
+        personalitate="serios",
+        stil_predare="analitic si auditiv",
+        tehnici_speciale=["solfegiere", "analiza armonica"],
+        max_tokens=1597
+    ),                
+    "Educatie_civica": ConfigurariProfesor(
+        temperature=0.5,
+        model="gpt-5",
+        personalitate="serios",
+        stil_predare="logic si structurat",
+        tehnici_speciale=["algoritmi", "gandire computationala"],
+        max_tokens=987
+    ),
+    "Stiinte_ale_naturii": ConfigurariProfesor(
+        temperature=0.6,
+        model="claude-sonnet-4-5-20250929",
+        personalitate="curios",
+        stil_predare="investigativ si experimental",
+        tehnici_speciale=["experimente practice", "descoperire stiintifica"],
+        max_tokens=1597
+    ),  
+    "Istorie": ConfigurariProfesor(
+        temperature=0.7,
+        model="gpt-5",
+        personalitate="prietenos",
+        stil_predare="narativ si captivant",
+        tehnici_speciale=["calatorii virtuale", "istorisiri"],
+        max_tokens=2584
+    ),      
+    "Georgrafie": ConfigurariProfesor(
+        temperature=0.7,
+        model="gpt-5",
+        personalitate="explorator",
+        stil_predare="documentarist si analitic",
+        tehnici_speciale=["calatorii virtuale", "gandire vizuala"],
+        max_tokens=2584
+    )    
+}
+
+# Configurări default dacă materia nu e specificată
+CONFIGURARE_IMPLICITA = ConfigurariProfesor(temperature=0.7, model="gpt-5", personalitate="prietenos")
+
 def creeaza_configurari_profesor(materie, clasa):
     """
-    Funcție helper pentru a crea configurări specifice fiecărei materii și clase
-    """     
-    configurari_per_materie = {
-        # Materii care necesită creativitate și interacțiune complexă
-        "Comunicare_in_Limba_Romana": ConfigurariProfesor(
-            temperature=0.9,
-            model="gpt-5",
-            personalitate="prietenos",
-            stil_predare="narativ si interactiv",
-            tehnici_speciale=["storytelling", "metafore"],
-            max_tokens=2584
-        ),
-        "Limba_si_Literatura_Romana": ConfigurariProfesor(
-            temperature=0.9,
-            model="gpt-5",
-            personalitate="creativ",
-            stil_predare="poetic si expresiv",
-            tehnici_speciale=["poezie", "interpretare"],
-            max_tokens=2584
-        ),
-        "Matematica_si_Explorarea_mediului": ConfigurariProfesor(
-            temperature=0.9,
-            model="claude-sonnet-4-5-20250929",
-            personalitate="creativ",
-            stil_predare="poetic si expresiv",
-            tehnici_speciale=["poezie", "interpretare"],
-            max_tokens=1597
-        ),
-        "Matematica": ConfigurariProfesor(
-            temperature=0.4,
-            model="claude-sonnet-4-5-20250929",
-            personalitate="serios",
-            stil_predare="precis si analitic",
-            tehnici_speciale=["rezolvare probleme", "rationament matematic"],
-            max_tokens=1597
-        ),
-        "Limba_moderna_Engleza": ConfigurariProfesor(
-            temperature=0.8,
-            model="gpt-5",
-            personalitate="prietenos",
-            stil_predare="conversational si interactiv",
-            tehnici_speciale=["dialoguri", "jocuri de rol"],
-            max_tokens=987
-        ),
-        "Limba_moderna": ConfigurariProfesor(
-            temperature=0.8,
-            model="gpt-5",
-            personalitate="empatic",
-            stil_predare="contextual si practic",
-            tehnici_speciale=["scenarii reale", "activitati interactive"],
-            max_tokens=987
-        ),
-        "Educatie_fizica": ConfigurariProfesor(
-            temperature=0.6,
-            model="gpt-5-nano",
-            personalitate="energic",
-            stil_predare="dinamic si motivational",
-            tehnici_speciale=["motivare pozitiva", "competitie sanatoasa"],
-            max_tokens=987
-        ),
-        "Arte_vizuale": ConfigurariProfesor(
-            temperature=0.8,
-            model="gpt-5",
-            personalitate="creativ",
-            stil_predare="vizual si experimental",
-            tehnici_speciale=["desen intuitiv", "gandire vizuala"],
-            max_tokens=1597
-        ),      
-        "Dezvoltare_personala": ConfigurariProfesor(
-            temperature=0.7,
-            model="gpt-5",
-            personalitate="calm",
-            stil_predare="reflectiv si empatic",
-            tehnici_speciale=["intrebari socratice", "exercitii mindfulness"],
-            max_tokens=2584
-        ),
-        "Religie": ConfigurariProfesor(
-            temperature=0.5,
-            model="gpt-5",
-            personalitate="calm",
-            stil_predare="reflectiv si etic",
-            tehnici_speciale=["pilde", "discutii morale"],
-            max_tokens=987
-        ),
-        "Joc_si_Miscare": ConfigurariProfesor(
-            temperature=0.8,
-            model="gpt-5",
-            personalitate="energic",
-            stil_predare="auditiv si kinestezic",
-            tehnici_speciale=["ritm", "exercitii vocale"],
-            max_tokens=987
-        ),
-        "Muzica_si_Miscare": ConfigurariProfesor(
-            temperature=0.9,
-            model="gpt-5",
-            personalitate="energic",
-            stil_predare="ritmic si kinestezic",
-            tehnici_speciale=["dans", "coordonare ritmica"],
-            max_tokens=1597
-        ),
-        "Teorie_Solfegiu_Dicteu": ConfigurariProfesor(
-            temperature=0.6,
-            model="gpt-5",
-            personalitate="serios",
-            stil_predare="analitic si auditiv",
-            tehnici_speciale=["solfegiere", "analiza armonica"],
-            max_tokens=1597
-        ),                
-        "Educatie_civica": ConfigurariProfesor(
-            temperature=0.5,
-            model="gpt-5",
-            personalitate="serios",
-            stil_predare="logic si structurat",
-            tehnici_speciale=["algoritmi", "gandire computationala"],
-            max_tokens=987
-        ),
-        "Stiinte_ale_naturii": ConfigurariProfesor(
-            temperature=0.6,
-            model="claude-sonnet-4-5-20250929",
-            personalitate="curios",
-            stil_predare="investigativ si experimental",
-            tehnici_speciale=["experimente practice", "descoperire stiintifica"],
-            max_tokens=1597
-        ),  
-        "Istorie": ConfigurariProfesor(
-            temperature=0.7,
-            model="gpt-5",
-            personalitate="prietenos",
-            stil_predare="narativ si captivant",
-            tehnici_speciale=["calatorii virtuale", "istorisiri"],
-            max_tokens=2584
-        ),      
-        "Georgrafie": ConfigurariProfesor(
-            temperature=0.7,
-            model="gpt-5",
-            personalitate="explorator",
-            stil_predare="documentarist si analitic",
-            tehnici_speciale=["calatorii virtuale", "gandire vizuala"],
-            max_tokens=2584
-        )    
-    }   
-
-    # Configurări default dacă materia nu e specificată
-    return configurari_per_materie.get(
-        materie, 
-        ConfigurariProfesor(temperature=0.7, model="gpt-5", personalitate="prietenos")
+    Funcție helper pentru a obține configurările specifice fiecărei materii și clase
+    """
+    return CONFIGURARI_PER_MATERIE.get(materie, CONFIGURARE_IMPLICITA)
+
+# Materiile și profesorii pentru fiecare clasă și tip de școală
+MATERII_PER_CLASA = {
+    0: {  # Pregătitoare
+        "normala": [
+            ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
+            ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Dezvoltare_personala", "Prof_Carl_Jung"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ],
+        "muzica": [
+            ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
+            ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Dezvoltare_personala", "Prof_Carl_Jung"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ]
+    },
+    1: {  # Clasa I
+        "normala": [
+            ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
+            ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Dezvoltare_personala", "Prof_Carl_Jung"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ],
+        "muzica": [
+            ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
+            ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Dezvoltare_personala", "Prof_Carl_Jung"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ]
+    },
+    2: {  # Clasa a II-a
+        "normala": [
+            ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
+            ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
+            ("Limba_moderna", "Prof_Charles_Dickens"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Dezvoltare_personala", "Prof_Carl_Jung"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ],
+        "muzica": [
+            ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
+            ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Dezvoltare_personala", "Prof_Carl_Jung"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ]
+    },
+    3: {  # Clasa a III-a
+        "normala": [
+            ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
+            ("Matematica", "Prof_Euclid"),
+            ("Limba_moderna", "Prof_Charles_Dickens"),
+            ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_civica", "Prof_Malala_Yousafzai"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Joc_si_Miscare", "Prof_Bruce_Lee"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ],
+        "muzica": [
+            ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
+            ("Matematica", "Prof_Euclid"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_civica", "Prof_Malala_Yousafzai"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Joc_si_Miscare", "Prof_Bruce_Lee"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ]
+    },
+    4: {  # Clasa a IV-a
+        "normala": [
+            ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
+            ("Matematica", "Prof_Euclid"),
+            ("Limba_moderna", "Prof_Charles_Dickens"),
+            ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
+            ("Istorie", "Prof_Herodot"),
+            ("Geografie", "Prof_Jacques_Yves_Cousteau"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Joc_si_Miscare", "Prof_Bruce_Lee"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ],
+        "muzica": [
+            ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
+            ("Matematica", "Prof_Euclid"),
+            ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
+            ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
+            ("Istorie", "Prof_Herodot"),
+            ("Geografie", "Prof_Jacques_Yves_Cousteau"),
+            ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
+            ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
+            ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
+            ("Educatie_civica", "Prof_Malala_Yousafzai"),
+            ("Educatie_fizica", "Prof_Nadia_Comaneci"),
+            ("Joc_si_Miscare", "Prof_Bruce_Lee"),
+            ("Religie", "Prof_Arsenie_Boca")
+        ]
+    }
+}
+
+# Școlile sistemului: (nume, tip, director)
+SCOLI = (
+    ("Scoala_Normală", "normala", "Prof. Dr. Reuven Feuerstein"),
+    ("Scoala_de_Muzica_George_Enescu", "muzica", "Prof. Dr. Jean Piaget"),
+)
+
+def creeaza_structura_educationala(timpi=None):
+    """
+    Creează structura educațională completă cu ambele școli.
+    Dacă se primește dicționarul `timpi`, în el se adună durata construirii
+    profesorilor și a fiecărui director, în secunde.
+    """
+    if timpi is None:
+        timpi = {}
+    scoli = []
+    for nume_scoala, tip, nume_director in SCOLI:
+        scoala = Scoala(nume_scoala, tip)
+        start = time.perf_counter()
+        for numar_clasa in range(5):  # Clasele 0-4
+            clasa = ClasaEducationala(numar_clasa, scoala.nume)
+            for materie, nume_profesor in MATERII_PER_CLASA[numar_clasa][tip]:
+                configurari = creeaza_configurari_profesor(materie, numar_clasa)
+                profesor = Profesor(nume_profesor, materie, numar_clasa, scoala.nume, configurari)
+                clasa.adauga_profesor(profesor)
+            scoala.adauga_clasa(clasa)
+        timpi[f"{scoala.nume}/profesori"] = time.perf_counter() - start
+
+        # Directorul include încărcarea materialelor și a profilului pedagogic
+        start = time.perf_counter()
+        director = Director(nume_director, scoala)
+        timpi[f"{scoala.nume}/director"] = time.perf_counter() - start
+        scoala.adauga_director(director)
+        scoli.append(scoala)
+
+    scoala_normala, scoala_muzica = scoli
+    return scoala_normala, scoala_muzica
+
+def amprenta_structura():
+    """
+    Amprenta a tot ce determină structura construită: materialele din manifest,
+    tabelul de materii/profesori, școlile și configurările profesorilor.
+    """
+    configurari = {materie: cfg.ca_dict() for materie, cfg in CONFIGURARI_PER_MATERIE.items()}
+    continut = json.dumps(
+        [
+            VERSIUNE_INSTANTANEU,
+            get_gestor_materiale().amprenta_materiale(),
+            MATERII_PER_CLASA,
+            SCOLI,
+            configurari,
+            CONFIGURARE_IMPLICITA.ca_dict(),
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
     )
+    return hashlib.sha256(continut.encode("utf-8")).hexdigest()
+
+def cale_instantaneu_scoli():
+    return get_gestor_materiale().cale_baza / _INSTANTANEU_FILENAME
 
-def creeaza_structura_educationala():
+def salveaza_instantaneu_scoli(scoli, cale=None):
     """
-    Creează structura educațională completă cu ambele școli
+    Salvează structura construită (școli, clase, configurări, referințe materiale,
+    prompturi compilate și profilul directorilor) pentru pornirea rapidă a workerilor.
     """
-    # Creăm școlile
-    scoala_normala = Scoala("Scoala_Normală", "normala")
-    scoala_muzica = Scoala("Scoala_de_Muzica_George_Enescu", "muzica")
-    
-    # Definim materiile pentru fiecare clasă și tip de școală
-    materii_per_clasa = {
-        0: {  # Pregătitoare
-            "normala": [
-                ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
-                ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Dezvoltare_personala", "Prof_Carl_Jung"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ],
-            "muzica": [
-                ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
-                ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Dezvoltare_personala", "Prof_Carl_Jung"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ]
-        },
-        1: {  # Clasa I
-            "normala": [
-                ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
-                ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Dezvoltare_personala", "Prof_Carl_Jung"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ],
-            "muzica": [
-                ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
-                ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Dezvoltare_personala", "Prof_Carl_Jung"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ]
-        },
-        2: {  # Clasa a II-a
-            "normala": [
-                ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
-                ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
-                ("Limba_moderna", "Prof_Charles_Dickens"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Dezvoltare_personala", "Prof_Carl_Jung"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ],
-            "muzica": [
-                ("Comunicare_in_Limba_Romana", "Prof_Ion_Creanga"),
-                ("Matematica_si_Explorarea_mediului", "Prof_Pitagora"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Dezvoltare_personala", "Prof_Carl_Jung"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ]
-        },
-        3: {  # Clasa a III-a
-            "normala": [
-                ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
-                ("Matematica", "Prof_Euclid"),
-                ("Limba_moderna", "Prof_Charles_Dickens"),
-                ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_civica", "Prof_Malala_Yousafzai"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Joc_si_Miscare", "Prof_Bruce_Lee"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ],
-            "muzica": [
-                ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
-                ("Matematica", "Prof_Euclid"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_civica", "Prof_Malala_Yousafzai"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Joc_si_Miscare", "Prof_Bruce_Lee"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ]
-        },
-        4: {  # Clasa a IV-a
-            "normala": [
-                ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
-                ("Matematica", "Prof_Euclid"),
-                ("Limba_moderna", "Prof_Charles_Dickens"),
-                ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
-                ("Istorie", "Prof_Herodot"),
-                ("Geografie", "Prof_Jacques_Yves_Cousteau"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Joc_si_Miscare", "Prof_Bruce_Lee"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ],
-            "muzica": [
-                ("Limba_si_Literatura_Romana", "Prof_Mihai_Eminescu"),
-                ("Matematica", "Prof_Euclid"),
-                ("Limba_moderna_Engleza", "Prof_William_Shakespeare"),
-                ("Stiinte_ale_naturii", "Prof_Albert_Einstein"),
-                ("Istorie", "Prof_Herodot"),
-                ("Geografie", "Prof_Jacques_Yves_Cousteau"),
-                ("Muzica_si_Miscare", "Prof_Antonio_Vivaldi"),
-                ("Teorie_Solfegiu_Dicteu", "Prof_Ennio_Morricone"),
-                ("Arte_vizuale", "Prof_Leonardo_da_Vinci"),
-                ("Educatie_civica", "Prof_Malala_Yousafzai"),
-                ("Educatie_fizica", "Prof_Nadia_Comaneci"),
-                ("Joc_si_Miscare", "Prof_Bruce_Lee"),
-                ("Religie", "Prof_Arsenie_Boca")
-            ]
-        }
+    cale = Path(cale or cale_instantaneu_scoli())
+    configurari = []
+    index_configurari = {}
+    cunostinte = []
+    index_cunostinte = {}
+    date_scoli = []
+    for scoala in scoli:
+        clase = []
+        for numar_clasa, clasa in scoala.clase.items():
+            profesori = []
+            for profesor in clasa.profesori.values():
+                # Configurările și cunoștințele partajate sunt salvate o singură dată
+                if id(profesor.configurari) not in index_configurari:
+                    index_configurari[id(profesor.configurari)] = len(configurari)
+                    configurari.append(profesor.configurari.ca_dict())
+                if id(profesor.cunostinte) not in index_cunostinte:
+                    index_cunostinte[id(profesor.cunostinte)] = len(cunostinte)
+                    cunostinte.append(profesor.cunostinte.ca_dict())
+                date_profesor = profesor.instantaneu()
+                date_profesor["configurari"] = index_configurari[id(profesor.configurari)]
+                date_profesor["cunostinte"] = index_cunostinte[id(profesor.cunostinte)]
+                profesori.append(date_profesor)
+            clase.append({
+                "numar": numar_clasa,
+                "diriginte": clasa.diriginte.nume if clasa.diriginte else None,
+                "profesori": profesori,
+            })
+        date_scoli.append({
+            "nume": scoala.nume,
+            "tip": scoala.tip,
+            "clase": clase,
+            "directori": [director.instantaneu() for director in scoala.directori],
+        })
+    payload = {
+        "versiune": VERSIUNE_INSTANTANEU,
+        "amprenta": amprenta_structura(),
+        "generat": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "configurari": configurari,
+        "cunostinte": cunostinte,
+        "scoli": date_scoli,
     }
-    
-    # Creăm clasele și profesorii pentru ambele școli
-    for numar_clasa in range(5):  # Clasele 0-4
-        # Școala normală
-        clasa_normala = ClasaEducationala(numar_clasa, scoala_normala.nume)
-        for materie, nume_profesor in materii_per_clasa[numar_clasa]["normala"]:
-            configurari = creeaza_configurari_profesor(materie, numar_clasa)
-            profesor = Profesor(nume_profesor, materie, numar_clasa, scoala_normala.nume, configurari)
-            clasa_normala.adauga_profesor(profesor)
-        scoala_normala.adauga_clasa(clasa_normala)
-        
-        # Școala de muzică
-        clasa_muzica = ClasaEducationala(numar_clasa, scoala_muzica.nume)
-        for materie, nume_profesor in materii_per_clasa[numar_clasa]["muzica"]:
-            configurari = creeaza_configurari_profesor(materie, numar_clasa)
-            profesor = Profesor(nume_profesor, materie, numar_clasa, scoala_muzica.nume, configurari)
-            clasa_muzica.adauga_profesor(profesor)
-        scoala_muzica.adauga_clasa(clasa_muzica)
-    
-    # Adăugăm directori
-    director_normala = Director("Prof. Dr. Reuven Feuerstein", scoala_normala)
-    director_muzica = Director("Prof. Dr. Jean Piaget", scoala_muzica)
-    
-    scoala_normala.adauga_director(director_normala)
-    scoala_muzica.adauga_director(director_muzica)
-    
+    tmp_path = None
+    try:
+        # Nume temporar unic: workerii gunicorn pot salva instantaneul în același timp
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cale.parent, prefix=cale.name + ".", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_path = tmp.name
+            json.dump(payload, tmp, ensure_ascii=False)
+        os.replace(tmp_path, cale)
+    except Exception as e:
+        logger.warning(f"Instantaneul școlilor nu a putut fi salvat: {e}")
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+
+def incarca_instantaneu_scoli(cale=None):
+    """
+    Restaurează școlile din instantaneu, fără încărcare de materiale și fără afișări.
+    Returnează None dacă instantaneul lipsește sau nu mai corespunde materialelor.
+    """
+    cale = Path(cale or cale_instantaneu_scoli())
+    if not cale.exists():
+        return None
+    try:
+        payload = json.loads(cale.read_text(encoding="utf-8"))
+    except Exception as e:
+        logger.warning(f"Instantaneul școlilor nu a putut fi citit: {e}")
+        return None
+    if payload.get("versiune") != VERSIUNE_INSTANTANEU or payload.get("amprenta") != amprenta_structura():
+        logger.info("Instantaneul școlilor este depășit, structura va fi reconstruită")
+        return None
+
+    configurari = [ConfigurariProfesor.din_dict(date) for date in payload["configurari"]]
+    cunostinte = [CunostinteProfesor.din_dict(date) for date in payload["cunostinte"]]
+    scoli = []
+    for date_scoala in payload["scoli"]:
+        scoala = Scoala(date_scoala["nume"], date_scoala["tip"])
+        for date_clasa in date_scoala["clase"]:
+            clasa = ClasaEducationala(date_clasa["numar"], scoala.nume)
+            for date_profesor in date_clasa["profesori"]:
+                profesor = Profesor.din_instantaneu(
+                    date_profesor,
+                    configurari[date_profesor["configurari"]],
+                    cunostinte[date_profesor["cunostinte"]],
+                )
+                clasa.profesori[profesor.materie] = profesor
+                if profesor.nume == date_clasa.get("diriginte"):
+                    clasa.diriginte = profesor
+            scoala.clase[clasa.numar_clasa] = clasa
+        scoala.directori = [Director.din_instantaneu(date, scoala) for date in date_scoala["directori"]]
+        scoli.append(scoala)
+    scoala_normala, scoala_muzica = scoli
     return scoala_normala, scoala_muzica
 
+def construieste_sau_restaureaza_scoli(timpi=None):
+    """
+    Folosește instantaneul dacă materialele și configurările nu s-au schimbat,
+    altfel construiește structura și salvează un instantaneu nou.
+    """
+    if timpi is None:
+        timpi = {}
+    if not Config.INSTANTANEU_SCOLI:
+        return creeaza_structura_educationala(timpi)
+
+    start = time.perf_counter()
+    scoli = incarca_instantaneu_scoli()
+    if scoli is not None:
+        timpi["instantaneu"] = time.perf_counter() - start
+        return scoli
+
+    scoli = creeaza_structura_educationala(timpi)
+    start = time.perf_counter()
+    salveaza_instantaneu_scoli(scoli)
+    timpi["salvare_instantaneu"] = time.perf_counter() - start
+    return scoli
+
+class RegistruScoli:
+    """
+    Registru la nivel de proces pentru școli: structura este construită o singură
+    dată, la prima cerere, și partajată de API, varianta gratuită și meniurile CLI.
+    """
+    def __init__(self, constructor=None):
+        self._constructor = constructor or construieste_sau_restaureaza_scoli
+        self._lock = threading.Lock()
+        self._scoli = None
+        self._timpi = {}
+
+    @property
+    def este_construit(self):
+        return self._scoli is not None
+
+    def obtine_scoli(self):
+        """Returnează (școala normală, școala de muzică), construindu-le la primul apel"""
+        if self._scoli is None:
+            with self._lock:
+                if self._scoli is None:
+                    timpi = {}
+                    start = time.perf_counter()
+                    scoli = self._constructor(timpi)
+                    timpi["total"] = time.perf_counter() - start
+                    self._timpi = timpi
+                    self._scoli = scoli
+                    logger.info(
+                        "Structura școlilor construită în %.2fs: %s",
+                        timpi["total"],
+                        ", ".join(f"{nume}={durata:.2f}s" for nume, durata in timpi.items() if nume != "total"),
+                    )
+        return self._scoli
+
+    def timpi_construire(self):
+        """Durata construirii fiecărei componente, în secunde (gol până la prima construire)"""
+        return {nume: round(durata, 3) for nume, durata in self._timpi.items()}
+
+# Instanta globala
+registru_scoli = RegistruScoli()
+
+def reimprospateaza_materiale_scoli(scoli, diferenta=None):
+    """
+    Reîncarcă doar materialele afectate de modificările de pe disc, fără restart.
+    Dacă nu se primește o diferență, se scanează manifestul acum.
+    """
+    if diferenta is None:
+        diferenta = get_gestor_materiale().scaneaza_materiale()
+    rezultat = {"profesori": 0, "directori": 0, "modificari": diferenta.to_dict()}
+    if diferenta.goala:
+        return rezultat
+
+    afectati = []
+    for scoala in scoli:
+        for clasa in scoala.clase.values():
+            for profesor in clasa.profesori.values():
+                if profesor.reimprospateaza_materiale(diferenta):
+                    rezultat["profesori"] += 1
+                    afectati.append(profesor)
+        for director in scoala.directori:
+            if director.reimprospateaza_materiale(diferenta):
+                rezultat["directori"] += 1
+                afectati.append(director)
+
+    # Amprenta materialelor s-a schimbat: instantaneul vechi nu mai este valid
+    if Config.INSTANTANEU_SCOLI:
+        salveaza_instantaneu_scoli(scoli)
+
+    if afectati and Config.REZUMATE_LA_REINDEXARE:
+        constructor = ConstructorRezumate(get_gestor_materiale(), ai_client_manager)
+        for participant in afectati:
+            if isinstance(participant, Director):
+                constructor.construieste_pentru_director(participant)
+            else:
+                constructor.construieste_pentru_profesor(participant)
+
+    logger.info(
+        "Reindexare materiale: %d profesori si %d directori actualizati",
+        rezultat["profesori"],
+        rezultat["directori"],
+    )
+    return rezultat
+
+def genereaza_rezumate_scoli(scoli, forteaza=False):
+    """
+    Generează offline rezumatele compacte ale materialelor pentru profesori și directori.
+    Rezumatele existente (aceleași materiale sursă) nu sunt regenerate.
+    """
+    constructor = ConstructorRezumate(get_gestor_materiale(), ai_client_manager)
+    return constructor.construieste_toate(scoli, forteaza=forteaza)
+
 def demo_sistem():
     """
     Demonstrație a sistemului educațional complet
@@ -420,7 +666,7 @@ def demo_sistem():
         return
     
     # Creăm structura educațională
-    scoala_normala, scoala_muzica = creeaza_structura_educationala()
+    scoala_normala, scoala_muzica = registru_scoli.obtine_scoli()
     
     # Afișăm structurile
     scoala_normala.afiseaza_structura()
@@ -475,7 +721,7 @@ def meniu_interactiv():
     """
     Meniu interactiv pentru utilizator
     """
-    scoala_normala, scoala_muzica = creeaza_structura_educationala()
+    scoala_normala, scoala_muzica = registru_scoli.obtine_scoli()
     
     while True:
         print(f"\n{'='*50}")
@@ -487,9 +733,11 @@ def meniu_interactiv():
         print("4. Pune o întrebare (Școala de Muzică)")
         print("5. Afișează detalii profesor specific")
         print("6. Rulează demo complet")
-        print("7. Ieși")
+        print("7. Afișează structura folderelor de materiale")
+        print("8. Generează rezumatele materialelor didactice")
+        print("9. Ieși")
         
-        alegere = input("\nAlege opțiunea (1-7): ")
+        alegere = input("\nAlege opțiunea (1-9): ")
         
         if alegere == "1":
             scoala_normala.afiseaza_structura()
@@ -556,11 +804,19 @@ def meniu_interactiv():
             demo_sistem()
             
         elif alegere == "7":
+            get_gestor_materiale().afiseaza_structura_creata()
+            
+        elif alegere == "8":
+            statistici = genereaza_rezumate_scoli([scoala_normala, scoala_muzica])
+            print(f"Rezumate generate: {statistici['generate']}, existente: {statistici['existente']}, "
+                  f"eșuate: {statistici['esuate']}")
+            
+        elif alegere == "9":
             print("La revedere!")
             break
             
         else:
-            print("Opțiune invalidă! Te rog alege între 1-7.")
+            print("Opțiune invalidă! Te rog alege între 1-9.")
 
 def main():
     """
@@ -614,7 +870,7 @@ def afiseaza_statistici_sistem():
     """
     Funcție bonus pentru afișarea statisticilor sistemului
     """
-    scoala_normala, scoala_muzica = creeaza_structura_educationala()
+    scoala_normala, scoala_muzica = registru_scoli.obtine_scoli()
     
     print(f"\n{'='*60}")
     print("STATISTICI SISTEM EDUCATIONAL")
@@ -658,7 +914,7 @@ def test_configurari_avansate():
     print("TEST CONFIGURĂRI AVANSATE")
     print(f"{'='*50}")
     
-    scoala_normala, scoala_muzica = creeaza_structura_educationala()
+    scoala_normala, scoala_muzica = registru_scoli.obtine_scoli()
     
     # Testăm un profesor de matemată (serios, precisie ridicată)
     profesor_matematica = scoala_normala.clase[3].profesori["Matematică"]
@@ -9,9 +9,12 @@ from dotenv import load_dotenv
 import json
 import logging
 from main import *
+from main import registru_scoli
 from typing import Dict, List, Optional
 from config import Config, token_monitor
 from ai_clients import ai_client_manager
+from education.istoric import get_depozit_istoric
+from education.speculatie import get_rutare_speculativa
 import time
 
 # Configurare logging
@@ -52,13 +55,21 @@ class ProfesorFree:
         self.clasa = clasa
         self.scoala = scoala
         self.configurari = configurari or ConfigurariProfesorFree()
-        self.istoric_conversatii = []
         self.limite_zilnice = {
             "intrebari_maxime": 5,  # Max 5 întrebări pe zi per utilizator
             "intrebari_folosite": 0,
             "ultima_resetare": time.strftime("%Y-%m-%d")
         }
 
+    @property
+    def cheie_istoric(self):
+        return f"{self.scoala}/{self.clasa}/{self.materie}/{self.nume}"
+
+    @property
+    def istoric_conversatii(self):
+        """Ultimele conversații (limitat); cele vechi rămân în depozitul de istoric"""
+        return get_depozit_istoric().conversatii_recente(self.cheie_istoric)
+
     def verifica_limite_zilnice(self, user_id="default"):
         """Verifică limitele zilnice pentru utilizatorul gratuit"""
         data_curenta = time.strftime("%Y-%m-%d")
@@ -73,8 +84,8 @@ class ProfesorFree:
         
         return True, ""
 
-    def obtine_prompt_simplu(self, intrebare):
-        """Prompt optimizat pentru versiunea gratuită - mai scurt și eficient"""
+    def obtine_prefix_static(self):
+        """Partea fixă a promptului, trimisă prima pentru cache-ul de prompt al providerului"""
         prompt_clasa = {
             0: "Explică simplu pentru copii de 5-6 ani",
             1: "Explică pentru copii de 6-7 ani",
@@ -83,14 +94,14 @@ class ProfesorFree:
             4: "Explică pentru copii de 9-10 ani"
         }
 
-        prompt = f"""Ești {self.nume}, profesor de {self.materie} pentru clasa {self.clasa}.
+        return f"""Ești {self.nume}, profesor de {self.materie} pentru clasa {self.clasa}.
 {prompt_clasa.get(self.clasa, "Adaptează răspunsul pentru vârsta copilului")}.
 
-Întrebare: "{intrebare}"
-
 Răspunde scurt, clar și prietenos. Ajută copilul să înțeleagă, nu să copieze răspunsul."""
 
-        return prompt
+    def obtine_prompt_simplu(self, intrebare):
+        """Prompt optimizat pentru versiunea gratuită - mai scurt și eficient"""
+        return f'{self.obtine_prefix_static()}\n\nÎntrebare: "{intrebare}"'
 
     def raspunde_intrebare(self, intrebare, user_id="default"):
         """Răspunde la întrebare cu limitări pentru versiunea gratuită"""
@@ -100,7 +111,8 @@ Răspunde scurt, clar și prietenos. Ajută copilul să înțeleagă, nu să cop
         if not poate_raspunde:
             return mesaj_eroare
 
-        prompt = self.obtine_prompt_simplu(intrebare)
+        prefix = self.obtine_prefix_static()
+        prompt = f'Întrebare: "{intrebare}"'
         
         try:
             # Folosește doar GPT-3.5-turbo pentru free tier
@@ -110,7 +122,8 @@ Răspunde scurt, clar și prietenos. Ajută copilul să înțeleagă, nu să cop
                 user_id=user_id,
                 is_free_tier=True,
                 max_tokens=self.configurari.max_tokens,
-                temperature=self.configurari.temperature
+                temperature=self.configurari.temperature,
+                system_prompt=prefix
             )
             
             raspuns = result["content"]
@@ -119,7 +132,8 @@ Răspunde scurt, clar și prietenos. Ajută copilul să înțeleagă, nu să cop
             self.limite_zilnice["intrebari_folosite"] += 1
             
             # Salvează conversația
-            self.istoric_conversatii.append({
+            get_depozit_istoric().adauga_conversatie(self.cheie_istoric, {
+                "profesor": self.nume,
                 "intrebare": intrebare,
                 "raspuns": raspuns,
                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -168,7 +182,8 @@ class SistemEducationalFree:
 
     def __init__(self):
         self.profesori_disponibili = self.creeaza_profesori_free()
-        self.scoala_normala, self.scoala_muzica = creeaza_structura_educationala()
+        # Aceleași instanțe ca în API și CLI: școlile sunt construite o singură dată per proces
+        self.scoala_normala, self.scoala_muzica = registru_scoli.obtine_scoli()
         self.utilizatori_activi = {}
         self.limite_globale = {
             "utilizatori_maximi": 10,
@@ -244,7 +259,7 @@ class SistemEducationalFree:
             return True, mesaj
         return False, mesaj
     
-    def pune_intrebare(self, user_id, intrebare, scoala_nume, clasa):
+    def pune_intrebare(self, user_id, intrebare, scoala_nume, clasa, termen=None):
         """Pune o întrebare în sistemul gratuit"""
         
         # Verifică utilizatorul
@@ -260,18 +275,27 @@ class SistemEducationalFree:
         
         # Directorul alege profesorul
         director = scoala.directori[0]
-        profesor_ales = director.alege_profesor_pentru_intrebare(intrebare, clasa)
+        raspuns = None
+        if Config.RASPUNS_SPECULATIV:
+            # Profesorul ghicit raspunde in paralel cu decizia directorului
+            profesor_ales, raspuns = get_rutare_speculativa().raspunde(
+                director, intrebare, clasa, user_id=user_id, is_free_tier=True, termen=termen
+            )
+        else:
+            profesor_ales = director.alege_profesor_pentru_intrebare(intrebare, clasa, termen=termen)
         
         if not profesor_ales:
             return {"error": "Nu s-a găsit un profesor potrivit"}
         
         try:
             # Obține răspunsul (forțează varianta gratuită)
-            raspuns = profesor_ales.raspunde_intrebare(
-                intrebare, 
-                user_id=user_id, 
-                is_free_tier=True
-            )
+            if raspuns is None:
+                raspuns = profesor_ales.raspunde_intrebare(
+                    intrebare, 
+                    user_id=user_id, 
+                    is_free_tier=True,
+                    termen=termen
+                )
             
             # Statistici
             stats = token_monitor.get_stats()
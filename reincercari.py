@@ -0,0 +1,224 @@
+# Reincercari cu backoff exponential si jitter, comune directorului si providerilor AI
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import Config
+from termen_limita import TermenDepasit
+
+logger = logging.getLogger(__name__)
+
+# Coduri HTTP dupa care o noua incercare are sanse sa reuseasca
+_CODURI_TRANZITORII = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+
+
+@dataclass(frozen=True)
+class PoliticaReincercare:
+    """Cate incercari se fac si cat se asteapta intre ele (full jitter, plafonat la ``maxim``)."""
+
+    incercari: int = 3
+    baza: float = 0.5
+    maxim: float = 8.0
+
+    def intarziere(self, tentativa: int, generator: random.Random) -> float:
+        return generator.uniform(0, min(self.maxim, self.baza * (2**tentativa)))
+
+
+class BugetReincercari:
+    """Limits retries to a fraction of the calls made, so an outage does not multiply the load.
+
+    Every call deposits ``rata`` tokens (up to ``rezerva``) and every retry
+    spends one; with an empty budget the error is returned immediately.
+    """
+
+    def __init__(self, rata: float = 0.2, rezerva: float = 10.0) -> None:
+        self.rata = rata
+        self.rezerva = rezerva
+        self._sold = rezerva
+        self._lock = threading.Lock()
+
+    def depune(self) -> None:
+        with self._lock:
+            self._sold = min(self.rezerva, self._sold + self.rata)
+
+    def retrage(self) -> bool:
+        with self._lock:
+            if self._sold < 1:
+                return False
+            self._sold -= 1
+            return True
+
+
+def _cod_status(exc: BaseException) -> Optional[int]:
+    cod = getattr(exc, "status_code", None)
+    if cod is None:
+        cod = getattr(getattr(exc, "response", None), "status_code", None)
+    return cod if isinstance(cod, int) else None
+
+
+def este_tranzitorie(exc: BaseException) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections are worth retrying."""
+    if isinstance(exc, TermenDepasit):
+        return False
+    cod = _cod_status(exc)
+    if cod is not None:
+        return cod in _CODURI_TRANZITORII
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    nume = type(exc).__name__
+    return "Timeout" in nume or "Connection" in nume or nume == "RateLimitError"
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by the server through ``Retry-After`` (delta or HTTP date), if any."""
+    antete = getattr(getattr(exc, "response", None), "headers", None)
+    if not antete:
+        return None
+    valoare = antete.get("retry-after-ms")
+    if valoare is not None:
+        try:
+            return max(0.0, float(valoare) / 1000)
+        except ValueError:
+            pass
+    valoare = antete.get("retry-after")
+    if valoare is None:
+        return None
+    try:
+        return max(0.0, float(valoare))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(valoare)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class PlanificatorReincercari:
+    """Runs provider and director calls with jittered exponential backoff.
+
+    The wait honours ``Retry-After``, never outlives the request deadline and
+    is skipped when the provider's retry budget is spent. ``executa`` waits
+    in the calling thread; ``executa_async`` awaits instead, so the event loop
+    keeps serving other requests during the backoff.
+    """
+
+    def __init__(
+        self,
+        politica: Optional[PoliticaReincercare] = None,
+        rata_buget: float = 0.2,
+        rezerva_buget: float = 10.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.politica = politica or PoliticaReincercare()
+        self.rata_buget = rata_buget
+        self.rezerva_buget = rezerva_buget
+        self._bugete: Dict[str, BugetReincercari] = {}
+        self._metrici: Dict[str, Dict[str, int]] = {}
+        self._generator = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _buget(self, furnizor: str) -> BugetReincercari:
+        with self._lock:
+            buget = self._bugete.get(furnizor)
+            if buget is None:
+                buget = self._bugete[furnizor] = BugetReincercari(self.rata_buget, self.rezerva_buget)
+                self._metrici[furnizor] = {"apeluri": 0, "reincercari": 0, "esecuri": 0, "refuzate_buget": 0}
+            return buget
+
+    def _numara(self, furnizor: str, cheie: str) -> None:
+        with self._lock:
+            self._metrici[furnizor][cheie] += 1
+
+    def _pauza(
+        self,
+        exc: BaseException,
+        tentativa: int,
+        furnizor: str,
+        politica: PoliticaReincercare,
+        termen,
+        este_reincercabila: Callable[[BaseException], bool],
+    ) -> Optional[float]:
+        """Delay before the next attempt, or None when the error must be raised."""
+        if tentativa + 1 >= politica.incercari or not este_reincercabila(exc):
+            return None
+        with self._lock:
+            pauza = politica.intarziere(tentativa, self._generator)
+        ceruta = retry_after(exc)
+        if ceruta is not None:
+            pauza = max(pauza, ceruta)
+        if termen is not None and termen.ramas() <= pauza:
+            return None
+        if not self._buget(furnizor).retrage():
+            self._numara(furnizor, "refuzate_buget")
+            return None
+        self._numara(furnizor, "reincercari")
+        logger.info("Reincercare %s #%d peste %.2fs: %s", furnizor, tentativa + 1, pauza, exc)
+        return pauza
+
+    def executa(
+        self,
+        apel: Callable[[int], Any],
+        furnizor: str,
+        termen=None,
+        politica: Optional[PoliticaReincercare] = None,
+        este_reincercabila: Callable[[BaseException], bool] = este_tranzitorie,
+    ) -> Any:
+        """Call ``apel(tentativa)`` until it succeeds or the error is final."""
+        politica = politica or self.politica
+        self._buget(furnizor).depune()
+        self._numara(furnizor, "apeluri")
+        tentativa = 0
+        while True:
+            try:
+                return apel(tentativa)
+            except Exception as exc:
+                pauza = self._pauza(exc, tentativa, furnizor, politica, termen, este_reincercabila)
+                if pauza is None:
+                    self._numara(furnizor, "esecuri")
+                    raise
+            time.sleep(pauza)
+            tentativa += 1
+
+    async def executa_async(
+        self,
+        apel: Callable[[int], Awaitable[Any]],
+        furnizor: str,
+        termen=None,
+        politica: Optional[PoliticaReincercare] = None,
+        este_reincercabila: Callable[[BaseException], bool] = este_tranzitorie,
+    ) -> Any:
+        """Async variant of ``executa``: the backoff yields to the event loop instead of sleeping."""
+        politica = politica or self.politica
+        self._buget(furnizor).depune()
+        self._numara(furnizor, "apeluri")
+        tentativa = 0
+        while True:
+            try:
+                return await apel(tentativa)
+            except Exception as exc:
+                pauza = self._pauza(exc, tentativa, furnizor, politica, termen, este_reincercabila)
+                if pauza is None:
+                    self._numara(furnizor, "esecuri")
+                    raise
+            await asyncio.sleep(pauza)
+            tentativa += 1
+
+    def statistici(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {furnizor: dict(metrici) for furnizor, metrici in self._metrici.items()}
+
+
+# Instanta globala
+planificator_reincercari = PlanificatorReincercari(
+    PoliticaReincercare(Config.REINCERCARI_MAXIME, Config.REINCERCARI_BAZA, Config.REINCERCARI_PLAFON),
+    rata_buget=Config.REINCERCARI_RATA_BUGET,
+)
@@ -0,0 +1,138 @@
+# Sesiuni de tutorat multi-tura cu context limitat de bugetul de tokeni al modelului
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from config import Config
+
+_RE_PROPOZITIE = re.compile(r"(?<=[.!?])\s+")
+_MAX_CARACTERE_INTREBARE = 160
+_MAX_CARACTERE_RASPUNS = 200
+# Partea maxima din buget ocupata de rezumatul turelor vechi
+_FRACTIE_REZUMAT = 0.25
+
+
+def _prima_propozitie(text: str, limita: int) -> str:
+    text = " ".join(text.split())
+    return _RE_PROPOZITIE.split(text, maxsplit=1)[0][:limita]
+
+
+class SesiuneTutorat:
+    """Conversatia unui elev cu un profesor: ultimele ture integral, cele vechi intr-un rezumat.
+
+    Rezumatul este extractiv (intrebarea si prima propozitie din raspuns), deci
+    compactarea nu costa apeluri suplimentare catre model.
+    """
+
+    def __init__(self, user_id: str, cheie_profesor: str, max_ture: int = 20) -> None:
+        self.user_id = user_id
+        self.cheie_profesor = cheie_profesor
+        self.ture: Deque[Tuple[str, str]] = deque()
+        self.max_ture = max_ture
+        self.linii_rezumat: Deque[str] = deque()
+        self.ultima_activitate = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rezumat(self) -> str:
+        return "\n".join(self.linii_rezumat)
+
+    def adauga_tura(self, intrebare: str, raspuns: str) -> None:
+        with self._lock:
+            self.ture.append((intrebare, raspuns))
+            while len(self.ture) > self.max_ture:
+                self._compacteaza(self.ture.popleft())
+            self.ultima_activitate = time.monotonic()
+
+    def _compacteaza(self, tura: Tuple[str, str]) -> None:
+        intrebare, raspuns = tura
+        self.linii_rezumat.append(
+            f"- Elevul a intrebat: {_prima_propozitie(intrebare, _MAX_CARACTERE_INTREBARE)}"
+            f" | Raspuns pe scurt: {_prima_propozitie(raspuns, _MAX_CARACTERE_RASPUNS)}"
+        )
+
+    def mesaje_context(self, buget_tokeni: int, estimeaza: Callable[[str], int]) -> List[Dict[str, str]]:
+        """Mesajele anterioare care incap in ``buget_tokeni``.
+
+        Turele cele mai vechi sunt mutate in rezumat pana cand istoricul
+        incape; rezumatul pastreaza doar liniile recente care incap in
+        ``_FRACTIE_REZUMAT`` din buget.
+        """
+        with self._lock:
+            buget_rezumat = int(buget_tokeni * _FRACTIE_REZUMAT)
+            while self.linii_rezumat and estimeaza(self.rezumat) > buget_rezumat:
+                self.linii_rezumat.popleft()
+
+            def cost_ture() -> int:
+                return sum(estimeaza(intrebare) + estimeaza(raspuns) for intrebare, raspuns in self.ture)
+
+            while self.ture and estimeaza(self.rezumat) + cost_ture() > buget_tokeni:
+                self._compacteaza(self.ture.popleft())
+                while self.linii_rezumat and estimeaza(self.rezumat) > buget_rezumat:
+                    self.linii_rezumat.popleft()
+
+            mesaje: List[Dict[str, str]] = []
+            if self.linii_rezumat:
+                mesaje.append({"role": "user", "content": f"Rezumatul discutiei noastre de pana acum:\n{self.rezumat}"})
+                mesaje.append({"role": "assistant", "content": "Am inteles, continuam de aici."})
+            for intrebare, raspuns in self.ture:
+                mesaje.append({"role": "user", "content": intrebare})
+                mesaje.append({"role": "assistant", "content": raspuns})
+            return mesaje
+
+
+class ManagerSesiuni:
+    """Sesiunile active per (utilizator, profesor), cu expirare si limita de numar (LRU)."""
+
+    def __init__(self, ttl: float = 1800, max_sesiuni: int = 1000, max_ture: int = 20) -> None:
+        self.ttl = ttl
+        self.max_sesiuni = max_sesiuni
+        self.max_ture = max_ture
+        self._sesiuni: "OrderedDict[Tuple[str, str], SesiuneTutorat]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtine(self, user_id: str, cheie_profesor: str) -> SesiuneTutorat:
+        cheie = (user_id, cheie_profesor)
+        acum = time.monotonic()
+        with self._lock:
+            sesiune = self._sesiuni.get(cheie)
+            if sesiune is not None and acum - sesiune.ultima_activitate > self.ttl:
+                sesiune = None
+            if sesiune is None:
+                sesiune = SesiuneTutorat(user_id, cheie_profesor, self.max_ture)
+                self._sesiuni[cheie] = sesiune
+            self._sesiuni.move_to_end(cheie)
+            while len(self._sesiuni) > self.max_sesiuni:
+                self._sesiuni.popitem(last=False)
+            return sesiune
+
+    def inchide(self, user_id: str, cheie_profesor: str) -> bool:
+        with self._lock:
+            return self._sesiuni.pop((user_id, cheie_profesor), None) is not None
+
+    def curata_expirate(self) -> int:
+        acum = time.monotonic()
+        with self._lock:
+            expirate = [c for c, s in self._sesiuni.items() if acum - s.ultima_activitate > self.ttl]
+            for cheie in expirate:
+                del self._sesiuni[cheie]
+        return len(expirate)
+
+    def statistici(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sesiuni_active": len(self._sesiuni), "max_sesiuni": self.max_sesiuni}
+
+
+def buget_context_model(model: Optional[str]) -> int:
+    """Bugetul de tokeni de intrare pentru un model (prompt static + istoric + intrebare)."""
+    return Config.BUGET_CONTEXT_MODELE.get(model or "", Config.BUGET_CONTEXT_IMPLICIT)
+
+
+# Instanta globala
+manager_sesiuni = ManagerSesiuni(
+    ttl=Config.SESIUNE_TTL,
+    max_sesiuni=Config.SESIUNI_MAXIME,
+    max_ture=Config.SESIUNE_MAX_TURE,
+)
@@ -0,0 +1,45 @@
+# Termen limita per cerere, propagat prin director, profesor si apelurile catre provideri
+import time
+from typing import Optional
+
+
+class TermenDepasit(TimeoutError):
+    """Bugetul de timp al cererii s-a epuizat inainte de o etapa."""
+
+
+class TermenLimita:
+    """Momentul pana la care trebuie terminata o cerere; fiecare etapa primeste doar timpul ramas."""
+
+    def __init__(self, secunde: float) -> None:
+        self.secunde = secunde
+        self.expira = time.monotonic() + secunde
+
+    def ramas(self) -> float:
+        return max(0.0, self.expira - time.monotonic())
+
+    @property
+    def expirat(self) -> bool:
+        return self.ramas() <= 0
+
+    def subtermen(self, rezerva: float) -> "TermenLimita":
+        """Termen care expira cu ``rezerva`` secunde mai devreme, lasand timp etapelor urmatoare."""
+        sub = TermenLimita.__new__(TermenLimita)
+        sub.expira = self.expira - rezerva
+        sub.secunde = max(0.0, sub.expira - time.monotonic())
+        return sub
+
+    def timeout(self, maxim: Optional[float] = None, minim: float = 0.5, etapa: str = "") -> float:
+        """Timeout-ul pentru urmatorul apel: timpul ramas, limitat la ``maxim``.
+
+        Ridica ``TermenDepasit`` daca au ramas mai putin de ``minim`` secunde,
+        ca apelantul sa treaca imediat la varianta de rezerva.
+        """
+        ramas = self.ramas()
+        if ramas < minim:
+            raise TermenDepasit(f"Termen depasit{f' la {etapa}' if etapa else ''} ({ramas:.1f}s ramase)")
+        return ramas if maxim is None else min(maxim, ramas)
+
+
+def timeout_pentru(termen: Optional[TermenLimita], implicit: float, etapa: str = "") -> float:
+    """Timeout-ul implicit, sau cel mai mic dintre el si timpul ramas din ``termen``."""
+    return implicit if termen is None else termen.timeout(implicit, etapa=etapa)
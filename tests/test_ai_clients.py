@@ -1,3 +1,4 @@
+import importlib.util
 import sys
 import types
 import tempfile
@@ -8,7 +9,7 @@ from unittest.mock import MagicMock, patch
 
 
 def _ensure_stub(module_name, setup):
-    if module_name in sys.modules:
+    if module_name in sys.modules or importlib.util.find_spec(module_name) is not None:
         return
     module = types.ModuleType(module_name)
     setup(module)
@@ -21,7 +22,7 @@ def _setup_openai(module):
             self.create = lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("create not stubbed"))
 
     class OpenAIStub:
-        def __init__(self, api_key=None):
+        def __init__(self, api_key=None, **kwargs):
             self.api_key = api_key
             self.responses = ResponsesStub()
 
@@ -34,7 +35,7 @@ def _setup_anthropic(module):
             self.create = lambda *args, **kwargs: None
 
     class AnthropicStub:
-        def __init__(self, api_key=None):
+        def __init__(self, api_key=None, **kwargs):
             self.api_key = api_key
             self.messages = MessagesStub()
 
@@ -74,6 +75,10 @@ class AIClientsTests(unittest.TestCase):
         self.mock_add_tokens = self.add_tokens_patch.start()
         self.addCleanup(self.add_tokens_patch.stop)
 
+        self.log_usage_patch = patch.object(ai_clients.cost_monitor, "log_usage", return_value=True)
+        self.mock_log_usage = self.log_usage_patch.start()
+        self.addCleanup(self.log_usage_patch.stop)
+
     def test_choose_model_routes_pro(self):
         manager = ai_clients.AIClientManager()
         provider, model = manager.choose_model("Matematica", is_free_tier=False)
@@ -101,6 +106,34 @@ class AIClientsTests(unittest.TestCase):
         mock_call.assert_called_once()
         self.mock_add_tokens.assert_not_called()
 
+    def test_get_ai_response_session_sends_history_and_skips_cache(self):
+        from sesiuni import SesiuneTutorat
+
+        manager = ai_clients.AIClientManager()
+        sesiune = SesiuneTutorat("elev", "profesor")
+        with patch.object(manager, "call_openai", return_value={"content": "primul", "tokens_used": 5}) as mock_call:
+            manager.get_ai_response("Salut", subject="Istorie", is_free_tier=False, sesiune=sesiune)
+            result = manager.get_ai_response("Si apoi?", subject="Istorie", is_free_tier=False, sesiune=sesiune)
+            manager.get_ai_response("Si apoi?", subject="Istorie", is_free_tier=False)
+
+        self.assertFalse(result["from_cache"])
+        self.assertEqual(mock_call.call_count, 3)
+        messages = mock_call.call_args_list[1].args[0]
+        self.assertEqual([m["content"] for m in messages[1:]], ["Salut", "primul", "Si apoi?"])
+        self.assertEqual(len(sesiune.ture), 2)
+
+    def test_get_ai_response_gives_provider_the_remaining_deadline(self):
+        from termen_limita import TermenDepasit, TermenLimita
+
+        manager = ai_clients.AIClientManager()
+        with patch.object(manager, "call_openai", return_value={"content": "ok", "tokens_used": 5}) as mock_call:
+            manager.get_ai_response("Salut", subject="Istorie", is_free_tier=False, termen=TermenLimita(8))
+            self.assertLessEqual(mock_call.call_args.kwargs["timeout"], 8)
+
+            with self.assertRaises(TermenDepasit):
+                manager.get_ai_response("Altceva", subject="Istorie", is_free_tier=False, termen=TermenLimita(0))
+        mock_call.assert_called_once()
+
     def test_get_ai_response_free_stem_uses_handler_map(self):
         manager = ai_clients.AIClientManager()
         with patch.object(manager, "call_deepseek", return_value={"content": "deep", "tokens_used": 100}) as mock_deep:
@@ -139,6 +172,64 @@ class AIClientsTests(unittest.TestCase):
             {"role": "user", "content": [{"type": "text", "text": "Salut"}]}
         ])
 
+    def test_call_openai_reports_cached_prefix_tokens(self):
+        manager = ai_clients.AIClientManager()
+        usage = SimpleNamespace(
+            input_tokens=1200,
+            output_tokens=80,
+            total_tokens=1280,
+            input_tokens_details=SimpleNamespace(cached_tokens=1024),
+        )
+        manager.openai_client.responses.create = MagicMock(
+            return_value=SimpleNamespace(output_text="raspuns", usage=usage)
+        )
+
+        result = manager.call_openai([{"role": "user", "content": "Salut"}], model="gpt-5-nano")
+
+        self.assertEqual(result["usage"], {"input": 176, "cached_input": 1024, "output": 80})
+
+    def test_call_claude_marks_system_prefix_for_caching(self):
+        manager = ai_clients.AIClientManager()
+        usage = SimpleNamespace(
+            input_tokens=30, output_tokens=50, cache_read_input_tokens=1500, cache_creation_input_tokens=0
+        )
+        create_mock = MagicMock(
+            return_value=SimpleNamespace(content=[SimpleNamespace(text="raspuns")], usage=usage)
+        )
+        manager.claude_client.messages.create = create_mock
+        messages = [
+            {"role": "system", "content": "Persona si materiale"},
+            {"role": "user", "content": "Intrebare"},
+        ]
+
+        result = manager.call_claude(messages, model="claude-4.5-sonnet")
+
+        kwargs = create_mock.call_args.kwargs
+        self.assertEqual(kwargs["system"], [
+            {"type": "text", "text": "Persona si materiale", "cache_control": {"type": "ephemeral"}}
+        ])
+        self.assertEqual(kwargs["messages"], [{"role": "user", "content": "Intrebare"}])
+        self.assertEqual(result["usage"], {"input": 30, "cached_input": 1500, "output": 50})
+        self.assertEqual(result["tokens_used"], 1580)
+
+    def test_system_prompt_is_sent_first_and_cost_logged_with_cached_tokens(self):
+        manager = ai_clients.AIClientManager()
+        usage = {"input": 100, "cached_input": 900, "output": 40}
+        with patch.object(ai_clients.random, "choices", return_value=["gpt-5-nano"]), \
+                patch.object(manager, "call_openai", return_value={
+                    "content": "ok", "tokens_used": 1040, "usage": usage
+                }) as mock_call:
+            manager.get_ai_response("Intrebare", subject="Istorie", system_prompt="Prefix static")
+            cached = manager.get_ai_response("Intrebare", subject="Istorie", system_prompt="Alt prefix")
+
+        messages = mock_call.call_args_list[0].args[0]
+        self.assertEqual(messages[0], {"role": "system", "content": "Prefix static"})
+        self.assertEqual(messages[1], {"role": "user", "content": "Intrebare"})
+        self.mock_log_usage.assert_any_call(usage, "gpt-5-nano")
+        # Raspunsul din cache depinde si de prefix, nu doar de intrebare
+        self.assertFalse(cached["from_cache"])
+        self.assertEqual(mock_call.call_count, 2)
+
     def test_get_free_tier_response_delegates_to_get_ai_response(self):
         manager = ai_clients.AIClientManager()
         with patch.object(manager, "get_ai_response", return_value={"content": "ok"}) as mock_get:
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import cache_rutare
+from education import director as director_module
+from education import gestor_materiale
+from education.cache_rutare import CacheRutare, amprenta_profesori
+from education.director import Director
+from education.gestor_materiale import GestorMateriale
+from education.istoric import DepozitIstoric
+
+
+def _profesor(nume, materie):
+    return SimpleNamespace(nume=nume, materie=materie, clasa=3)
+
+
+class CacheRutareTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.amprenta = amprenta_profesori([_profesor("Prof_Euclid", "Matematica")])
+
+    def test_question_is_normalised_in_the_key(self):
+        cache = CacheRutare()
+        cache.seteaza("Scoala", 3, "Cât face 2+2?", self.amprenta, "Prof_Euclid")
+        self.assertEqual(cache.obtine("Scoala", 3, "  cat FACE 2 + 2 ", self.amprenta), "Prof_Euclid")
+        self.assertIsNone(cache.obtine("Scoala", 4, "cat face 2+2", self.amprenta))
+
+    def test_entries_expire_and_follow_teacher_set(self):
+        cache = CacheRutare(ttl=10)
+        with patch.object(cache_rutare.time, "time", return_value=1000.0):
+            cache.seteaza("Scoala", 3, "intrebare", self.amprenta, "Prof_Euclid")
+        with patch.object(cache_rutare.time, "time", return_value=1011.0):
+            self.assertIsNone(cache.obtine("Scoala", 3, "intrebare", self.amprenta))
+
+        cache.seteaza("Scoala", 3, "intrebare", self.amprenta, "Prof_Euclid")
+        alta_amprenta = amprenta_profesori([_profesor("Prof_Euclid", "Matematica"), _profesor("Prof_Vivaldi", "Muzica")])
+        self.assertIsNone(cache.obtine("Scoala", 3, "intrebare", alta_amprenta))
+        self.assertEqual(len(cache), 0)
+
+    def test_capacity_and_persistence(self):
+        cale = Path(self.temp_dir.name) / "cache_rutare.json"
+        cache = CacheRutare(cale, capacitate=2)
+        for index in range(3):
+            cache.seteaza("Scoala", 3, f"q{index}", self.amprenta, "Prof_Euclid")
+        cache.salveaza()
+
+        redeschis = CacheRutare(cale, capacitate=2)
+        self.assertIsNone(redeschis.obtine("Scoala", 3, "q0", self.amprenta))
+        self.assertEqual(redeschis.obtine("Scoala", 3, "q2", self.amprenta), "Prof_Euclid")
+
+    def test_changes_are_written_in_batches_outside_the_lock(self):
+        cale = Path(self.temp_dir.name) / "cache_rutare.json"
+        cache = CacheRutare(cale, interval_salvare=60)
+        scrieri = []
+        scrie = cache._scrie
+
+        def scrie_fara_lock(intrari, *args):
+            scrieri.append(len(intrari))
+            self.assertFalse(cache._lock.locked())
+            return scrie(intrari, *args)
+
+        with patch.object(cache, "_scrie", scrie_fara_lock):
+            for index in range(5):
+                cache.seteaza("Scoala", 3, f"q{index}", self.amprenta, "Prof_Euclid")
+            self.assertEqual(scrieri, [1])
+            cache.salveaza()
+            cache.salveaza()
+        self.assertEqual(scrieri, [1, 5])
+        self.assertEqual(len(CacheRutare(cale)), 5)
+
+    def test_workers_sharing_the_file_keep_each_others_routes(self):
+        cale = Path(self.temp_dir.name) / "cache_rutare.json"
+        primul, al_doilea = CacheRutare(cale), CacheRutare(cale)
+        primul.seteaza("Scoala", 3, "comun", self.amprenta, "Prof_Euclid")
+        primul.seteaza("Scoala", 3, "primul", self.amprenta, "Prof_Euclid")
+        primul.salveaza()
+        al_doilea.seteaza("Scoala", 3, "comun", self.amprenta, "Prof_Vivaldi")
+        al_doilea.seteaza("Scoala", 3, "al doilea", self.amprenta, "Prof_Vivaldi")
+        al_doilea.salveaza()
+
+        redeschis = CacheRutare(cale)
+        self.assertEqual(redeschis.obtine("Scoala", 3, "primul", self.amprenta), "Prof_Euclid")
+        self.assertEqual(redeschis.obtine("Scoala", 3, "al doilea", self.amprenta), "Prof_Vivaldi")
+        self.assertEqual(redeschis.obtine("Scoala", 3, "comun", self.amprenta), "Prof_Vivaldi")
+        self.assertEqual(list(cale.parent.glob("*.tmp")), [])
+
+        al_doilea.goleste()
+        self.assertEqual(len(CacheRutare(cale)), 0)
+
+
+class DirectorCacheRutareTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        anterior = getattr(gestor_materiale.get_gestor_materiale, "_instance", None)
+        gestor_materiale.get_gestor_materiale._instance = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        if anterior is None:
+            self.addCleanup(delattr, gestor_materiale.get_gestor_materiale, "_instance")
+        else:
+            self.addCleanup(setattr, gestor_materiale.get_gestor_materiale, "_instance", anterior)
+        for nume, valoare in (("get_depozit_istoric", DepozitIstoric()), ("get_cache_rutare", CacheRutare())):
+            patcher = patch.object(director_module, nume, return_value=valoare)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.object(director_module.Config, "ROUTER_LOCAL_ACTIV", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.profesori = {"Matematica": _profesor("Prof_Euclid", "Matematica"), "Muzica": _profesor("Prof_Vivaldi", "Muzica")}
+        scoala = SimpleNamespace(nume="Scoala", clase={3: SimpleNamespace(profesori=self.profesori)})
+        self.director = Director.din_instantaneu({"nume": "Director"}, scoala)
+
+    def test_repeated_question_skips_llm_until_teacher_set_changes(self):
+        mesaj = SimpleNamespace(content='{"profesor": "Prof_Vivaldi", "justificare": "", "confidence": 0.9}')
+        client = MagicMock()
+        client.chat.completions.create.return_value = SimpleNamespace(choices=[SimpleNamespace(message=mesaj)])
+        with patch.object(director_module, "client", client):
+            for intrebare in ("Ce este o nota muzicala?", "ce este o nota muzicala", "Ce este o notă muzicală!"):
+                self.assertIs(self.director.alege_profesor_pentru_intrebare(intrebare, 3), self.profesori["Muzica"])
+            self.assertEqual(client.chat.completions.create.call_count, 1)
+
+            self.profesori["Arte"] = _profesor("Prof_Leonardo", "Arte")
+            self.director.alege_profesor_pentru_intrebare("Ce este o nota muzicala?", 3)
+        self.assertEqual(client.chat.completions.create.call_count, 2)
+
+        metrici = self.director.get_metrici_performanta()
+        self.assertEqual((metrici["cache_hit"], metrici["cache_miss"]), (2, 2))
+        self.assertEqual(metrici["rata_cache_hit"], 50.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from education.depozit_text import DepozitTextMapat
+
+
+class DepozitTextMapatTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.director = Path(self.temp_dir.name) / ".cache_text"
+        self.depozit = DepozitTextMapat(self.director)
+        self.addCleanup(self.depozit.inchide)
+
+    def test_reads_full_text_and_prefix_slices(self):
+        self.depozit.adauga("a" * 64, "Științele naturii în clasa a III-a")
+        self.assertEqual(self.depozit.citeste("a" * 64), "Științele naturii în clasa a III-a")
+        self.assertEqual(self.depozit.citeste("a" * 64, 9), "Științele")
+        self.assertEqual(self.depozit.lungime("a" * 64), 34)
+        self.assertIsNone(self.depozit.citeste("b" * 64))
+
+    def test_second_process_view_sees_texts_written_by_first(self):
+        alt_worker = DepozitTextMapat(self.director)
+        self.addCleanup(alt_worker.inchide)
+        self.depozit.adauga("sha1", "primul text")
+        self.assertEqual(alt_worker.citeste("sha1"), "primul text")
+
+        alt_worker.adauga("sha2", "al doilea text")
+        alt_worker.adauga("sha1", "duplicat ignorat")
+        self.assertEqual(self.depozit.citeste("sha2"), "al doilea text")
+        self.assertEqual(self.depozit.citeste("sha1"), "primul text")
+
+    def test_compaction_keeps_referenced_texts_for_all_views(self):
+        alt_worker = DepozitTextMapat(self.director)
+        self.addCleanup(alt_worker.inchide)
+        self.depozit.adauga("vechi", "text sters")
+        self.depozit.adauga("pastrat", "text pastrat")
+        self.assertEqual(alt_worker.citeste("pastrat"), "text pastrat")
+
+        self.assertEqual(self.depozit.compacteaza(["pastrat"]), 1)
+        self.assertFalse(self.depozit.contine("vechi"))
+        self.assertEqual(self.depozit.citeste("pastrat"), "text pastrat")
+
+        alt_worker.adauga("nou", "text nou")
+        self.assertEqual(alt_worker.citeste("pastrat"), "text pastrat")
+        self.assertEqual(self.depozit.citeste("nou"), "text nou")
+
+    def test_view_reloads_index_after_another_worker_compacts(self):
+        alt_worker = DepozitTextMapat(self.director)
+        self.addCleanup(alt_worker.inchide)
+        self.depozit.adauga("vechi", "text sters")
+        self.depozit.adauga("pastrat", "versiunea unu", {"versiune": 1})
+        self.assertEqual(self.depozit.citeste("pastrat"), "versiunea unu")
+
+        alt_worker.adauga("pastrat", "a doua versiune, mai lunga", {"versiune": 2}, inlocuieste=True)
+        self.assertEqual(alt_worker.compacteaza(["pastrat"]), 1)
+
+        self.assertFalse(self.depozit.contine("vechi"))
+        self.assertEqual(self.depozit.hashuri(), ["pastrat"])
+        self.assertEqual(self.depozit.meta("pastrat"), {"versiune": 2})
+        self.assertEqual(self.depozit.citeste("pastrat"), "a doua versiune, mai lunga")
+        self.assertEqual(self.depozit.citeste("pastrat", 7), "a doua ")
+
+
+if __name__ == "__main__":
+    unittest.main()
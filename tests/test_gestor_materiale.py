@@ -0,0 +1,188 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import gestor_materiale
+from education.gestor_materiale import GestorMateriale
+
+
+class GestorMaterialeManifestTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cale_baza = Path(self.temp_dir.name) / "materiale"
+        self.gestor = GestorMateriale(str(self.cale_baza))
+        self.folder_profesor = self.cale_baza / "Scoala_Normala" / "clasa_3" / "Matematica" / "Prof_Euclid"
+
+    def _scrie_pdf(self, nume, continut=b"%PDF-1.4 test"):
+        cale = self.folder_profesor / nume
+        cale.write_bytes(continut)
+        return cale
+
+    def test_scan_without_changes_is_empty(self):
+        self.assertTrue(self.gestor.scaneaza_materiale().goala)
+
+    def test_scan_reports_added_changed_and_removed(self):
+        cale = self._scrie_pdf("manual.pdf")
+        diferenta = self.gestor.scaneaza_materiale()
+        self.assertEqual(diferenta.adaugate, ["Scoala_Normala/clasa_3/Matematica/Prof_Euclid/manual.pdf"])
+
+        hash_vechi = self.gestor.hash_material(cale)
+        self.gestor.depozit_text.adauga(hash_vechi, "text vechi")
+        cale.write_bytes(b"%PDF-1.4 continut nou si mai lung")
+        diferenta = self.gestor.scaneaza_materiale()
+        self.assertEqual(len(diferenta.modificate), 1)
+        self.assertNotEqual(self.gestor.hash_material(cale), hash_vechi)
+        self.assertEqual(self.gestor.compacteaza_texte(), 1)
+        self.assertFalse(self.gestor.depozit_text.contine(hash_vechi))
+
+        cale.unlink()
+        diferenta = self.gestor.scaneaza_materiale()
+        self.assertEqual(len(diferenta.sterse), 1)
+        self.assertEqual(self.gestor.manifest, {})
+
+    def test_manifest_persists_between_instances(self):
+        self._scrie_pdf("manual.pdf")
+        self.gestor.scaneaza_materiale()
+        gestor_nou = GestorMateriale(str(self.cale_baza))
+        self.assertIn("Scoala_Normala/clasa_3/Matematica/Prof_Euclid/manual.pdf", gestor_nou.manifest)
+        self.assertTrue(gestor_nou.scaneaza_materiale().goala)
+
+    def test_concurrent_manifest_saves_do_not_collide(self):
+        self._scrie_pdf("manual.pdf")
+        self.gestor.scaneaza_materiale()
+        alt_worker = GestorMateriale(str(self.cale_baza))
+        fire = [
+            threading.Thread(target=lambda gestor=gestor: [gestor._salveaza_manifest() for _ in range(30)])
+            for gestor in (self.gestor, alt_worker) * 3
+        ]
+        with self.assertNoLogs(gestor_materiale.logger, level="WARNING"):
+            for fir in fire:
+                fir.start()
+            for fir in fire:
+                fir.join()
+        date = json.loads(self.gestor.cale_manifest.read_text(encoding="utf-8"))
+        self.assertIn("Scoala_Normala/clasa_3/Matematica/Prof_Euclid/manual.pdf", date["fisiere"])
+        self.assertEqual(list(self.gestor.cale_manifest.parent.glob("*.tmp")), [])
+
+    def test_diff_affects_only_matching_teacher_folders(self):
+        self._scrie_pdf("manual.pdf")
+        diferenta = self.gestor.scaneaza_materiale()
+        foldere_euclid = self.gestor.foldere_profesor("Scoala_Normală", 3, "Matematica", "Prof_Euclid")
+        foldere_altul = self.gestor.foldere_profesor("Scoala_Normală", 3, "Istorie", "Prof_Herodot")
+        self.assertTrue(diferenta.afecteaza(foldere_euclid))
+        self.assertFalse(diferenta.afecteaza(foldere_altul))
+        self.assertFalse(diferenta.afecteaza(["director_pedagogie"]))
+
+    def test_index_lookup_tracks_scans_without_globbing(self):
+        cale = self._scrie_pdf("manual.pdf")
+        self.gestor.scaneaza_materiale()
+        with patch.object(Path, "glob") as mock_glob:
+            gasite = self.gestor.gaseste_materiale_profesor("Scoala_Normală", 3, "Matematica", "Prof_Euclid")
+        mock_glob.assert_not_called()
+        self.assertEqual(gasite, [cale])
+        self.assertTrue(self.gestor.are_materiale("Scoala_Normală", 3, "Matematica", "Prof_Euclid"))
+
+        cale.unlink()
+        self.gestor.scaneaza_materiale()
+        self.assertEqual(self.gestor.gaseste_materiale_profesor("Scoala_Normală", 3, "Matematica", "Prof_Euclid"), [])
+        self.assertFalse(self.gestor.are_materiale("Scoala_Normală", 3, "Matematica", "Prof_Euclid"))
+
+    def test_identical_copies_are_extracted_once(self):
+        original = self._scrie_pdf("manual.pdf", b"%PDF-1.4 manual comun")
+        folder_copie = self.cale_baza / "Scoala_de_Muzica_George_Enescu" / "clasa_3" / "Matematica" / "Prof_Euclid"
+        copie = folder_copie / "manual.pdf"
+        copie.write_bytes(b"%PDF-1.4 manual comun")
+        self.gestor.scaneaza_materiale()
+
+        with patch("education.gestor_materiale.PyPDF2.PdfReader") as mock_reader:
+            mock_reader.return_value.pages = [MagicMock(extract_text=MagicMock(return_value="text manual"))]
+            self.assertEqual(self.gestor.incarca_pdf_cu_cache(original), "text manual")
+            self.assertEqual(self.gestor.incarca_pdf_cu_cache(copie), "text manual")
+        mock_reader.assert_called_once()
+        self.assertEqual(
+            self.gestor.statistici_deduplicare(),
+            {"fisiere": 2, "documente_unice": 1, "texte_extrase": 1},
+        )
+
+    def test_texts_from_older_normalisation_are_reextracted(self):
+        cale = self._scrie_pdf("manual.pdf")
+        self.gestor.scaneaza_materiale()
+        sha = self.gestor.hash_material(cale)
+        self.gestor.depozit_text.adauga(sha, "text   brut\n\n\n\n")
+
+        with patch("education.gestor_materiale.PyPDF2.PdfReader") as mock_reader:
+            mock_reader.return_value.pages = [MagicMock(extract_text=MagicMock(return_value="text   brut\n\n\n\n"))]
+            self.assertEqual(self.gestor.incarca_pdf_cu_cache(cale), "text brut")
+        self.assertIn("Scoala_Normala/clasa_3/Matematica/Prof_Euclid/manual.pdf", self.gestor.raport_normalizare())
+
+    def test_director_materials_come_from_index(self):
+        cale = self.cale_baza / "director_pedagogie" / "ghid.pdf"
+        cale.write_bytes(b"%PDF-1.4 ghid")
+        self.assertEqual(self.gestor.gaseste_materiale_director(), [])
+        self.gestor.scaneaza_materiale()
+        self.assertEqual(self.gestor.gaseste_materiale_director(), [cale])
+
+
+class GestorMaterialeStructuraTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cale_baza = Path(self.temp_dir.name) / "materiale"
+
+    def test_cold_start_writes_stamp(self):
+        gestor = GestorMateriale(str(self.cale_baza))
+        self.assertTrue(gestor.cale_stamp_structura.exists())
+        self.assertTrue((self.cale_baza / "director_pedagogie" / "README.txt").exists())
+
+    def test_warm_start_skips_bootstrap(self):
+        GestorMateriale(str(self.cale_baza))
+        with patch.object(GestorMateriale, "creeaza_structura_completa") as mock_creeaza:
+            GestorMateriale(str(self.cale_baza))
+        mock_creeaza.assert_not_called()
+
+    def test_restart_picks_up_pdfs_changed_while_down(self):
+        folder = self.cale_baza / "director_pedagogie"
+        GestorMateriale(str(self.cale_baza))
+        (folder / "ghid.pdf").write_bytes(b"%PDF-1.4 ghid")
+        (folder / "sters.pdf").write_bytes(b"%PDF-1.4 sters")
+        (folder / "neschimbat.pdf").write_bytes(b"%PDF-1.4 neschimbat")
+        gestor = GestorMateriale(str(self.cale_baza))
+        hash_vechi = gestor.hash_material(folder / "ghid.pdf")
+        amprenta_veche = gestor.amprenta_materiale()
+
+        # Serviciul este oprit: un PDF se schimba, unul dispare, unul nou apare
+        (folder / "ghid.pdf").write_bytes(b"%PDF-1.4 ghid revizuit")
+        (folder / "sters.pdf").unlink()
+        (folder / "anexa.pdf").write_bytes(b"%PDF-1.4 anexa")
+        with patch(
+            "education.gestor_materiale.calculeaza_hash_fisier",
+            wraps=gestor_materiale.calculeaza_hash_fisier,
+        ) as mock_hash:
+            gestor_nou = GestorMateriale(str(self.cale_baza))
+
+        self.assertEqual(sorted(c.args[0].name for c in mock_hash.call_args_list), ["anexa.pdf", "ghid.pdf"])
+        self.assertEqual(
+            gestor_nou.gaseste_materiale_director(),
+            [folder / "anexa.pdf", folder / "ghid.pdf", folder / "neschimbat.pdf"],
+        )
+        self.assertNotEqual(gestor_nou.hash_material(folder / "ghid.pdf"), hash_vechi)
+        self.assertNotEqual(gestor_nou.amprenta_materiale(), amprenta_veche)
+        self.assertTrue(gestor_nou.scaneaza_materiale().goala)
+
+    def test_stale_stamp_triggers_rebuild(self):
+        gestor = GestorMateriale(str(self.cale_baza))
+        gestor.cale_stamp_structura.rename(self.cale_baza / ".structura_v0_vechi")
+        with patch.object(GestorMateriale, "creeaza_structura_completa") as mock_creeaza:
+            GestorMateriale(str(self.cale_baza))
+        mock_creeaza.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
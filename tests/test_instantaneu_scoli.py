@@ -0,0 +1,83 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+import main
+from education import director as director_module
+from education import gestor_materiale
+from education.gestor_materiale import GestorMateriale
+from education.istoric import DepozitIstoric
+
+
+class InstantaneuScoliTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        anterior = getattr(gestor_materiale.get_gestor_materiale, "_instance", None)
+        self.gestor = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        gestor_materiale.get_gestor_materiale._instance = self.gestor
+        if anterior is None:
+            self.addCleanup(delattr, gestor_materiale.get_gestor_materiale, "_instance")
+        else:
+            self.addCleanup(setattr, gestor_materiale.get_gestor_materiale, "_instance", anterior)
+        # Directorul isi antreneaza routerul la constructie din istoricul deciziilor
+        for patcher in (
+            patch.object(main.Config, "INSTANTANEU_SCOLI", True),
+            patch.object(director_module, "get_depozit_istoric", return_value=DepozitIstoric()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_restore_skips_construction_and_keeps_graph(self):
+        construite = main.construieste_sau_restaureaza_scoli({})
+        self.assertTrue(main.cale_instantaneu_scoli().exists())
+
+        timpi = {}
+        with patch.object(main.Profesor, "incarca_materiale_didactice") as mock_materiale, \
+                patch.object(main.Director, "incarca_sau_genereaza_profil") as mock_profil:
+            restaurate = main.construieste_sau_restaureaza_scoli(timpi)
+        mock_materiale.assert_not_called()
+        mock_profil.assert_not_called()
+        self.assertIn("instantaneu", timpi)
+
+        for original, restaurat in zip(construite, restaurate):
+            self.assertEqual(original.nume, restaurat.nume)
+            self.assertEqual(sorted(original.clase), sorted(restaurat.clase))
+            self.assertEqual(original.directori[0].nume, restaurat.directori[0].nume)
+            self.assertIs(restaurat.directori[0].scoala, restaurat)
+            prof_original = original.clase[3].profesori["Matematica"]
+            prof_restaurat = restaurat.clase[3].profesori["Matematica"]
+            self.assertEqual(prof_original.obtine_prefix_static(), prof_restaurat.obtine_prefix_static())
+            self.assertEqual(prof_original.configurari.ca_dict(), prof_restaurat.configurari.ca_dict())
+
+    def test_snapshot_is_rejected_when_materials_change(self):
+        main.salveaza_instantaneu_scoli(main.creeaza_structura_educationala())
+        self.assertIsNotNone(main.incarca_instantaneu_scoli())
+
+        folder = self.gestor.cale_baza / "director_pedagogie"
+        (folder / "ghid.pdf").write_bytes(b"%PDF-1.4 ghid")
+        self.gestor.scaneaza_materiale()
+        self.assertIsNone(main.incarca_instantaneu_scoli())
+
+    def test_concurrent_snapshot_saves_do_not_collide(self):
+        scoli = main.creeaza_structura_educationala()
+        fire = [
+            threading.Thread(target=lambda: [main.salveaza_instantaneu_scoli(scoli) for _ in range(5)])
+            for _ in range(4)
+        ]
+        with self.assertNoLogs(main.logger, level="WARNING"):
+            for fir in fire:
+                fir.start()
+            for fir in fire:
+                fir.join()
+        self.assertIsNotNone(main.incarca_instantaneu_scoli())
+        self.assertEqual(list(main.cale_instantaneu_scoli().parent.glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
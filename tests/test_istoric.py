@@ -0,0 +1,116 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from education.istoric import DepozitIstoric
+
+
+class DepozitIstoricTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cale_db = Path(self.temp_dir.name) / "istoric.db"
+        self.depozit = DepozitIstoric(self.cale_db, capacitate_conversatii=3)
+        self.addCleanup(self.depozit.inchide)
+
+    def _conversatie(self, index, user_id="u1", profesor="Prof_Euclid"):
+        return {"profesor": profesor, "user_id": user_id, "intrebare": f"q{index}", "raspuns": f"r{index}"}
+
+    def test_ring_buffer_stays_bounded_while_database_keeps_everything(self):
+        for index in range(10):
+            self.depozit.adauga_conversatie("S/3/Matematica/Prof_Euclid", self._conversatie(index))
+
+        recente = self.depozit.conversatii_recente("S/3/Matematica/Prof_Euclid")
+        self.assertEqual([c["intrebare"] for c in recente], ["q7", "q8", "q9"])
+        self.assertEqual(len(self.depozit.cauta_conversatii(profesor="Prof_Euclid")), 10)
+
+    def test_queries_by_user_teacher_and_date(self):
+        self.depozit.adauga_conversatie("a", self._conversatie(1, user_id="u1"))
+        inceput = time.time()
+        self.depozit.adauga_conversatie("b", self._conversatie(2, user_id="u2", profesor="Prof_Herodot"))
+        self.depozit.adauga_conversatie("a", self._conversatie(3, user_id="u1"))
+
+        self.assertEqual([c["intrebare"] for c in self.depozit.cauta_conversatii(user_id="u1")], ["q3", "q1"])
+        self.assertEqual([c["intrebare"] for c in self.depozit.cauta_conversatii(profesor="Prof_Herodot")], ["q2"])
+        self.assertEqual(len(self.depozit.cauta_conversatii(de_la=inceput)), 2)
+
+    def test_recent_entries_survive_restart(self):
+        self.depozit.adauga_decizie("Scoala/Director", {"profesor_ales": "Prof_Euclid", "metoda": "fallback"})
+        self.depozit.inchide()
+
+        redeschis = DepozitIstoric(self.cale_db)
+        self.addCleanup(redeschis.inchide)
+        self.assertEqual(redeschis.decizii_recente("Scoala/Director")[0]["profesor_ales"], "Prof_Euclid")
+        self.assertEqual(len(redeschis.cauta_decizii(profesor="Prof_Euclid")), 1)
+
+    def test_memory_only_store_without_path(self):
+        depozit = DepozitIstoric(None, capacitate_decizii=2)
+        for index in range(5):
+            depozit.adauga_decizie("d", {"profesor_ales": str(index)})
+        self.assertEqual([d["profesor_ales"] for d in depozit.decizii_recente("d")], ["3", "4"])
+        self.assertEqual(depozit.cauta_decizii(), [])
+
+    def test_decision_aggregates_follow_the_ring_and_survive_restart(self):
+        depozit = DepozitIstoric(self.cale_db, capacitate_decizii=60)
+        metode = ["director_ai", "fallback", "router_local"]
+        profesori = ["Prof_Euclid", "Prof_Eminescu", "Prof_Darwin", "Prof_Vivaldi", None]
+        for index in range(150):
+            metoda = metode[index % 3]
+            depozit.adauga_decizie(
+                "S/Director",
+                {
+                    "profesor_ales": profesori[(index * 7) % 5],
+                    "metoda": metoda,
+                    "confidence": (index % 10) / 10 if metoda == "director_ai" else None,
+                    "scor": index % 13 if metoda == "fallback" else None,
+                },
+            )
+
+        def recalculeaza(recente):
+            numarate = {}
+            for decizie in recente[-50:]:
+                if decizie["profesor_ales"]:
+                    numarate[decizie["profesor_ales"]] = numarate.get(decizie["profesor_ales"], 0) + 1
+            ordonate = sorted(numarate.items(), key=lambda x: x[1], reverse=True)[:3]
+            return {
+                "total": len(recente),
+                "ai": sum(1 for d in recente if d["metoda"] == "director_ai"),
+                "confidence": round(sum(d["confidence"] for d in recente if d["metoda"] == "director_ai"), 6),
+                "scor": sum(d["scor"] for d in recente if d["metoda"] == "fallback"),
+                "populari": [{"nume": nume, "count": count} for nume, count in ordonate],
+            }
+
+        def din_agregat(metrici):
+            return {
+                "total": metrici["total"],
+                "ai": metrici["per_metoda"]["director_ai"],
+                "confidence": round(metrici["suma_confidence_ai"], 6),
+                "scor": metrici["suma_scor_fallback"],
+                "populari": metrici["profesori_populari"],
+            }
+
+        asteptat = recalculeaza(depozit.decizii_recente("S/Director"))
+        self.assertEqual(asteptat["total"], 60)
+        self.assertEqual(din_agregat(depozit.metrici_decizii("S/Director")), asteptat)
+        depozit.inchide()
+
+        redeschis = DepozitIstoric(self.cale_db, capacitate_decizii=60)
+        self.addCleanup(redeschis.inchide)
+        self.assertEqual(din_agregat(redeschis.metrici_decizii("S/Director")), asteptat)
+        self.assertEqual(redeschis.metrici_decizii("altcineva")["total"], 0)
+
+    def test_non_numeric_confidence_and_score_do_not_break_recording(self):
+        depozit = DepozitIstoric(None, capacitate_decizii=2)
+        for confidence in ("high", None, "0.8", float("nan")):
+            depozit.adauga_decizie("d", {"profesor_ales": "P", "metoda": "director_ai", "confidence": confidence})
+        depozit.adauga_decizie("d", {"profesor_ales": "P", "metoda": "fallback", "scor": "mare"})
+
+        metrici = depozit.metrici_decizii("d")
+        self.assertEqual(metrici["total"], 2)
+        self.assertEqual(metrici["suma_confidence_ai"], 0.0)
+        self.assertEqual(metrici["suma_scor_fallback"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
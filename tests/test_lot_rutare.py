@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import director as director_module
+from education import gestor_materiale
+from education.cache_rutare import CacheRutare
+from education.director import Director
+from education.gestor_materiale import GestorMateriale
+from education.istoric import DepozitIstoric
+from education.lot_rutare import LotRutare
+from termen_limita import TermenLimita
+
+
+def _in_paralel(functie, argumente):
+    rezultate = [None] * len(argumente)
+    start = threading.Barrier(len(argumente))
+
+    def ruleaza(index):
+        start.wait()
+        rezultate[index] = functie(*argumente[index])
+
+    fire = [threading.Thread(target=ruleaza, args=(index,)) for index in range(len(argumente))]
+    for fir in fire:
+        fir.start()
+    for fir in fire:
+        fir.join(5)
+    return rezultate
+
+
+class LotRutareTests(unittest.TestCase):
+    def test_requests_in_the_window_share_one_decision_call(self):
+        apeluri = []
+
+        def decide(cheie, intrebari, termen):
+            apeluri.append((cheie, sorted(intrebari)))
+            return [f"{cheie}:{intrebare}" for intrebare in intrebari]
+
+        lot = LotRutare(decide, fereastra=0.3, maxim=10)
+        rezultate = _in_paralel(lot.ruteaza, [(3, f"q{index}") for index in range(4)])
+
+        self.assertEqual(apeluri, [(3, ["q0", "q1", "q2", "q3"])])
+        self.assertEqual(rezultate, [f"3:q{index}" for index in range(4)])
+        self.assertEqual(lot.statistici()["intrebari_per_lot"], 4)
+
+    def test_full_batch_is_sent_without_waiting_for_the_window(self):
+        lot = LotRutare(lambda cheie, intrebari, termen: list(intrebari), fereastra=5, maxim=2)
+        inceput = time.monotonic()
+        rezultate = _in_paralel(lot.ruteaza, [(1, "a"), (1, "b")])
+        self.assertLess(time.monotonic() - inceput, 2)
+        self.assertEqual(rezultate, ["a", "b"])
+
+    def test_followers_give_up_at_their_deadline_and_failures_yield_none(self):
+        eliberare = threading.Event()
+
+        def decide(cheie, intrebari, termen):
+            eliberare.wait(5)
+            raise RuntimeError("provider indisponibil")
+
+        lot = LotRutare(decide, fereastra=0.5)
+        rezultate = []
+        lider = threading.Thread(target=lambda: rezultate.append(lot.ruteaza(1, "a")))
+        lider.start()
+        time.sleep(0.05)
+        self.assertIsNone(lot.ruteaza(1, "b", TermenLimita(0.2)))
+        eliberare.set()
+        lider.join(5)
+        self.assertEqual(rezultate, [None])
+        self.assertEqual(lot.statistici()["asteptari_expirate"], 1)
+
+
+class DirectorLotTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        anterior = getattr(gestor_materiale.get_gestor_materiale, "_instance", None)
+        gestor_materiale.get_gestor_materiale._instance = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        if anterior is None:
+            self.addCleanup(delattr, gestor_materiale.get_gestor_materiale, "_instance")
+        else:
+            self.addCleanup(setattr, gestor_materiale.get_gestor_materiale, "_instance", anterior)
+        for patcher in (
+            patch.object(director_module, "get_depozit_istoric", return_value=DepozitIstoric()),
+            patch.object(director_module, "get_cache_rutare", return_value=CacheRutare(capacitate=0)),
+            patch.object(director_module.Config, "RUTARE_LOT_ACTIVA", True),
+            patch.object(director_module.Config, "RUTARE_LOT_FEREASTRA", 0.3),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.profesori = {
+            "Matematica": SimpleNamespace(nume="Prof_Euclid", materie="Matematica", clasa=3),
+            "Muzica": SimpleNamespace(nume="Prof_Vivaldi", materie="Muzica", clasa=3),
+        }
+        scoala = SimpleNamespace(nume="Scoala", clase={3: SimpleNamespace(profesori=self.profesori)})
+        self.director = Director.din_instantaneu({"nume": "Director"}, scoala)
+
+    def test_concurrent_questions_are_routed_with_one_llm_call(self):
+        decizii = {"decizii": [
+            {"index": 2, "profesor": "Prof_Vivaldi", "justificare": "muzica", "confidence": 0.8},
+            {"index": 1, "profesor": "Prof_Euclid", "justificare": "calcul", "confidence": 0.9},
+        ]}
+        client = MagicMock()
+        client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(decizii)))]
+        )
+        intrebari = ["Cat face 7 ori 8?", "Ce instrument are clape?"]
+
+        def intreaba(intrebare):
+            if intrebare == intrebari[1]:
+                time.sleep(0.05)  # a doua intrebare intra in lotul deschis de prima
+            return self.director.alege_profesor_cu_llm(intrebare, 3)
+
+        with patch.object(director_module, "client", client):
+            alesi = _in_paralel(intreaba, [(intrebare,) for intrebare in intrebari])
+
+        self.assertEqual(client.chat.completions.create.call_count, 1)
+        prompt = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        self.assertIn('1. "Cat face 7 ori 8?"', prompt)
+        self.assertIn('2. "Ce instrument are clape?"', prompt)
+        self.assertEqual([profesor.nume for profesor in alesi], ["Prof_Euclid", "Prof_Vivaldi"])
+        metode = {d["intrebare"]: d["metoda"] for d in self.director.istoric_decizii}
+        self.assertEqual(metode, {intrebare: "director_ai" for intrebare in intrebari})
+        self.assertEqual(self.director.get_metrici_performanta()["apeluri_llm"], 1)
+
+    def test_failed_batch_call_scores_the_fallback_once_for_the_batch(self):
+        intrebari = ["Cat face 7 ori 8? calcul", "Ce instrument are clape?"]
+
+        def intreaba(intrebare):
+            if intrebare == intrebari[1]:
+                time.sleep(0.05)
+            return self.director.alege_profesor_cu_llm(intrebare, 3)
+
+        scoruri_lot = MagicMock(wraps=self.director.scoruri_fallback_lot)
+        esec = RuntimeError("indisponibil")
+        with patch.object(director_module.planificator_reincercari, "executa", side_effect=esec) as apel, \
+                patch.object(self.director, "scoruri_fallback_lot", scoruri_lot), \
+                patch.object(self.director, "_scoruri_fallback", wraps=self.director._scoruri_fallback) as secvential:
+            alesi = _in_paralel(intreaba, [(intrebare,) for intrebare in intrebari])
+
+        self.assertEqual([profesor.nume for profesor in alesi], ["Prof_Euclid", "Prof_Vivaldi"])
+        apel.assert_called_once()
+        scoruri_lot.assert_called_once()
+        self.assertEqual(sorted(scoruri_lot.call_args.args[0]), sorted(intrebari))
+        if director_module.numpy_disponibil():
+            secvential.assert_not_called()
+        metode = {d["intrebare"]: d["metoda"] for d in self.director.istoric_decizii}
+        self.assertEqual(metode, {intrebare: "fallback" for intrebare in intrebari})
+
+    def test_answer_format_is_per_call_and_a_single_object_reply_still_counts(self):
+        prefix = self.director.creeaza_prefix_director()
+        self.assertNotIn("Returneaza DOAR", prefix)
+        decizie = {"profesor": "Prof_Euclid", "justificare": "calcul", "confidence": 0.9}
+        client = MagicMock()
+        client.chat.completions.create.return_value = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(decizie)))]
+        )
+
+        with patch.object(director_module, "client", client):
+            rezultate = self.director._decide_lot(3, ["Cat face 7 ori 8?", "Ce instrument are clape?"])
+
+        mesaje = client.chat.completions.create.call_args.kwargs["messages"]
+        self.assertEqual(mesaje[0]["content"], prefix)
+        self.assertIn('{"decizii": [', mesaje[1]["content"])
+        self.assertNotIn('{"profesor": "Nume Profesor"', mesaje[1]["content"])
+        self.assertEqual(rezultate, [("Prof_Euclid", "calcul", 0.9), None])
+        self.assertIn('{"profesor": "Nume Profesor"', self.director.creeaza_prompt_director("q", 3, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from education.normalizare_text import normalizeaza_pagini
+
+
+class NormalizareTextTests(unittest.TestCase):
+    def _pagini(self):
+        return [
+            f"Manual Matematica - Clasa a III-a\nLectia {numar}\nNumerele natu-\nrale   pana la 1000.\n\n\n\n- {numar} -\n"
+            for numar in range(1, 5)
+        ]
+
+    def test_removes_headers_page_numbers_and_hyphenation(self):
+        text, statistici = normalizeaza_pagini(self._pagini())
+        self.assertNotIn("Manual Matematica", text)
+        self.assertNotIn("- 2 -", text)
+        self.assertIn("Lectia 1\nNumerele naturale pana la 1000.", text)
+        self.assertNotIn("\n\n\n", text)
+        self.assertEqual(statistici["linii_antet_subsol"], 4)
+        self.assertGreater(statistici["tokeni_economisiti"], 0)
+        self.assertLess(statistici["tokeni_finali"], statistici["tokeni_initiali"])
+
+    def test_short_documents_keep_their_first_lines(self):
+        text, statistici = normalizeaza_pagini(["Titlu lectie\nContinut"])
+        self.assertEqual(text, "Titlu lectie\nContinut")
+        self.assertEqual(statistici["linii_antet_subsol"], 0)
+
+    def test_boilerplate_lines_are_dropped(self):
+        text, statistici = normalizeaza_pagini(["Text util\n© Editura Exemplu 2020\nISBN 978-973-0-00000-0"])
+        self.assertEqual(text, "Text util")
+        self.assertEqual(statistici["linii_boilerplate"], 2)
+
+    def test_numbers_in_the_body_are_kept(self):
+        pagina = "Lectia 5\nExercitii\nCalculeaza:\n12\n3 / 4\nRaspuns:\n7\nfinal de pagina\n- 5 -"
+        text, statistici = normalizeaza_pagini([pagina])
+        self.assertEqual(text, "Lectia 5\nExercitii\nCalculeaza:\n12\n3 / 4\nRaspuns:\n7\nfinal de pagina")
+        self.assertEqual(statistici["numere_pagina"], 1)
+
+    def test_word_split_once_is_joined(self):
+        text, _ = normalizeaza_pagini(["Titlu\nx\nApa curge la vale si formeaza pa-\nraie mici in padure.\ny\nz"])
+        self.assertIn("formeaza paraie mici", text)
+
+    def test_real_hyphenated_words_keep_their_hyphen(self):
+        pagina = (
+            "Titlu\nx\nRelatia profesor-\nelev este importanta.\nEl s-\na bucurat, da-\nmi cartea.\n"
+            "Clasa a III-\na citeste. Cluj-\nNapoca\ny\nz"
+        )
+        text, _ = normalizeaza_pagini([pagina])
+        for asteptat in ("profesor-elev este", "s-a bucurat", "da-mi cartea", "III-a citeste", "Cluj-Napoca"):
+            self.assertIn(asteptat, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
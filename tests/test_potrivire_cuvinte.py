@@ -0,0 +1,100 @@
+import os
+import random
+import time
+import unittest
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education.director import _DOMENII_FALLBACK
+from education.gestor_materiale import _CATEGORII_PEDAGOGICE
+from education.potrivire_cuvinte import AutomatCuvinteCheie
+
+_CUVINTE_TEXT = (
+    "elevul invata la scoala despre numere litere si povesti cu animale natura culori "
+    "muzica lume ziua soare apa copii profesor clasa dezvoltare comunicare"
+).split()
+
+
+def _cel_mai_bun_timp(functie, *argumente, repetari=3):
+    timpi = []
+    for _ in range(repetari):
+        start = time.perf_counter()
+        functie(*argumente)
+        timpi.append(time.perf_counter() - start)
+    return min(timpi)
+
+
+class AutomatCuvinteCheieTests(unittest.TestCase):
+    def setUp(self):
+        self.tabel = {
+            "romana": ["litera", "povest", "text"],
+            "limba": ["litera", "limba", "text"],
+            "stiinta": ["fizic", "natura"],
+            "sport": ["fizic", "sport"],
+        }
+        self.automat = AutomatCuvinteCheie(self.tabel)
+
+    def test_distinct_keywords_match_naive_substring_scan(self):
+        alfabet = "abcefilmnoprstuz "
+        generator = random.Random(7)
+        for _ in range(200):
+            text = "".join(generator.choice(alfabet) for _ in range(60))
+            text += generator.choice(["litera", "fizica", "sportiv", "natural", ""])
+            asteptat = {
+                categorie: {cuvant for cuvant in cuvinte if cuvant in text}
+                for categorie, cuvinte in self.tabel.items()
+            }
+            asteptat = {categorie: gasite for categorie, gasite in asteptat.items() if gasite}
+            self.assertEqual(self.automat.cuvinte_gasite(text), asteptat, text)
+
+    def test_counts_occurrences_per_category(self):
+        numarari = self.automat.numara("Povestea cu LITERA A si litera B, educatie fizica")
+        self.assertEqual(numarari, {"romana": 3, "limba": 2, "stiinta": 1, "sport": 1})
+
+    def test_present_categories_match_any_scan(self):
+        text = "Un text despre FIZICA si sport"
+        asteptat = [c for c, cuvinte in self.tabel.items() if any(cuvant in text.lower() for cuvant in cuvinte)]
+        self.assertEqual(self.automat.categorii_prezente(text), asteptat)
+        self.assertEqual(self.automat.cuvinte_prezente(text), {"text", "fizic", "sport"})
+
+    def test_overlapping_keywords_are_all_reported(self):
+        automat = AutomatCuvinteCheie({"a": ["he", "she", "hers", "his"]})
+        gasite = sorted(cuvant for _, cuvant in automat.potriviri("ushers"))
+        self.assertEqual(gasite, ["he", "hers", "she"])
+
+
+class PerformantaCuvinteCheieTests(unittest.TestCase):
+    """The classifier must not be slower than the per-category ``in`` scans it replaced."""
+
+    def setUp(self):
+        generator = random.Random(1)
+        self.intrebari = [" ".join(generator.choice(_CUVINTE_TEXT) for _ in range(8)) for _ in range(5000)]
+        self.text_pdf = " ".join(generator.choice(_CUVINTE_TEXT) for _ in range(80000))
+
+    def test_questions_are_faster_than_per_domain_scan(self):
+        automat = AutomatCuvinteCheie(_DOMENII_FALLBACK)
+
+        def vechi():
+            for intrebare in self.intrebari:
+                intrebare = intrebare.lower()
+                {domeniu: [c for c in cuvinte if c in intrebare] for domeniu, cuvinte in _DOMENII_FALLBACK.items()}
+
+        def nou():
+            for intrebare in self.intrebari:
+                automat.cuvinte_gasite(intrebare)
+
+        self.assertLess(_cel_mai_bun_timp(nou), _cel_mai_bun_timp(vechi))
+
+    def test_pdf_classification_is_not_slower_than_any_scan(self):
+        automat = AutomatCuvinteCheie(_CATEGORII_PEDAGOGICE)
+
+        def vechi():
+            text = self.text_pdf.lower()
+            return [c for c, cuvinte in _CATEGORII_PEDAGOGICE.items() if any(cuvant in text for cuvant in cuvinte)]
+
+        self.assertEqual(automat.categorii_prezente(self.text_pdf), vechi())
+        self.assertLess(_cel_mai_bun_timp(automat.categorii_prezente, self.text_pdf), 1.5 * _cel_mai_bun_timp(vechi))
+
+
+if __name__ == "__main__":
+    unittest.main()
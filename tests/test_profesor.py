@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education.gestor_materiale import GestorMateriale
+from education.profesor import ConfigurariProfesor, Profesor, statistici_internare
+
+
+class ProfesorPromptTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.gestor = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        self.profesor = Profesor(
+            "Prof_Euclid",
+            "Matematica",
+            3,
+            "Scoala_Normala",
+            ConfigurariProfesor(personalitate="serios"),
+            gestor_materiale=self.gestor,
+        )
+
+    def test_prefix_is_rendered_once_and_question_only_appended(self):
+        self.profesor.asigura_materiale()
+        with patch.object(Profesor, "compileaza_prompt") as mock_compile:
+            prefix = self.profesor.obtine_prefix_static()
+            prompt = self.profesor.obtine_prompt_personalizat("Cat face 2+2?")
+        mock_compile.assert_not_called()
+        self.assertIn("riguros", prefix)
+        self.assertIn("clasa 3", prefix)
+        self.assertEqual(prompt, f'{prefix}\n\nIntrebarea elevului este: "Cat face 2+2?"')
+
+    def test_prefix_is_recompiled_when_a_digest_appears(self):
+        self.profesor.referinte_materiale = [("manual.pdf", "h1")]
+        self.profesor.compileaza_prompt()
+        self.gestor.depozit_rezumate.salveaza(self.profesor.cheie_rezumat, "Fractii si arii")
+        self.assertIn("Fractii si arii", self.profesor.obtine_prefix_static())
+
+    def test_materials_are_loaded_on_first_use_only(self):
+        folder = self.gestor.cale_baza / self.gestor.foldere_profesor("Scoala_Normala", 3, "Matematica", "Prof_Euclid")[0]
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "manual.pdf").write_bytes(b"%PDF-1.4 manual")
+        self.gestor.scaneaza_materiale()
+
+        with patch.object(GestorMateriale, "asigura_text_extras", return_value=None) as mock_extrage:
+            profesor = Profesor("Prof_Euclid", "Matematica", 3, "Scoala_Normala", gestor_materiale=self.gestor)
+            self.assertFalse(profesor.materiale_incarcate)
+            self.assertTrue(profesor.are_materiale)
+            mock_extrage.assert_not_called()
+
+            profesor.obtine_prefix_static()
+            profesor.obtine_prefix_static()
+
+        mock_extrage.assert_called_once()
+        self.assertTrue(profesor.materiale_incarcate)
+        self.assertFalse(profesor.are_materiale)  # textul nu a putut fi extras
+
+    def test_snapshot_keeps_unloaded_teachers_lazy(self):
+        restaurat = Profesor.din_instantaneu(
+            self.profesor.instantaneu(), self.profesor.configurari, self.profesor.cunostinte, self.gestor
+        )
+        self.assertFalse(restaurat.materiale_incarcate)
+        self.profesor.asigura_materiale()
+        restaurat = Profesor.din_instantaneu(
+            self.profesor.instantaneu(), self.profesor.configurari, self.profesor.cunostinte, self.gestor
+        )
+        self.assertTrue(restaurat.materiale_incarcate)
+
+    def test_identical_teachers_share_configuration_and_knowledge(self):
+        self.profesor.referinte_materiale = [("manual.pdf", "h1")]
+        alt_profesor = Profesor(
+            "Prof_Euclid",
+            "Matematica",
+            4,
+            "Scoala_de_Muzica",
+            ConfigurariProfesor(personalitate="serios"),
+            gestor_materiale=self.gestor,
+        )
+        alt_profesor.referinte_materiale = [("manual.pdf", "h1")]
+
+        self.assertIs(alt_profesor.configurari, self.profesor.configurari)
+        self.assertIs(alt_profesor.cunostinte, self.profesor.cunostinte)
+        self.assertGreaterEqual(statistici_internare()["cunostinte"], 1)
+        self.assertFalse(hasattr(self.profesor, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.profesor.configurari.temperature = 1.0
+
+
+if __name__ == "__main__":
+    unittest.main()
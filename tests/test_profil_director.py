@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import director as director_module
+from education import gestor_materiale
+from education.director import Director
+from education.gestor_materiale import GestorMateriale
+from education.istoric import DepozitIstoric
+
+PROFIL = {"valori": ["curiozitate"], "ton": "cald", "reguli": ["explica pas cu pas"]}
+
+
+def _cu_cunostinte(director):
+    director.cunostinte_pedagogice = "Ghid pedagogic"
+
+
+class ProfilDirectorTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        anterior = getattr(gestor_materiale.get_gestor_materiale, "_instance", None)
+        self.gestor = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        gestor_materiale.get_gestor_materiale._instance = self.gestor
+        if anterior is None:
+            self.addCleanup(delattr, gestor_materiale.get_gestor_materiale, "_instance")
+        else:
+            self.addCleanup(setattr, gestor_materiale.get_gestor_materiale, "_instance", anterior)
+        self.scoala = SimpleNamespace(nume="Scoala Test", clase={})
+        for patcher in (
+            patch.object(Director, "incarca_materiale_pedagogice", _cu_cunostinte),
+            patch.object(director_module, "get_depozit_istoric", return_value=DepozitIstoric()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_generation_runs_in_background_and_director_serves_meanwhile(self):
+        poate_continua = threading.Event()
+
+        def genereaza(director):
+            poate_continua.wait(5)
+            return dict(PROFIL)
+
+        with patch.object(Director, "genereaza_profil_din_materiale", genereaza):
+            director = Director("Director", self.scoala)
+            self.assertEqual(director.profil_pedagogic, {})
+            self.assertEqual(director.format_profil_pentru_prompt(), "")
+            poate_continua.set()
+            self.assertTrue(director.asteapta_profil(5))
+
+        self.assertEqual(director.profil_pedagogic["ton"], "cald")
+        salvat = json.loads(director.cale_profil.read_text(encoding="utf-8"))
+        self.assertEqual(salvat["valori"], ["curiozitate"])
+
+    def test_concurrent_workers_generate_the_profile_once(self):
+        apeluri = []
+        a_inceput = threading.Event()
+        poate_continua = threading.Event()
+
+        def genereaza(director):
+            apeluri.append(director)
+            a_inceput.set()
+            poate_continua.wait(5)
+            return dict(PROFIL)
+
+        with patch.object(Director, "genereaza_profil_din_materiale", genereaza):
+            primul = Director("Director", self.scoala)
+            self.assertTrue(a_inceput.wait(5))
+            al_doilea = Director("Director", self.scoala)
+            poate_continua.set()
+            self.assertTrue(primul.asteapta_profil(5) and al_doilea.asteapta_profil(5))
+
+        self.assertEqual(len(apeluri), 1)
+        self.assertEqual(al_doilea.profil_pedagogic["reguli"], ["explica pas cu pas"])
+
+    def test_saved_profile_is_loaded_without_generation(self):
+        cale_profil = self.gestor.cale_baza / "director_pedagogie" / "profil_director.json"
+        cale_profil.parent.mkdir(parents=True, exist_ok=True)
+        cale_profil.write_text(json.dumps(PROFIL), encoding="utf-8")
+
+        with patch.object(Director, "genereaza_profil_din_materiale") as mock_genereaza:
+            director = Director("Director", self.scoala)
+        mock_genereaza.assert_not_called()
+        self.assertIsNone(director._fir_profil)
+        self.assertEqual(director.profil_pedagogic["ton"], "cald")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import threading
+import unittest
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from main import RegistruScoli
+
+
+class RegistruScoliTests(unittest.TestCase):
+    def setUp(self):
+        self.apeluri = 0
+
+    def _construieste(self, timpi):
+        self.apeluri += 1
+        timpi["Scoala_Normala/profesori"] = 0.5
+        timpi["Scoala_Normala/director"] = 0.25
+        return SimpleNamespace(nume="normala"), SimpleNamespace(nume="muzica")
+
+    def test_schools_are_built_once_and_shared(self):
+        registru = RegistruScoli(self._construieste)
+        self.assertFalse(registru.este_construit)
+        self.assertEqual(registru.timpi_construire(), {})
+
+        rezultate = []
+        fire = [threading.Thread(target=lambda: rezultate.append(registru.obtine_scoli())) for _ in range(8)]
+        for fir in fire:
+            fir.start()
+        for fir in fire:
+            fir.join()
+
+        self.assertEqual(self.apeluri, 1)
+        self.assertTrue(all(rezultat is rezultate[0] for rezultat in rezultate))
+        timpi = registru.timpi_construire()
+        self.assertEqual(timpi["Scoala_Normala/profesori"], 0.5)
+        self.assertIn("total", timpi)
+
+
+if __name__ == "__main__":
+    unittest.main()
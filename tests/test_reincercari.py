@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import reincercari
+from reincercari import PlanificatorReincercari, PoliticaReincercare, este_tranzitorie, retry_after
+from termen_limita import TermenDepasit, TermenLimita
+
+
+class EroareHttp(Exception):
+    def __init__(self, status_code, antete=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=antete or {})
+
+
+def _apel_cu_esecuri(erori, rezultat="ok"):
+    tentative = []
+
+    def apel(tentativa):
+        tentative.append(tentativa)
+        if erori:
+            raise erori.pop(0)
+        return rezultat
+
+    return apel, tentative
+
+
+class PlanificatorReincercariTests(unittest.TestCase):
+    def setUp(self):
+        self.planificator = PlanificatorReincercari(PoliticaReincercare(incercari=3, baza=0.5, maxim=4), seed=1)
+        patcher = patch.object(reincercari.time, "sleep")
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transient_errors_are_retried_with_bounded_jitter(self):
+        apel, tentative = _apel_cu_esecuri([EroareHttp(503), TimeoutError()])
+
+        self.assertEqual(self.planificator.executa(apel, furnizor="openai"), "ok")
+        self.assertEqual(tentative, [0, 1, 2])
+        pauze = [c.args[0] for c in self.mock_sleep.call_args_list]
+        self.assertTrue(0 <= pauze[0] <= 0.5 and 0 <= pauze[1] <= 1.0)
+        self.assertEqual(
+            self.planificator.statistici()["openai"],
+            {"apeluri": 1, "reincercari": 2, "esecuri": 0, "refuzate_buget": 0},
+        )
+
+    def test_final_errors_are_raised_at_once(self):
+        for eroare in (EroareHttp(400), ValueError("json"), TermenDepasit("gata")):
+            apel, tentative = _apel_cu_esecuri([eroare])
+            with self.assertRaises(type(eroare)):
+                self.planificator.executa(apel, furnizor="claude")
+            self.assertEqual(tentative, [0])
+        self.mock_sleep.assert_not_called()
+        self.assertEqual(self.planificator.statistici()["claude"]["esecuri"], 3)
+
+    def test_retry_after_header_sets_minimum_pause(self):
+        self.assertEqual(retry_after(EroareHttp(429, {"retry-after": "3"})), 3.0)
+        self.assertEqual(retry_after(EroareHttp(429, {"retry-after-ms": "250"})), 0.25)
+        self.assertIsNone(retry_after(EroareHttp(429)))
+        apel, _ = _apel_cu_esecuri([EroareHttp(429, {"retry-after": "3"})])
+
+        self.planificator.executa(apel, furnizor="deepseek")
+        self.mock_sleep.assert_called_once_with(3.0)
+
+    def test_pause_longer_than_deadline_gives_up(self):
+        apel, tentative = _apel_cu_esecuri([EroareHttp(429, {"retry-after": "30"})])
+        with self.assertRaises(EroareHttp):
+            self.planificator.executa(apel, furnizor="openai", termen=TermenLimita(5))
+        self.assertEqual(tentative, [0])
+        self.mock_sleep.assert_not_called()
+
+    def test_retry_budget_limits_retries_per_provider(self):
+        planificator = PlanificatorReincercari(PoliticaReincercare(incercari=2), rata_buget=0.0, rezerva_buget=1)
+        for _ in range(2):
+            apel, _ = _apel_cu_esecuri([EroareHttp(500), EroareHttp(500)])
+            with self.assertRaises(EroareHttp):
+                planificator.executa(apel, furnizor="openai")
+        apel, _ = _apel_cu_esecuri([EroareHttp(500)])
+        self.assertEqual(planificator.executa(apel, furnizor="claude"), "ok")
+
+        statistici = planificator.statistici()
+        self.assertEqual((statistici["openai"]["reincercari"], statistici["openai"]["refuzate_buget"]), (1, 1))
+        self.assertEqual(statistici["claude"]["reincercari"], 1)
+
+    def test_async_path_awaits_instead_of_sleeping(self):
+        erori = [EroareHttp(502)]
+
+        async def apel(tentativa):
+            if erori:
+                raise erori.pop(0)
+            return tentativa
+
+        with patch.object(reincercari.asyncio, "sleep", new=AsyncMock()) as mock_async_sleep:
+            rezultat = asyncio.run(self.planificator.executa_async(apel, furnizor="openai"))
+
+        self.assertEqual(rezultat, 1)
+        mock_async_sleep.assert_awaited_once()
+        self.mock_sleep.assert_not_called()
+
+    def test_classification_by_type_name(self):
+        class APIConnectionError(Exception):
+            pass
+
+        self.assertTrue(este_tranzitorie(APIConnectionError()))
+        self.assertTrue(este_tranzitorie(ConnectionResetError()))
+        self.assertFalse(este_tranzitorie(KeyError("x")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from education.rezumate import ConstructorRezumate, DepozitRezumate, cheie_rezumat
+
+
+def _profesor(materie, hashuri):
+    referinte = [(f"manual_{sha}.pdf", sha) for sha in hashuri]
+    return SimpleNamespace(
+        nume="Prof_Euclid",
+        materie=materie,
+        referinte_materiale=referinte,
+        cheie_rezumat=cheie_rezumat(f"profesor:{materie}", hashuri) if hashuri else None,
+    )
+
+
+class ConstructorRezumateTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.gestor = SimpleNamespace(
+            depozit_rezumate=DepozitRezumate(Path(self.temp_dir.name) / ".rezumate"),
+            citeste_fragment=lambda sha, limita=None: f"continut {sha}",
+        )
+        self.ai_client = MagicMock()
+        self.ai_client.get_ai_response.return_value = {"content": "Rezumat scurt"}
+        self.constructor = ConstructorRezumate(self.gestor, self.ai_client)
+
+    def _scoala(self, *profesori):
+        clasa = SimpleNamespace(profesori={p.materie + str(i): p for i, p in enumerate(profesori)})
+        return SimpleNamespace(clase={3: clasa}, directori=[])
+
+    def test_identical_sources_share_one_digest(self):
+        scoala_normala = self._scoala(_profesor("Matematica", ["h1"]), _profesor("Matematica", ["h1"]))
+        scoala_muzica = self._scoala(_profesor("Matematica", ["h1"]), _profesor("Istorie", []))
+
+        statistici = self.constructor.construieste_toate([scoala_normala, scoala_muzica])
+
+        self.assertEqual(statistici, {"generate": 1, "existente": 0, "esuate": 0, "fara_materiale": 1})
+        self.ai_client.get_ai_response.assert_called_once()
+        cheie = cheie_rezumat("profesor:Matematica", ["h1"])
+        self.assertEqual(self.gestor.depozit_rezumate.obtine(cheie), "Rezumat scurt")
+
+    def test_digest_is_regenerated_only_when_sources_change(self):
+        scoala = self._scoala(_profesor("Matematica", ["h1"]))
+        self.constructor.construieste_toate([scoala])
+        self.constructor.construieste_toate([scoala])
+        self.assertEqual(self.ai_client.get_ai_response.call_count, 1)
+
+        self.constructor.construieste_toate([self._scoala(_profesor("Matematica", ["h2"]))])
+        self.assertEqual(self.ai_client.get_ai_response.call_count, 2)
+
+    def test_store_reads_digests_written_by_another_instance(self):
+        cheie = cheie_rezumat("director", ["h1"])
+        DepozitRezumate(Path(self.temp_dir.name) / "comun").salveaza(cheie, "Rezumat director")
+        self.assertEqual(DepozitRezumate(Path(self.temp_dir.name) / "comun").obtine(cheie), "Rezumat director")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import director as director_module
+from education import gestor_materiale
+from education.cache_rutare import CacheRutare
+from education.director import Director
+from education.gestor_materiale import GestorMateriale
+from education.istoric import DepozitIstoric
+from education.router_local import RouterLocal, exemple_din_cuvinte_cheie, trasaturi
+
+
+class RouterLocalTests(unittest.TestCase):
+    def test_features_ignore_case_diacritics_and_filler_words(self):
+        self.assertEqual(trasaturi("Câte fracții?"), trasaturi("cate fractii"))
+        self.assertEqual(trasaturi("ce este"), {})
+
+    def test_learns_labels_and_restricts_to_candidates(self):
+        exemple = [
+            ("Cat face 7 ori 8?", "Prof_Euclid", 1.0),
+            ("Cum impart 12 la 3?", "Prof_Euclid", 1.0),
+            ("Ce culori amestec pentru verde?", "Prof_Leonardo", 1.0),
+            ("Cum desenez un cal?", "Prof_Leonardo", 1.0),
+            ("Ce instrument are clape?", "Prof_Vivaldi", 1.0),
+        ] * 4
+        router = RouterLocal()
+        router.antreneaza(exemple)
+
+        nume, confidence = router.prezice("Cat face 6 ori 9?")
+        self.assertEqual(nume, "Prof_Euclid")
+        self.assertGreater(confidence, 0.6)
+        nume, _ = router.prezice("Cat face 6 ori 9?", ["Prof_Leonardo", "Prof_Vivaldi", "Prof_Necunoscut"])
+        self.assertIn(nume, ("Prof_Leonardo", "Prof_Vivaldi"))
+        self.assertEqual(router.prezice("orice", ["Prof_Vivaldi"]), ("Prof_Vivaldi", 1.0))
+
+    def test_seed_examples_give_each_teacher_the_same_weight(self):
+        exemple = exemple_din_cuvinte_cheie(
+            [("Prof_Euclid", "Matematica"), ("Prof_Eminescu", "Limba_Romana")],
+            {"matematica": ["numar", "calcul"], "romana": ["text"], "limba": ["text", "gramatic"]},
+        )
+        total = {}
+        for _, nume, pondere in exemple:
+            total[nume] = total.get(nume, 0) + pondere
+        self.assertAlmostEqual(total["Prof_Euclid"], total["Prof_Eminescu"])
+
+
+class DirectorRouterTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        anterior = getattr(gestor_materiale.get_gestor_materiale, "_instance", None)
+        gestor_materiale.get_gestor_materiale._instance = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        if anterior is None:
+            self.addCleanup(delattr, gestor_materiale.get_gestor_materiale, "_instance")
+        else:
+            self.addCleanup(setattr, gestor_materiale.get_gestor_materiale, "_instance", anterior)
+
+        self.depozit = DepozitIstoric()
+        patcher = patch.object(director_module, "get_depozit_istoric", return_value=self.depozit)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Fara cache de rutare: fiecare intrebare trece prin router sau LLM
+        patcher = patch.object(director_module, "get_cache_rutare", return_value=CacheRutare(capacitate=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        profesori = {
+            "Matematica": SimpleNamespace(nume="Prof_Euclid", materie="Matematica", clasa=3),
+            "Muzica": SimpleNamespace(nume="Prof_Vivaldi", materie="Muzica", clasa=3),
+            "Arte_vizuale": SimpleNamespace(nume="Prof_Leonardo", materie="Arte_vizuale", clasa=3),
+        }
+        scoala = SimpleNamespace(nume="Scoala", clase={3: SimpleNamespace(profesori=profesori)})
+        self.director = Director.din_instantaneu({"nume": "Director"}, scoala)
+        self.assertTrue(self.director.asteapta_router(5))
+        self.profesori = profesori
+
+    def _raspuns_llm(self, nume):
+        mesaj = SimpleNamespace(content='{"profesor": "%s", "justificare": "", "confidence": 0.9}' % nume)
+        return SimpleNamespace(choices=[SimpleNamespace(message=mesaj)])
+
+    def test_confident_router_skips_llm_call(self):
+        with patch.object(director_module, "client") as client:
+            ales = self.director.alege_profesor_pentru_intrebare("Ce instrument muzical are sunet grav?", 3)
+
+        client.chat.completions.create.assert_not_called()
+        self.assertIs(ales, self.profesori["Muzica"])
+        self.assertEqual(self.director.istoric_decizii[-1]["metoda"], "router_local")
+        self.assertEqual(self.director.get_metrici_performanta()["rata_apeluri_llm"], 0)
+
+    def test_low_confidence_consults_llm_and_learns_from_it(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = self._raspuns_llm("Prof_Leonardo")
+        with patch.object(director_module, "client", client), \
+                patch.object(director_module.Config, "ROUTER_LOCAL_REANTRENARE", 3):
+            for _ in range(3):
+                ales = self.director.alege_profesor_pentru_intrebare("Cum fac un origami din hartie?", 3)
+                self.assertIs(ales, self.profesori["Arte_vizuale"])
+            self.assertEqual(client.chat.completions.create.call_count, 3)
+            self.assertTrue(self.director.asteapta_router(5))
+
+            ales = self.director.alege_profesor_pentru_intrebare("Cum fac un origami din hartie?", 3)
+
+        self.assertIs(ales, self.profesori["Arte_vizuale"])
+        self.assertEqual(client.chat.completions.create.call_count, 3)
+        metrici = self.director.get_metrici_performanta()
+        self.assertEqual(metrici["apeluri_llm"], 3)
+        self.assertEqual(metrici["router_local_decizii"], 1)
+        self.assertEqual(metrici["rata_apeluri_llm"], 75.0)
+
+    def test_construction_does_not_wait_for_the_first_training(self):
+        poate_continua = threading.Event()
+        antreneaza = RouterLocal.antreneaza
+
+        def antreneaza_lent(router, exemple):
+            poate_continua.wait(5)
+            antreneaza(router, exemple)
+
+        client = MagicMock()
+        client.chat.completions.create.return_value = self._raspuns_llm("Prof_Vivaldi")
+        with patch.object(RouterLocal, "antreneaza", antreneaza_lent):
+            director = Director.din_instantaneu({"nume": "Director"}, self.director.scoala)
+            self.assertFalse(director.router_local.antrenat)
+            with patch.object(director_module, "client", client):
+                ales = director.alege_profesor_pentru_intrebare("Ce instrument muzical are sunet grav?", 3)
+            self.assertIs(ales, self.profesori["Muzica"])
+            self.assertEqual(client.chat.completions.create.call_count, 1)
+            poate_continua.set()
+            self.assertTrue(director.asteapta_router(5))
+        self.assertTrue(director.router_local.antrenat)
+
+    def test_retraining_runs_off_the_request_thread(self):
+        self.assertTrue(self.director.router_local.antrenat)
+        poate_continua = threading.Event()
+        exemple = self.director._exemple_antrenare
+
+        def exemple_blocate(depozit=None):
+            poate_continua.wait(5)
+            return exemple(depozit)
+
+        client = MagicMock()
+        client.chat.completions.create.return_value = self._raspuns_llm("Prof_Leonardo")
+        with patch.object(director_module, "client", client), \
+                patch.object(director_module.Config, "ROUTER_LOCAL_REANTRENARE", 1), \
+                patch.object(self.director, "_exemple_antrenare", exemple_blocate):
+            self.director.alege_profesor_cu_llm("Cum fac un origami din hartie?", 3)
+            # Antrenarea asteapta in fundal; cererea urmatoare foloseste modelul curent
+            ales = self.director.alege_profesor_pentru_intrebare("Ce instrument muzical are sunet grav?", 3)
+            self.assertIs(ales, self.profesori["Muzica"])
+            self.assertFalse(self.director.asteapta_router(0.01))
+            poate_continua.set()
+            self.assertTrue(self.director.asteapta_router(5))
+
+        self.assertEqual(self.director.router_local.prezice("Cum fac un origami din hartie?")[0], "Prof_Leonardo")
+
+    def test_replay_measures_agreement_with_logged_llm_decisions(self):
+        for intrebare, profesor, metoda in (
+            ("Ce instrument muzical are sunet grav?", "Prof_Vivaldi", "director_ai"),
+            ("Cum calculez o fractie?", "Prof_Euclid", "director_ai"),
+            ("Cum desenez un cal?", "Prof_Vivaldi", "director_ai"),
+            ("Ce culori amestec?", "Prof_Leonardo", "fallback"),
+        ):
+            self.director.inregistreaza_decizie(
+                {"intrebare": intrebare, "profesor_ales": profesor, "clasa": 3, "metoda": metoda}
+            )
+
+        with patch.object(self.director, "scoruri_fallback_lot", wraps=self.director.scoruri_fallback_lot) as lot:
+            rezultat = self.director.evalueaza_rutare()
+
+        lot.assert_called_once()
+        self.assertEqual(len(lot.call_args.args[0]), 3)
+        self.assertEqual(rezultat["decizii"], 3)
+        self.assertEqual(rezultat["acord_fallback"], 66.67)
+        self.assertIn("acord_router_local", rezultat)
+
+    def test_non_numeric_llm_confidence_is_normalised(self):
+        client = MagicMock()
+        for raspuns, asteptat in (("high", 0.5), ("0.8", 0.8), (None, 0.5), (7, 1.0)):
+            mesaj = SimpleNamespace(content=json.dumps({"profesor": "Prof_Leonardo", "confidence": raspuns}))
+            client.chat.completions.create.return_value = SimpleNamespace(choices=[SimpleNamespace(message=mesaj)])
+            with patch.object(director_module, "client", client):
+                ales = self.director.alege_profesor_cu_llm("Cum fac un origami din hartie?", 3)
+            self.assertIs(ales, self.profesori["Arte_vizuale"])
+            self.assertEqual(self.director.istoric_decizii[-1]["confidence"], asteptat)
+        self.assertEqual(self.director.get_metrici_performanta()["avg_confidence_ai"], 0.7)
+
+
+if __name__ == "__main__":
+    unittest.main()
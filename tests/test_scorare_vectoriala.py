@@ -0,0 +1,89 @@
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import director as director_module
+from education.director import Director, _AUTOMAT_DOMENII, _DOMENII_FALLBACK
+from education.scorare_vectoriala import ScorareVectoriala, numpy_disponibil
+
+PROFESORI = [
+    SimpleNamespace(nume="Prof_Euclid", materie="Matematica", clasa=2, are_materiale=False),
+    SimpleNamespace(nume="Prof_Eminescu", materie="Limba_Romana", clasa=2, are_materiale=True),
+    SimpleNamespace(nume="Prof_Darwin", materie="Stiinte", clasa=3, are_materiale=False),
+    SimpleNamespace(nume="Prof_Sport", materie="Educatie_Fizica", clasa=2, are_materiale=False),
+    SimpleNamespace(nume="Prof_Vivaldi", materie="Muzica", clasa=2, are_materiale=True),
+    SimpleNamespace(nume="Prof_Fara_Materie", materie="", clasa=2, are_materiale=False),
+]
+
+INTREBARI = [
+    "Cum calculez aria unui dreptunghi si ce este o fractie?",
+    "Vreau o poveste cu litera A",
+    "matematica",
+    "Ce experiment de fizica pot face acasa?",
+    "Exercitii de miscare si joaca",
+    "Ce instrument are clape? Ce ritm are melodia?",
+    "Buna ziua!",
+    "",
+    "Muzica si matematica: problema cu note si sunete",
+]
+
+
+@unittest.skipUnless(numpy_disponibil(), "numpy nu este instalat")
+class ScorareVectorialaTests(unittest.TestCase):
+    def _secvential(self, intrebare, alesi_recent, clasa=2):
+        director = SimpleNamespace(istoric_decizii=[{"profesor_ales": nume} for nume in alesi_recent])
+        return Director._scoruri_fallback(director, intrebare, PROFESORI, clasa)
+
+    def test_batch_matches_sequential_scorer(self):
+        for alesi_recent in ([], ["Prof_Darwin", "Prof_Vivaldi"]):
+            scorare = ScorareVectoriala(PROFESORI, 2, _DOMENII_FALLBACK, _AUTOMAT_DOMENII)
+            clasamente = scorare.clasamente(INTREBARI, alesi_recent)
+            for intrebare, clasament in zip(INTREBARI, clasamente):
+                with self.subTest(intrebare=intrebare, alesi_recent=alesi_recent):
+                    self.assertEqual(clasament, self._secvential(intrebare, alesi_recent))
+
+    def test_totals_matrix_has_question_by_teacher_shape(self):
+        scorare = ScorareVectoriala(PROFESORI, 2, _DOMENII_FALLBACK, _AUTOMAT_DOMENII)
+        totaluri = scorare.totaluri(INTREBARI)
+        self.assertEqual(totaluri.shape, (len(INTREBARI), len(PROFESORI)))
+        self.assertEqual(int(totaluri[2, 0]), 8 + 2 + 3)
+
+    def test_director_batch_uses_sequential_scorer_without_numpy(self):
+        director = Director.__new__(Director)
+        director._scorari_lot = {}
+        director.scoala = SimpleNamespace(clase={2: SimpleNamespace(profesori={p.nume: p for p in PROFESORI})})
+        with patch.object(Director, "istoric_decizii", new=[{"profesor_ales": "Prof_Euclid"}]):
+            vectorial = director.scoruri_fallback_lot(INTREBARI, 2)
+            with patch.object(director_module, "numpy_disponibil", return_value=False):
+                secvential = director.scoruri_fallback_lot(INTREBARI, 2)
+            fara_profesori = director.scoruri_fallback_lot(INTREBARI, 9)
+        self.assertEqual(vectorial, secvential)
+        self.assertEqual(fara_profesori, [[] for _ in INTREBARI])
+
+    def test_director_reuses_the_scorer_until_the_teacher_set_changes(self):
+        profesori = {p.nume: p for p in PROFESORI}
+        director = Director.__new__(Director)
+        director._scorari_lot = {}
+        director.scoala = SimpleNamespace(clase={2: SimpleNamespace(profesori=profesori)})
+        with patch.object(Director, "istoric_decizii", new=[]), \
+                patch.object(director_module, "ScorareVectoriala", wraps=ScorareVectoriala) as constructor:
+            primul = director.scoruri_fallback_lot(INTREBARI, 2)
+            self.assertEqual(director.scoruri_fallback_lot(INTREBARI, 2), primul)
+            self.assertEqual(constructor.call_count, 1)
+
+            profesori["Prof_Euclid"].are_materiale = True
+            self.addCleanup(setattr, profesori["Prof_Euclid"], "are_materiale", False)
+            director.scoruri_fallback_lot(INTREBARI, 2)
+            self.assertEqual(constructor.call_count, 2)
+
+            profesori["Prof_Nou"] = SimpleNamespace(nume="Prof_Nou", materie="Istorie", clasa=2)
+            clasamente = director.scoruri_fallback_lot(INTREBARI, 2)
+            self.assertEqual(constructor.call_count, 3)
+            self.assertIn("Prof_Nou", [scor["profesor"].nume for scor in clasamente[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+
+import sesiuni
+from sesiuni import ManagerSesiuni, SesiuneTutorat
+
+
+def estimeaza(text):
+    return len(text) // 3
+
+
+class SesiuneTutoratTests(unittest.TestCase):
+    def test_context_keeps_full_turns_within_budget(self):
+        sesiune = SesiuneTutorat("elev", "Scoala/1/Matematica/Ana")
+        sesiune.adauga_tura("Cat face 2+2?", "Face 4.")
+        sesiune.adauga_tura("Dar 3+3?", "Face 6.")
+
+        mesaje = sesiune.mesaje_context(1000, estimeaza)
+
+        self.assertEqual([m["role"] for m in mesaje], ["user", "assistant", "user", "assistant"])
+        self.assertEqual(mesaje[2]["content"], "Dar 3+3?")
+        self.assertEqual(sesiune.rezumat, "")
+
+    def test_old_turns_move_into_summary_when_over_budget(self):
+        sesiune = SesiuneTutorat("elev", "Scoala/1/Matematica/Ana")
+        for index in range(6):
+            sesiune.adauga_tura(f"Intrebarea {index}? " + "x" * 150, f"Raspunsul {index}. Detalii " + "y" * 150)
+
+        mesaje = sesiune.mesaje_context(400, estimeaza)
+
+        total = sum(estimeaza(m["content"]) for m in mesaje if "Rezumatul" not in m["content"])
+        self.assertLessEqual(total, 400)
+        self.assertTrue(mesaje[0]["content"].startswith("Rezumatul discutiei"))
+        self.assertEqual(mesaje[-2]["content"].split("?")[0], "Intrebarea 5")
+        self.assertIn("Raspunsul", sesiune.rezumat)
+        self.assertLessEqual(estimeaza(sesiune.rezumat), 100)
+
+    def test_turns_beyond_max_are_compacted(self):
+        sesiune = SesiuneTutorat("elev", "cheie", max_ture=2)
+        for index in range(4):
+            sesiune.adauga_tura(f"Q{index}", f"A{index}. In plus.")
+
+        self.assertEqual(len(sesiune.ture), 2)
+        self.assertEqual(len(sesiune.linii_rezumat), 2)
+        self.assertNotIn("In plus", sesiune.rezumat)
+
+
+class ManagerSesiuniTests(unittest.TestCase):
+    def test_same_user_and_teacher_share_session(self):
+        manager = ManagerSesiuni()
+        self.assertIs(manager.obtine("u1", "p1"), manager.obtine("u1", "p1"))
+        self.assertIsNot(manager.obtine("u1", "p1"), manager.obtine("u1", "p2"))
+
+    def test_least_recently_used_session_is_evicted(self):
+        manager = ManagerSesiuni(max_sesiuni=2)
+        prima = manager.obtine("u1", "p")
+        manager.obtine("u2", "p")
+        manager.obtine("u1", "p")
+        manager.obtine("u3", "p")
+
+        self.assertIs(manager.obtine("u1", "p"), prima)
+        self.assertEqual(manager.statistici()["sesiuni_active"], 2)
+        self.assertFalse(manager.inchide("u2", "p"))
+
+    def test_expired_sessions_are_replaced_and_cleaned(self):
+        manager = ManagerSesiuni(ttl=10)
+        with patch.object(sesiuni.time, "monotonic", return_value=100.0):
+            veche = manager.obtine("u1", "p")
+            manager.obtine("u2", "p")
+        with patch.object(sesiuni.time, "monotonic", return_value=200.0):
+            self.assertIsNot(manager.obtine("u1", "p"), veche)
+            self.assertEqual(manager.curata_expirate(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+from education import speculatie
+from education.speculatie import RutareSpeculativa
+
+
+class ProfesorFals:
+    def __init__(self, nume, tokeni=30):
+        self.nume = nume
+        self.tokeni = tokeni
+        self.inceput = threading.Event()
+        self.conversatii = []
+        self.raspunsuri_secventiale = 0
+
+    def genereaza_raspuns(self, intrebare, user_id="default", is_free_tier=True, sesiune=None, termen=None):
+        self.inceput.set()
+        return {"content": f"{self.nume}: {intrebare}", "tokens_used": self.tokeni, "provider": "test"}
+
+    def inregistreaza_conversatie(self, intrebare, user_id, result):
+        self.conversatii.append((intrebare, user_id, result["content"]))
+
+    def raspunde_intrebare(self, intrebare, user_id="default", is_free_tier=True, termen=None):
+        self.raspunsuri_secventiale += 1
+        return f"{self.nume} (secvential): {intrebare}"
+
+
+class DirectorFals:
+    def __init__(self, local=None, ghicit=None, ales=None):
+        self.local, self.ghicit, self.ales = local, ghicit, ales
+        self.apeluri_llm = 0
+
+    def alege_profesor_fara_llm(self, intrebare, clasa):
+        return self.local
+
+    def ghiceste_profesor(self, intrebare, clasa):
+        return self.ghicit
+
+    def alege_profesor_cu_llm(self, intrebare, clasa, termen=None):
+        # Speculatia trebuie sa fi pornit inainte de decizia directorului
+        if self.ghicit is not None:
+            self.ghicit.inceput.wait(1)
+        self.apeluri_llm += 1
+        return self.ales
+
+
+class RutareSpeculativaTests(unittest.TestCase):
+    def setUp(self):
+        self.rutare = RutareSpeculativa(max_workeri=2)
+        patcher = patch.object(speculatie.token_monitor, "refund_tokens")
+        self.mock_refund = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _asteapta(self):
+        self.rutare._executor_activ().shutdown(wait=True)
+
+    def test_agreement_keeps_speculative_answer(self):
+        euclid = ProfesorFals("Prof_Euclid")
+        profesor, raspuns = self.rutare.raspunde(DirectorFals(ghicit=euclid, ales=euclid), "2+2?", 3, "u1")
+
+        self.assertIs(profesor, euclid)
+        self.assertEqual(raspuns, "Prof_Euclid: 2+2?")
+        self.assertEqual(euclid.conversatii, [("2+2?", "u1", "Prof_Euclid: 2+2?")])
+        self.assertEqual(euclid.raspunsuri_secventiale, 0)
+        self.assertEqual(self.rutare.statistici()["rata_acord"], 100.0)
+
+    def test_disagreement_discards_answer_and_refunds_quota(self):
+        euclid, vivaldi = ProfesorFals("Prof_Euclid", tokeni=40), ProfesorFals("Prof_Vivaldi")
+        profesor, raspuns = self.rutare.raspunde(DirectorFals(ghicit=euclid, ales=vivaldi), "Ce e o nota?", 3, "u1")
+        self._asteapta()
+
+        self.assertIs(profesor, vivaldi)
+        self.assertEqual(raspuns, "Prof_Vivaldi (secvential): Ce e o nota?")
+        self.assertEqual(euclid.conversatii, [])
+        self.mock_refund.assert_called_once_with("u1", 40)
+        statistici = self.rutare.statistici()
+        self.assertEqual((statistici["dezacorduri"], statistici["tokeni_irositi"]), (1, 40))
+        self.assertEqual(statistici["rata_acord"], 0)
+
+    def test_finished_speculation_is_refunded_before_the_winner_answers(self):
+        euclid, vivaldi = ProfesorFals("Prof_Euclid", tokeni=40), ProfesorFals("Prof_Vivaldi")
+        director = DirectorFals(ghicit=euclid, ales=vivaldi)
+        alege = director.alege_profesor_cu_llm
+
+        def alege_dupa_speculatie(intrebare, clasa, termen=None):
+            ales = alege(intrebare, clasa, termen)
+            time.sleep(0.05)  # raspunsul speculativ s-a terminat si a fost taxat
+            return ales
+
+        director.alege_profesor_cu_llm = alege_dupa_speculatie
+        rambursat_inainte = []
+        raspunde = vivaldi.raspunde_intrebare
+
+        def raspunde_dupa_rambursare(*args, **kwargs):
+            rambursat_inainte.append(self.mock_refund.call_count)
+            return raspunde(*args, **kwargs)
+
+        vivaldi.raspunde_intrebare = raspunde_dupa_rambursare
+        self.rutare.raspunde(director, "Ce e o nota?", 3, "u1")
+
+        self.assertEqual(rambursat_inainte, [1])
+        self.mock_refund.assert_called_once_with("u1", 40)
+
+    def test_winner_does_not_wait_for_running_speculation(self):
+        poate_termina = threading.Event()
+        euclid, vivaldi = ProfesorFals("Prof_Euclid", tokeni=40), ProfesorFals("Prof_Vivaldi")
+        genereaza = euclid.genereaza_raspuns
+
+        def genereaza_lent(*args, **kwargs):
+            euclid.inceput.set()
+            poate_termina.wait(5)
+            return genereaza(*args, **kwargs)
+
+        euclid.genereaza_raspuns = genereaza_lent
+        start = time.perf_counter()
+        profesor, _ = self.rutare.raspunde(DirectorFals(ghicit=euclid, ales=vivaldi), "q", 3, "u1")
+
+        self.assertIs(profesor, vivaldi)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.mock_refund.assert_not_called()
+        poate_termina.set()
+        self._asteapta()
+        self.mock_refund.assert_called_once_with("u1", 40)
+
+    def test_pro_tier_discard_is_not_refunded(self):
+        euclid, vivaldi = ProfesorFals("Prof_Euclid"), ProfesorFals("Prof_Vivaldi")
+        self.rutare.raspunde(DirectorFals(ghicit=euclid, ales=vivaldi), "q", 3, "u1", is_free_tier=False)
+        self._asteapta()
+
+        self.mock_refund.assert_not_called()
+        self.assertEqual(self.rutare.statistici()["tokeni_irositi"], 30)
+
+    def test_local_routing_answers_without_speculation(self):
+        euclid = ProfesorFals("Prof_Euclid")
+        director = DirectorFals(local=euclid, ghicit=ProfesorFals("Prof_Vivaldi"))
+        profesor, _ = self.rutare.raspunde(director, "q", 3)
+
+        self.assertIs(profesor, euclid)
+        self.assertEqual(director.apeluri_llm, 0)
+        self.assertFalse(director.ghicit.inceput.is_set())
+        self.assertEqual(self.rutare.statistici()["fara_speculatie"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
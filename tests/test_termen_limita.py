@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai")
+
+import reincercari
+import termen_limita
+from education import director as director_module
+from education import gestor_materiale
+from education.cache_rutare import CacheRutare
+from education.director import Director
+from education.gestor_materiale import GestorMateriale
+from education.istoric import DepozitIstoric
+from termen_limita import TermenDepasit, TermenLimita, timeout_pentru
+
+
+class TermenLimitaTests(unittest.TestCase):
+    def test_timeout_is_clamped_to_remaining_time(self):
+        with patch.object(termen_limita.time, "monotonic", return_value=100.0):
+            termen = TermenLimita(10)
+        with patch.object(termen_limita.time, "monotonic", return_value=104.0):
+            self.assertAlmostEqual(termen.timeout(), 6.0)
+            self.assertAlmostEqual(termen.timeout(maxim=5), 5.0)
+            self.assertAlmostEqual(termen.subtermen(rezerva=4).ramas(), 2.0)
+            self.assertEqual(timeout_pentru(None, 30), 30)
+        with patch.object(termen_limita.time, "monotonic", return_value=109.8):
+            with self.assertRaises(TermenDepasit):
+                termen.timeout(etapa="director")
+            self.assertFalse(termen.expirat)
+
+
+class DirectorTermenTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        anterior = getattr(gestor_materiale.get_gestor_materiale, "_instance", None)
+        gestor_materiale.get_gestor_materiale._instance = GestorMateriale(str(Path(self.temp_dir.name) / "materiale"))
+        if anterior is None:
+            self.addCleanup(delattr, gestor_materiale.get_gestor_materiale, "_instance")
+        else:
+            self.addCleanup(setattr, gestor_materiale.get_gestor_materiale, "_instance", anterior)
+        for nume, valoare in (("get_depozit_istoric", DepozitIstoric()), ("get_cache_rutare", CacheRutare())):
+            patcher = patch.object(director_module, nume, return_value=valoare)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.profesori = {
+            "Matematica": SimpleNamespace(nume="Prof_Euclid", materie="Matematica", clasa=3),
+            "Muzica": SimpleNamespace(nume="Prof_Vivaldi", materie="Muzica", clasa=3),
+        }
+        scoala = SimpleNamespace(nume="Scoala", clase={3: SimpleNamespace(profesori=self.profesori)})
+        self.director = Director.din_instantaneu({"nume": "Director"}, scoala)
+
+    def test_director_uses_fallback_when_budget_is_spent(self):
+        client = MagicMock()
+        with patch.object(director_module, "client", client), \
+                patch.object(director_module.Config, "TERMEN_REZERVA_PROFESOR", 10):
+            ales = self.director.alege_profesor_cu_llm("Cum rezolv o problema de calcul?", 3, TermenLimita(10.2))
+
+        client.chat.completions.create.assert_not_called()
+        self.assertIs(ales, self.profesori["Matematica"])
+        self.assertEqual(self.director.istoric_decizii[-1]["metoda"], "fallback")
+
+    def test_director_retries_share_the_remaining_budget(self):
+        ceas = [100.0]
+
+        def apel_esuat(**kwargs):
+            ceas[0] += kwargs["timeout"]
+            raise TimeoutError("timeout")
+
+        client = MagicMock()
+        client.chat.completions.create.side_effect = apel_esuat
+        with patch.object(director_module, "client", client), \
+                patch.object(director_module.Config, "TERMEN_REZERVA_PROFESOR", 2), \
+                patch.object(termen_limita.time, "monotonic", side_effect=lambda: ceas[0]), \
+                patch.object(reincercari.time, "sleep"):
+            ales = self.director.alege_profesor_cu_llm("Ce este o nota muzicala?", 3, TermenLimita(12))
+
+        timpi = [apel.kwargs["timeout"] for apel in client.chat.completions.create.call_args_list]
+        self.assertEqual(timpi, [5, 5])
+        self.assertIs(ales, self.profesori["Muzica"])
+        self.assertEqual(self.director.istoric_decizii[-1]["metoda"], "fallback")
+
+
+if __name__ == "__main__":
+    unittest.main()